@@ -0,0 +1,30 @@
+"""index recent connector publish outcomes for the circuit breaker
+
+Revision ID: 0019_connector_breaker_index
+Revises: 0018_stripe_lifecycle_v1
+Create Date: 2026-10-16 10:00:00
+"""
+
+from alembic import op
+
+
+revision = "0019_connector_breaker_index"
+down_revision = "0018_stripe_lifecycle_v1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so publish_events stays writable while the index is created.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publish_events_company_channel_type_created_at
+            ON publish_events (company_id, channel_id, event_type, created_at DESC)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publish_events_company_channel_type_created_at")
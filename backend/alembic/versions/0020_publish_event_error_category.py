@@ -0,0 +1,44 @@
+"""normalized error category on publish events
+
+Revision ID: 0020_publish_event_error_category
+Revises: 0019_connector_breaker_index
+Create Date: 2026-10-16 10:30:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0020_publish_event_error_category"
+down_revision = "0019_connector_breaker_index"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    # A plain nullable column is a catalog-only change; emit_publish_event fills it for new rows.
+    op.execute("ALTER TABLE publish_events ADD COLUMN IF NOT EXISTS normalized_error_category TEXT")
+
+    # Backfill existing failures in short autocommitted batches instead of one table-wide rewrite.
+    backfill = sa.text(
+        """
+        UPDATE publish_events
+        SET normalized_error_category = metadata_json -> 'normalized_error' ->> 'category'
+        WHERE id IN (
+            SELECT id FROM publish_events
+            WHERE normalized_error_category IS NULL
+              AND metadata_json -> 'normalized_error' ->> 'category' IS NOT NULL
+            LIMIT :batch_size
+        )
+        """
+    )
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(backfill, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE publish_events DROP COLUMN IF EXISTS normalized_error_category")
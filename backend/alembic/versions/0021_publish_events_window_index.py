@@ -0,0 +1,32 @@
+"""index windowed publish outcome aggregates
+
+Revision ID: 0021_publish_events_window_index
+Revises: 0020_publish_event_error_category
+Create Date: 2026-10-16 11:00:00
+"""
+
+from alembic import op
+
+
+revision = "0021_publish_events_window_index"
+down_revision = "0020_publish_event_error_category"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One index serves every "event_type IN (...) AND created_at >= :since" aggregate: platform-wide
+    # totals range-scan the leading columns, per-tenant and per-channel groupings read the trailing ones.
+    # Built concurrently so publish_events stays writable while the index is created.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publish_events_window
+            ON publish_events (event_type, created_at, company_id, channel_id)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publish_events_window")
@@ -0,0 +1,37 @@
+"""unique system health component for upserts
+
+Revision ID: 0022_system_health_component_unique
+Revises: 0021_publish_events_window_index
+Create Date: 2026-10-16 11:30:00
+"""
+
+from alembic import op
+
+
+revision = "0022_system_health_component_unique"
+down_revision = "0021_publish_events_window_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the most recent row per component before enforcing uniqueness.
+    op.execute(
+        """
+        DELETE FROM system_health
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY component ORDER BY updated_at DESC) AS position
+                FROM system_health
+            ) ranked
+            WHERE ranked.position > 1
+        )
+        """
+    )
+    op.drop_index("ix_system_health_component", table_name="system_health")
+    op.create_index("ix_system_health_component", "system_health", ["component"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_system_health_component", table_name="system_health")
+    op.create_index("ix_system_health_component", "system_health", ["component"], unique=False)
@@ -0,0 +1,31 @@
+"""index tenant content windows for flagged content ratios
+
+Revision ID: 0023_content_items_window_index
+Revises: 0022_system_health_component_unique
+Create Date: 2026-10-16 12:00:00
+"""
+
+from alembic import op
+
+
+revision = "0023_content_items_window_index"
+down_revision = "0022_system_health_component_unique"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so content_items stays writable while the index is created.
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_content_items_company_created_at
+            ON content_items (company_id, created_at)
+            INCLUDE (status)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_content_items_company_created_at")
@@ -0,0 +1,27 @@
+"""cached stripe subscription item id on company subscriptions
+
+Revision ID: 0025_subscription_item_id
+Revises: 0023_content_items_window_index
+Create Date: 2026-10-16 13:00:00
+"""
+
+from alembic import op
+
+
+revision = "0025_subscription_item_id"
+down_revision = "0023_content_items_window_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE company_subscriptions
+        ADD COLUMN IF NOT EXISTS stripe_subscription_item_id VARCHAR(255)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE company_subscriptions DROP COLUMN IF EXISTS stripe_subscription_item_id")
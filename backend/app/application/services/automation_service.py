@@ -7,10 +7,10 @@ from uuid import UUID
 
 from croniter import croniter
 from redis import Redis
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.orm import Session
 
-from app.application.services.publishing_service import emit_publish_event, publish_post_async
+from app.application.services.publishing_service import emit_publish_event, publish_posts_async
 from app.application.services.ai_quality_service import (
     apply_quality_to_content_metadata,
     choose_content_status,
@@ -144,7 +144,22 @@ def create_automation_run(
 def enqueue_automation_run(run_id: UUID) -> None:
     from workers.tasks import execute_automation_run  # local import to avoid circular imports
 
-    execute_automation_run.apply_async(kwargs={"run_id": str(run_id)})
+    execute_automation_run.apply_async(args=(str(run_id),), ignore_result=True)
+
+
+def enqueue_automation_runs(run_ids: list[UUID]) -> None:
+    if not run_ids:
+        return
+    if len(run_ids) == 1:
+        enqueue_automation_run(run_ids[0])
+        return
+    from celery import group
+
+    from workers.tasks import execute_automation_run  # local import to avoid circular imports
+
+    # A group still sends one broker message per run (each run keeps its own acks_late delivery and
+    # retries); what it saves is the per-call producer checkout and result-backend bookkeeping.
+    group(execute_automation_run.si(str(run_id)).set(ignore_result=True) for run_id in run_ids).apply_async()
 
 
 def _is_rule_due_by_interval(db: Session, rule: AutomationRule, now: datetime) -> bool:
@@ -195,7 +210,7 @@ def dispatch_due_time_rules(db: Session, now: datetime | None = None) -> Automat
         )
     ).scalars().all()
 
-    created_runs = 0
+    queued_run_ids: list[UUID] = []
     for rule in rules:
         due = False
         if rule.trigger_type == AutomationTriggerType.CRON.value:
@@ -213,12 +228,12 @@ def dispatch_due_time_rules(db: Session, now: datetime | None = None) -> Automat
                 trigger_reason="time_trigger",
                 trigger_metadata={"trigger_type": rule.trigger_type},
             )
-            enqueue_automation_run(run.id)
-            created_runs += 1
+            queued_run_ids.append(run.id)
         except ValueError:
             continue
 
-    return AutomationDispatchResult(runs_created=created_runs, rules_checked=len(rules))
+    enqueue_automation_runs(queued_run_ids)
+    return AutomationDispatchResult(runs_created=len(queued_run_ids), rules_checked=len(rules))
 
 
 def _event_rule_matches_publish_event(rule: AutomationRule, event: PublishEvent) -> bool:
@@ -264,7 +279,7 @@ def dispatch_event_triggered_rules(db: Session, redis_client: Redis) -> Automati
         )
     ).scalars().all()
 
-    created_runs = 0
+    queued_run_ids: list[UUID] = []
     for event in publish_events:
         for rule in rules:
             if rule.company_id != event.company_id or rule.project_id != event.project_id:
@@ -282,24 +297,70 @@ def dispatch_event_triggered_rules(db: Session, redis_client: Redis) -> Automati
                         "publish_event_status": event.status,
                     },
                 )
-                enqueue_automation_run(run.id)
-                created_runs += 1
+                queued_run_ids.append(run.id)
             except ValueError:
                 continue
 
+    enqueue_automation_runs(queued_run_ids)
     latest_event_time = publish_events[-1].created_at
     if latest_event_time is not None:
         _write_event_cursor(redis_client, latest_event_time)
 
-    return AutomationDispatchResult(runs_created=created_runs, rules_checked=len(rules))
+    return AutomationDispatchResult(runs_created=len(queued_run_ids), rules_checked=len(rules))
+
+
+@dataclass(frozen=True)
+class ParsedGuardrails:
+    max_posts_per_day_project: int
+    quiet_start_hour: int | None
+    quiet_end_hour: int | None
+    blackout_dates: frozenset[str]
+    duplicate_topic_days: int
+    approval_required: bool
+
+
+def _parse_guardrails(guardrails: dict[str, Any]) -> ParsedGuardrails:
+    quiet_start_hour: int | None = None
+    quiet_end_hour: int | None = None
+    quiet_hours = guardrails.get("quiet_hours") or {}
+    start_raw = str(quiet_hours.get("start") or "").strip()
+    end_raw = str(quiet_hours.get("end") or "").strip()
+    if start_raw and end_raw:
+        try:
+            quiet_start_hour = int(start_raw.split(":")[0])
+            quiet_end_hour = int(end_raw.split(":")[0])
+        except (TypeError, ValueError):
+            quiet_start_hour = None
+            quiet_end_hour = None
+
+    return ParsedGuardrails(
+        max_posts_per_day_project=int(guardrails.get("max_posts_per_day_project") or 0),
+        quiet_start_hour=quiet_start_hour,
+        quiet_end_hour=quiet_end_hour,
+        blackout_dates=frozenset(str(item) for item in (guardrails.get("blackout_dates") or [])),
+        duplicate_topic_days=int(guardrails.get("duplicate_topic_days") or 0),
+        approval_required=bool(guardrails.get("approval_required", False)),
+    )
+
+
+def _parsed_guardrails(rule: AutomationRule) -> ParsedGuardrails:
+    # Parsed once per loaded rule instance, so a dispatch pass checking the same rule for many events
+    # parses it once. Keyed on the loaded guardrails object: a reassigned or reloaded value is re-parsed,
+    # and the next pass loads fresh instances.
+    guardrails = rule.guardrails_json
+    cached = getattr(rule, "_parsed_guardrails", None)
+    if cached is not None and cached[0] is guardrails:
+        return cached[1]
+    parsed = _parse_guardrails(guardrails or {})
+    setattr(rule, "_parsed_guardrails", (guardrails, parsed))
+    return parsed
 
 
 def _check_guardrails(db: Session, *, rule: AutomationRule, now: datetime, title: str | None = None) -> list[str]:
     violations: list[str] = []
-    guardrails = rule.guardrails_json or {}
+    guardrails = _parsed_guardrails(rule)
 
-    max_posts_per_day_project = int(guardrails.get("max_posts_per_day_project") or 0)
-    if max_posts_per_day_project > 0:
+    if guardrails.max_posts_per_day_project > 0:
         day_start = datetime(now.year, now.month, now.day, tzinfo=UTC)
         day_end = day_start + timedelta(days=1)
         posts_today = db.execute(
@@ -310,33 +371,25 @@ def _check_guardrails(db: Session, *, rule: AutomationRule, now: datetime, title
                 Post.created_at < day_end,
             )
         ).scalar_one()
-        if int(posts_today or 0) >= max_posts_per_day_project:
+        if int(posts_today or 0) >= guardrails.max_posts_per_day_project:
             violations.append("max_posts_per_day_project")
 
-    quiet_hours = guardrails.get("quiet_hours") or {}
-    start_raw = str(quiet_hours.get("start") or "").strip()
-    end_raw = str(quiet_hours.get("end") or "").strip()
-    if start_raw and end_raw:
-        try:
-            start_hour = int(start_raw.split(":")[0])
-            end_hour = int(end_raw.split(":")[0])
-            now_hour = now.hour
-            if start_hour <= end_hour:
-                in_quiet = start_hour <= now_hour < end_hour
-            else:
-                in_quiet = now_hour >= start_hour or now_hour < end_hour
-            if in_quiet:
-                violations.append("quiet_hours")
-        except (TypeError, ValueError):
-            pass
-
-    blackout_dates = {str(item) for item in (guardrails.get("blackout_dates") or [])}
-    if now.date().isoformat() in blackout_dates:
+    start_hour = guardrails.quiet_start_hour
+    end_hour = guardrails.quiet_end_hour
+    if start_hour is not None and end_hour is not None:
+        now_hour = now.hour
+        if start_hour <= end_hour:
+            in_quiet = start_hour <= now_hour < end_hour
+        else:
+            in_quiet = now_hour >= start_hour or now_hour < end_hour
+        if in_quiet:
+            violations.append("quiet_hours")
+
+    if guardrails.blackout_dates and now.date().isoformat() in guardrails.blackout_dates:
         violations.append("blackout_date")
 
-    duplicate_topic_days = int(guardrails.get("duplicate_topic_days") or 0)
-    if duplicate_topic_days > 0 and title:
-        since = now - timedelta(days=duplicate_topic_days)
+    if guardrails.duplicate_topic_days > 0 and title:
+        since = now - timedelta(days=guardrails.duplicate_topic_days)
         duplicate = db.execute(
             select(ContentItem.id).where(
                 ContentItem.company_id == rule.company_id,
@@ -351,32 +404,29 @@ def _check_guardrails(db: Session, *, rule: AutomationRule, now: datetime, title
     return violations
 
 
-def _action_generate_post(db: Session, run: AutomationRun, rule: AutomationRule) -> dict[str, Any]:
+def _action_generate_post(
+    db: Session,
+    run: AutomationRun,
+    rule: AutomationRule,
+    *,
+    campaign: Campaign | None = None,
+) -> dict[str, Any]:
     action_config = rule.action_config_json or {}
-    campaign = None
-    if rule.campaign_id:
-        campaign = db.execute(
-            select(Campaign).where(
-                Campaign.id == rule.campaign_id,
-                Campaign.company_id == run.company_id,
-                Campaign.project_id == run.project_id,
-            )
-        ).scalar_one_or_none()
 
     template = None
     template_id_raw = action_config.get("template_id")
     if template_id_raw:
         try:
             template_id = UUID(str(template_id_raw))
-            template = db.execute(
-                select(ContentTemplate).where(
-                    ContentTemplate.id == template_id,
-                    ContentTemplate.company_id == run.company_id,
-                    ContentTemplate.project_id == run.project_id,
-                )
-            ).scalar_one_or_none()
         except ValueError:
-            template = None
+            template_id = None
+        if template_id is not None:
+            # Session.get() answers from the identity map when the template was already loaded.
+            template = db.get(ContentTemplate, template_id)
+            if template is not None and (
+                template.company_id != run.company_id or template.project_id != run.project_id
+            ):
+                template = None
 
     if template and template.template_type != ContentTemplateType.POST_TEXT.value:
         raise ValueError("unsupported_template_type_for_generate_post")
@@ -474,7 +524,7 @@ def _action_generate_post(db: Session, run: AutomationRun, rule: AutomationRule)
     generated_title = str(generated.get("title") or "").strip()
     generated_body = str(generated.get("body") or "").strip()
     risk_flags = generated.get("risk_flags") or []
-    requires_approval = bool((rule.guardrails_json or {}).get("approval_required", False))
+    requires_approval = _parsed_guardrails(rule).approval_required
     if isinstance(risk_flags, list) and any(str(flag).lower() != "none" for flag in risk_flags):
         requires_approval = True
 
@@ -596,30 +646,45 @@ def _action_schedule_post(db: Session, run: AutomationRun, rule: AutomationRule)
 def _action_publish_now(db: Session, run: AutomationRun, rule: AutomationRule) -> dict[str, Any]:
     action_config = rule.action_config_json or {}
     limit = int(action_config.get("limit") or 5)
-    posts = db.execute(
-        select(Post).where(
+    now = datetime.now(UTC)
+
+    # Claim candidates in SQL (skipping rows locked by a concurrent run) and flip them in one UPDATE.
+    claimed_ids = db.execute(
+        select(Post.id)
+        .where(
             Post.company_id == run.company_id,
             Post.project_id == run.project_id,
             Post.status.in_([PostStatus.DRAFT.value, PostStatus.SCHEDULED.value]),
         )
+        .order_by(Post.created_at.asc())
+        .limit(max(1, limit))
+        .with_for_update(skip_locked=True)
     ).scalars().all()
 
-    published_now = 0
-    now = datetime.now(UTC)
-    for post in posts[: max(1, limit)]:
-        post.status = PostStatus.SCHEDULED.value
-        post.publish_at = now
+    claimed: list[tuple[UUID, UUID, UUID]] = []
+    if claimed_ids:
+        claimed = [
+            (post_id, company_id, project_id)
+            for post_id, company_id, project_id in db.execute(
+                update(Post)
+                .where(Post.id.in_(claimed_ids))
+                .values(status=PostStatus.SCHEDULED.value, publish_at=now)
+                .returning(Post.id, Post.company_id, Post.project_id)
+            ).all()
+        ]
+
+    metadata_json = {"source": "automation_publish_now", "run_id": str(run.id)}
+    for post_id, company_id, project_id in claimed:
         emit_publish_event(
             db,
-            company_id=post.company_id,
-            project_id=post.project_id,
-            post_id=post.id,
+            company_id=company_id,
+            project_id=project_id,
+            post_id=post_id,
             event_type="PostScheduled",
             status="ok",
-            metadata_json={"source": "automation_publish_now", "run_id": str(run.id)},
+            metadata_json=dict(metadata_json),
         )
-        publish_post_async(post.company_id, post.id)
-        published_now += 1
+    published_now = publish_posts_async([(company_id, post_id) for post_id, company_id, _ in claimed])
 
     emit_automation_event(
         db,
@@ -640,15 +705,26 @@ def execute_automation_run_runtime(db: Session, *, run_id: UUID) -> dict[str, An
     if run.status not in [AutomationRunStatus.QUEUED.value, AutomationRunStatus.RUNNING.value]:
         return {"status": "ignored", "reason": "terminal_state"}
 
-    rule = db.execute(
-        select(AutomationRule).where(
+    # Campaign is joined onto the rule row so generate_post does not pay a second round-trip for it.
+    rule_row = db.execute(
+        select(AutomationRule, Campaign)
+        .outerjoin(
+            Campaign,
+            and_(
+                Campaign.id == AutomationRule.campaign_id,
+                Campaign.company_id == AutomationRule.company_id,
+                Campaign.project_id == AutomationRule.project_id,
+            ),
+        )
+        .where(
             AutomationRule.id == run.rule_id,
             AutomationRule.company_id == run.company_id,
             AutomationRule.project_id == run.project_id,
         )
-    ).scalar_one_or_none()
-    if rule is None:
+    ).one_or_none()
+    if rule_row is None:
         raise ValueError("rule_not_found")
+    rule, campaign = rule_row
 
     now = datetime.now(UTC)
     run.status = AutomationRunStatus.RUNNING.value
@@ -664,7 +740,7 @@ def execute_automation_run_runtime(db: Session, *, run_id: UUID) -> dict[str, An
     )
 
     if rule.action_type == AutomationActionType.GENERATE_POST.value:
-        stats = _action_generate_post(db, run, rule)
+        stats = _action_generate_post(db, run, rule, campaign=campaign)
     elif rule.action_type == AutomationActionType.SCHEDULE_POST.value:
         stats = _action_schedule_post(db, run, rule)
     elif rule.action_type == AutomationActionType.PUBLISH_NOW.value:
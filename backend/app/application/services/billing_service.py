@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import threading
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from time import monotonic
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import Integer, bindparam, case, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.domain.models.channel import Channel
@@ -26,15 +31,138 @@ BILLING_REQUIRED_ERROR = {
     "message": "Billing action required. Open billing portal to restore write access.",
 }
 
+# Hot-path statements are built once; callers only bind parameters.
+_COMPANY_ID = bindparam("company_id")
+_STMT_SUBSCRIPTION_BY_COMPANY = select(CompanySubscription).where(CompanySubscription.company_id == _COMPANY_ID)
+_STMT_PLAN_BY_ID = select(SubscriptionPlan).where(SubscriptionPlan.id == bindparam("plan_id"))
+_STMT_PLAN_BY_NAME = select(SubscriptionPlan).where(SubscriptionPlan.name == bindparam("plan_name"))
+_STMT_CHEAPEST_PLAN_ID = select(SubscriptionPlan.id).order_by(SubscriptionPlan.monthly_price.asc()).limit(1)
+_STMT_USAGE_BY_COMPANY = select(CompanyUsage).where(CompanyUsage.company_id == _COMPANY_ID)
+_STMT_INCREMENT_POST_USAGE = (
+    update(CompanyUsage)
+    .where(CompanyUsage.company_id == _COMPANY_ID)
+    .values(
+        posts_used_current_period=CompanyUsage.posts_used_current_period + bindparam("amount", type_=Integer),
+        updated_at=func.now(),
+    )
+    .returning(CompanyUsage.posts_used_current_period)
+)
+_STMT_SUBSCRIPTION_WITH_USAGE = (
+    select(CompanySubscription, CompanyUsage.posts_used_current_period)
+    .outerjoin(CompanyUsage, CompanyUsage.company_id == CompanySubscription.company_id)
+    .where(CompanySubscription.company_id == _COMPANY_ID)
+)
+# Limit checks only need to know whether a row exists past the plan cap, so Postgres can stop
+# after max+1 rows instead of counting the tenant's full history.
+_LIMIT_OFFSET = bindparam("limit_offset", type_=Integer)
+_STMT_PROJECT_OVER_LIMIT = (
+    select(literal(1)).select_from(Project).where(Project.company_id == _COMPANY_ID).offset(_LIMIT_OFFSET).limit(1)
+)
+_STMT_CONNECTOR_OVER_LIMIT = (
+    select(literal(1)).select_from(Channel).where(Channel.company_id == _COMPANY_ID).offset(_LIMIT_OFFSET).limit(1)
+)
+
+
+@dataclass(frozen=True)
+class PlanSnapshot:
+    id: UUID
+    name: str
+    monthly_price: Decimal
+    max_projects: int
+    max_posts_per_month: int
+    max_connectors: int
+    stripe_price_id: str | None
+
+
+# Plans only change on deploy or through admin mapping edits, so keep detached snapshots per process.
+_PLAN_CACHE: dict[UUID, tuple[float, PlanSnapshot]] = {}
+_PLAN_ID_BY_NAME: dict[str, tuple[float, UUID]] = {}
+_cheapest_plan_id: tuple[float, UUID] | None = None
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+def _snapshot_plan(plan: SubscriptionPlan) -> PlanSnapshot:
+    return PlanSnapshot(
+        id=plan.id,
+        name=plan.name,
+        monthly_price=plan.monthly_price,
+        max_projects=int(plan.max_projects),
+        max_posts_per_month=int(plan.max_posts_per_month),
+        max_connectors=int(plan.max_connectors),
+        stripe_price_id=plan.stripe_price_id,
+    )
+
+
+def invalidate_plan_cache(plan_id: UUID | None = None) -> None:
+    global _cheapest_plan_id
+    with _PLAN_CACHE_LOCK:
+        # Any plan edit can change which plan is cheapest.
+        _cheapest_plan_id = None
+        if plan_id is None:
+            _PLAN_CACHE.clear()
+            _PLAN_ID_BY_NAME.clear()
+        else:
+            _PLAN_CACHE.pop(plan_id, None)
+            for name in [name for name, (_, cached_id) in _PLAN_ID_BY_NAME.items() if cached_id == plan_id]:
+                del _PLAN_ID_BY_NAME[name]
+
+
+def get_cached_plan(db: Session, plan_id: UUID) -> PlanSnapshot | None:
+    now = monotonic()
+    with _PLAN_CACHE_LOCK:
+        cached = _PLAN_CACHE.get(plan_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    plan = db.execute(_STMT_PLAN_BY_ID, {"plan_id": plan_id}).scalar_one_or_none()
+    if plan is None:
+        return None
+    snapshot = _snapshot_plan(plan)
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE[plan_id] = (now + max(1, settings.subscription_plan_cache_ttl_seconds), snapshot)
+    return snapshot
+
+
+def get_cached_plan_by_name(db: Session, plan_name: str) -> PlanSnapshot | None:
+    now = monotonic()
+    with _PLAN_CACHE_LOCK:
+        cached = _PLAN_ID_BY_NAME.get(plan_name)
+    if cached is not None and cached[0] > now:
+        return get_cached_plan(db, cached[1])
 
-def _resolve_plan_context(db: Session, *, company_id: UUID) -> tuple[CompanySubscription | None, SubscriptionPlan | None]:
+    plan = db.execute(_STMT_PLAN_BY_NAME, {"plan_name": plan_name}).scalar_one_or_none()
+    if plan is None:
+        return None
+    snapshot = _snapshot_plan(plan)
+    expires_at = now + max(1, settings.subscription_plan_cache_ttl_seconds)
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE[plan.id] = (expires_at, snapshot)
+        _PLAN_ID_BY_NAME[plan_name] = (expires_at, plan.id)
+    return snapshot
+
+
+def get_cached_cheapest_plan(db: Session) -> PlanSnapshot | None:
+    global _cheapest_plan_id
+    now = monotonic()
+    cached = _cheapest_plan_id
+    if cached is not None and cached[0] > now:
+        return get_cached_plan(db, cached[1])
+
+    plan_id = db.execute(_STMT_CHEAPEST_PLAN_ID).scalar_one_or_none()
+    if plan_id is None:
+        return None
+    with _PLAN_CACHE_LOCK:
+        _cheapest_plan_id = (now + max(1, settings.subscription_plan_cache_ttl_seconds), plan_id)
+    return get_cached_plan(db, plan_id)
+
+
+def _resolve_plan_context(db: Session, *, company_id: UUID) -> tuple[CompanySubscription | None, PlanSnapshot | None]:
     company_subscription = db.execute(
-        select(CompanySubscription).where(CompanySubscription.company_id == company_id)
+        _STMT_SUBSCRIPTION_BY_COMPANY, {"company_id": company_id}
     ).scalar_one_or_none()
     if company_subscription is None:
         return None, None
-    plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.id == company_subscription.plan_id)).scalar_one_or_none()
-    return company_subscription, plan
+    return company_subscription, get_cached_plan(db, company_subscription.plan_id)
 
 
 def seed_plan_stripe_mapping(db: Session) -> None:
@@ -43,19 +171,23 @@ def seed_plan_stripe_mapping(db: Session) -> None:
         "pro": settings.stripe_price_id_pro,
         "enterprise": settings.stripe_price_id_enterprise,
     }
-    plans = db.execute(select(SubscriptionPlan)).scalars().all()
-    for plan in plans:
-        env_price_id = env_mapping.get(plan.name.strip().lower())
-        if env_price_id:
-            if plan.stripe_price_id != env_price_id:
-                plan.stripe_price_id = env_price_id
-                db.add(plan)
-            continue
-        # Dev fallback placeholder mapping keeps local billing flows testable.
-        if not plan.stripe_price_id:
-            slug = plan.name.strip().lower().replace(" ", "_")
-            plan.stripe_price_id = f"price_dev_{slug}"
-            db.add(plan)
+    normalized_name = func.lower(func.trim(SubscriptionPlan.name))
+    # Dev fallback placeholder mapping keeps local billing flows testable.
+    dev_fallback = func.coalesce(
+        func.nullif(SubscriptionPlan.stripe_price_id, ""),
+        func.concat("price_dev_", func.replace(normalized_name, " ", "_")),
+    )
+    env_whens = [(normalized_name == name, price_id) for name, price_id in env_mapping.items() if price_id]
+    target_price_id = case(*env_whens, else_=dev_fallback) if env_whens else dev_fallback
+    updated = db.execute(
+        update(SubscriptionPlan)
+        .where(SubscriptionPlan.stripe_price_id.is_distinct_from(target_price_id))
+        .values(stripe_price_id=target_price_id)
+        .returning(SubscriptionPlan.id)
+        .execution_options(synchronize_session="fetch")
+    ).all()
+    if updated:
+        invalidate_plan_cache()
 
 
 def _normalize_subscription_status(subscription: CompanySubscription | None) -> str:
@@ -71,6 +203,10 @@ def enforce_billing_write_access(db: Session, *, company_id: UUID, action: str)
     if not is_feature_enabled(db, key="v1_billing_enforcement", tenant_id=company_id):
         return
     subscription, _ = _resolve_plan_context(db, company_id=company_id)
+    _enforce_billing_write_access_with_ctx(subscription=subscription, action=action)
+
+
+def _enforce_billing_write_access_with_ctx(*, subscription: CompanySubscription | None, action: str) -> None:
     if subscription is None:
         return
     now = datetime.now(UTC)
@@ -97,21 +233,18 @@ def get_billing_status_payload(db: Session, *, company_id: UUID) -> dict:
     usage = _ensure_usage_row(db, company_id=company_id)
     now = datetime.now(UTC)
 
-    status_value = _normalize_subscription_status(subscription)
-    grace_active = bool(subscription and subscription.grace_period_end and subscription.grace_period_end > now)
-    grace_days_left = 0
-    if subscription and subscription.grace_period_end and subscription.grace_period_end > now:
-        grace_days_left = int((subscription.grace_period_end - now).total_seconds() // 86400)
-    if grace_days_left < 0:
-        grace_days_left = 0
+    grace_period_end = subscription.grace_period_end if subscription else None
+    grace_active = bool(grace_period_end and grace_period_end > now)
+    grace_days_left = int((grace_period_end - now).total_seconds() // 86400) if grace_active else 0
 
+    # Datetimes are left native; the API layer encodes them as ISO 8601.
     return {
-        "status": status_value,
+        "status": _normalize_subscription_status(subscription),
         "grace_active": grace_active,
-        "grace_period_end": subscription.grace_period_end.isoformat() if subscription and subscription.grace_period_end else None,
+        "grace_period_end": grace_period_end,
         "grace_days_left": grace_days_left,
-        "current_period_start": subscription.current_period_start.isoformat() if subscription and subscription.current_period_start else None,
-        "current_period_end": subscription.current_period_end.isoformat() if subscription and subscription.current_period_end else None,
+        "current_period_start": subscription.current_period_start if subscription else None,
+        "current_period_end": subscription.current_period_end if subscription else None,
         "cancel_at_period_end": bool(subscription.cancel_at_period_end) if subscription else False,
         "last_invoice_status": (subscription.last_invoice_status if subscription else None),
         "last_payment_error": (subscription.last_payment_error if subscription else None),
@@ -129,13 +262,13 @@ def get_billing_status_payload(db: Session, *, company_id: UUID) -> dict:
         ),
         "usage": {
             "posts_used_current_period": int(usage.posts_used_current_period or 0),
-            "period_started_at": usage.period_started_at.isoformat() if usage.period_started_at else None,
+            "period_started_at": usage.period_started_at,
         },
     }
 
 
 def _ensure_usage_row(db: Session, *, company_id: UUID) -> CompanyUsage:
-    usage = db.execute(select(CompanyUsage).where(CompanyUsage.company_id == company_id)).scalar_one_or_none()
+    usage = db.execute(_STMT_USAGE_BY_COMPANY, {"company_id": company_id}).scalar_one_or_none()
     if usage is not None:
         return usage
     usage = CompanyUsage(company_id=company_id, posts_used_current_period=0)
@@ -144,87 +277,120 @@ def _ensure_usage_row(db: Session, *, company_id: UUID) -> CompanyUsage:
     return usage
 
 
+def _limit_reached(db: Session, statement, *, company_id: UUID, limit: int) -> bool:
+    if limit <= 0:
+        return True
+    row = db.execute(statement, {"company_id": company_id, "limit_offset": limit - 1}).first()
+    return row is not None
+
+
 def enforce_project_limit(db: Session, *, company_id: UUID) -> None:
-    enforce_billing_write_access(db, company_id=company_id, action="create_project")
-    _, plan = _resolve_plan_context(db, company_id=company_id)
+    billing_enforced = is_feature_enabled(db, key="v1_billing_enforcement", tenant_id=company_id)
+    subscription, plan = _resolve_plan_context(db, company_id=company_id)
+    if billing_enforced:
+        _enforce_billing_write_access_with_ctx(subscription=subscription, action="create_project")
     if plan is None:
         return
-    current_projects = db.execute(
-        select(func.count(Project.id)).where(Project.company_id == company_id)
-    ).scalar_one()
-    if int(current_projects or 0) >= int(plan.max_projects):
+    if _limit_reached(db, _STMT_PROJECT_OVER_LIMIT, company_id=company_id, limit=int(plan.max_projects)):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=PLAN_LIMIT_ERROR)
 
 
 def enforce_connector_limit(db: Session, *, company_id: UUID) -> None:
-    enforce_billing_write_access(db, company_id=company_id, action="add_connector")
-    _, plan = _resolve_plan_context(db, company_id=company_id)
+    billing_enforced = is_feature_enabled(db, key="v1_billing_enforcement", tenant_id=company_id)
+    subscription, plan = _resolve_plan_context(db, company_id=company_id)
+    if billing_enforced:
+        _enforce_billing_write_access_with_ctx(subscription=subscription, action="add_connector")
     if plan is None:
         return
-    current_connectors = db.execute(
-        select(func.count(Channel.id)).where(Channel.company_id == company_id)
-    ).scalar_one()
-    if int(current_connectors or 0) >= int(plan.max_connectors):
+    if _limit_reached(db, _STMT_CONNECTOR_OVER_LIMIT, company_id=company_id, limit=int(plan.max_connectors)):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=PLAN_LIMIT_ERROR)
 
 
 def enforce_post_limit(db: Session, *, company_id: UUID) -> None:
-    enforce_billing_write_access(db, company_id=company_id, action="create_post")
-    subscription, plan = _resolve_plan_context(db, company_id=company_id)
+    billing_enforced = is_feature_enabled(db, key="v1_billing_enforcement", tenant_id=company_id)
+    # Subscription and current usage come back in one round-trip; the plan is served from the cache.
+    row = db.execute(_STMT_SUBSCRIPTION_WITH_USAGE, {"company_id": company_id}).one_or_none()
+    if row is None:
+        return
+    subscription, posts_used = row
+    if billing_enforced:
+        _enforce_billing_write_access_with_ctx(subscription=subscription, action="create_post")
+    plan = get_cached_plan(db, subscription.plan_id)
     if plan is None:
         return
 
-    usage = _ensure_usage_row(db, company_id=company_id)
-    now = datetime.now(UTC)
-    period_end = subscription.current_period_end if subscription is not None else None
+    if posts_used is None:
+        posts_used = int(_ensure_usage_row(db, company_id=company_id).posts_used_current_period or 0)
 
+    now = datetime.now(UTC)
+    period_end = subscription.current_period_end
     if period_end is not None and period_end <= now:
-        usage.posts_used_current_period = 0
-        usage.period_started_at = now
-        usage.updated_at = now
-        if subscription is not None:
-            subscription.current_period_end = now + timedelta(days=30)
-            db.add(subscription)
-        db.add(usage)
+        db.execute(
+            update(CompanyUsage)
+            .where(CompanyUsage.company_id == company_id)
+            .values(posts_used_current_period=0, period_started_at=now, updated_at=now)
+        )
+        subscription.current_period_end = now + timedelta(days=30)
+        db.add(subscription)
         db.flush()
+        posts_used = 0
 
-    if int(usage.posts_used_current_period or 0) >= int(plan.max_posts_per_month):
+    if int(posts_used or 0) >= int(plan.max_posts_per_month):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=PLAN_LIMIT_ERROR)
 
 
-def increment_post_usage(db: Session, *, company_id: UUID, amount: int = 1) -> None:
-    usage = _ensure_usage_row(db, company_id=company_id)
-    usage.posts_used_current_period = int(usage.posts_used_current_period or 0) + int(amount)
-    usage.updated_at = datetime.now(UTC)
-    db.add(usage)
+def increment_post_usage(db: Session, *, company_id: UUID, amount: int = 1) -> int:
+    # Atomic server-side increment: no read-modify-write race between concurrent publishes.
+    params = {"company_id": company_id, "amount": int(amount)}
+    used = db.execute(_STMT_INCREMENT_POST_USAGE, params).scalar_one_or_none()
+    if used is None:
+        _ensure_usage_row(db, company_id=company_id)
+        used = db.execute(_STMT_INCREMENT_POST_USAGE, params).scalar_one()
+    return int(used)
 
 
 def reset_monthly_post_usage(db: Session, *, now: datetime | None = None) -> int:
     current_time = now or datetime.now(UTC)
-    rows = db.execute(
-        select(CompanySubscription).where(
-            CompanySubscription.current_period_end.is_not(None),
-            CompanySubscription.current_period_end <= current_time,
+    expired_condition = (
+        CompanySubscription.current_period_end.is_not(None),
+        CompanySubscription.current_period_end <= current_time,
+    )
+    expired_company_ids = select(CompanySubscription.company_id).where(*expired_condition)
+
+    # Backfill missing usage rows in one statement, then reset all of them server-side.
+    db.execute(
+        pg_insert(CompanyUsage)
+        .from_select(
+            ["id", "company_id", "posts_used_current_period", "period_started_at", "updated_at"],
+            select(
+                func.gen_random_uuid(),
+                CompanySubscription.company_id,
+                literal(0),
+                literal(current_time),
+                literal(current_time),
+            ).where(*expired_condition),
         )
-    ).scalars().all()
-
-    updated = 0
-    for subscription in rows:
-        usage = _ensure_usage_row(db, company_id=subscription.company_id)
-        usage.posts_used_current_period = 0
-        usage.period_started_at = current_time
-        usage.updated_at = current_time
-        subscription.current_period_end = current_time + timedelta(days=30)
-        db.add(usage)
-        db.add(subscription)
-        updated += 1
-    return updated
+        .on_conflict_do_nothing(index_elements=[CompanyUsage.company_id])
+    )
+    db.execute(
+        update(CompanyUsage)
+        .where(CompanyUsage.company_id.in_(expired_company_ids))
+        .values(posts_used_current_period=0, period_started_at=current_time, updated_at=current_time)
+        .execution_options(synchronize_session=False)
+    )
+    renewed = db.execute(
+        update(CompanySubscription)
+        .where(*expired_condition)
+        .values(current_period_end=current_time + timedelta(days=30))
+        .returning(CompanySubscription.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    return len(renewed)
 
 
 def bootstrap_company_billing(db: Session, *, company_id: UUID) -> None:
-    seed_plan_stripe_mapping(db)
     existing_subscription = db.execute(
-        select(CompanySubscription).where(CompanySubscription.company_id == company_id)
+        _STMT_SUBSCRIPTION_BY_COMPANY, {"company_id": company_id}
     ).scalar_one_or_none()
     if existing_subscription is None:
         plan = db.execute(
@@ -240,6 +406,8 @@ def bootstrap_company_billing(db: Session, *, company_id: UUID) -> None:
             )
             db.add(plan)
             db.flush()
+            invalidate_plan_cache()
+            seed_plan_stripe_mapping(db)
         db.add(
             CompanySubscription(
                 company_id=company_id,
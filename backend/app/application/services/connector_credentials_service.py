@@ -1,13 +1,23 @@
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.security import decrypt_secret, encrypt_secret
 from app.domain.models.connector_credential import ConnectorCredential
 from app.domain.models.social_account import SocialAccount
 
+_STMT_CREDENTIAL_BY_TENANT_TYPE = select(ConnectorCredential).where(
+    ConnectorCredential.tenant_id == bindparam("tenant_id"),
+    ConnectorCredential.connector_type == bindparam("connector_type"),
+)
+_STMT_CREDENTIALS_BY_TENANT_TYPES = select(ConnectorCredential).where(
+    ConnectorCredential.tenant_id == bindparam("tenant_id"),
+    ConnectorCredential.connector_type.in_(bindparam("connector_types", expanding=True)),
+)
+
 
 def upsert_connector_credential(
     db: Session,
@@ -22,34 +32,39 @@ def upsert_connector_credential(
     last_error: str | None = None,
 ) -> ConnectorCredential:
     normalized = connector_type.strip().lower()
-    row = db.execute(
-        select(ConnectorCredential).where(
-            ConnectorCredential.tenant_id == tenant_id,
-            ConnectorCredential.connector_type == normalized,
-        )
-    ).scalar_one_or_none()
-    if row is None:
-        row = ConnectorCredential(
-            tenant_id=tenant_id,
-            connector_type=normalized,
-            encrypted_access_token=encrypt_secret(access_token) if access_token else None,
-            encrypted_refresh_token=encrypt_secret(refresh_token) if refresh_token else None,
-            expires_at=expires_at,
-            scopes=scopes or [],
-            status=status,
-            last_error=last_error,
+    values = {
+        "tenant_id": tenant_id,
+        "connector_type": normalized,
+        "encrypted_access_token": encrypt_secret(access_token) if access_token else None,
+        "encrypted_refresh_token": encrypt_secret(refresh_token) if refresh_token else None,
+        "expires_at": expires_at,
+        "scopes": scopes or [],
+        "status": status,
+        "last_error": last_error,
+    }
+    statement = pg_insert(ConnectorCredential).values(**values)
+    excluded = statement.excluded
+    table = ConnectorCredential.__table__.c
+    # Tokens and expiry are only overwritten when a new value was supplied.
+    update_values = {
+        "encrypted_access_token": func.coalesce(excluded.encrypted_access_token, table.encrypted_access_token),
+        "encrypted_refresh_token": func.coalesce(excluded.encrypted_refresh_token, table.encrypted_refresh_token),
+        "expires_at": func.coalesce(excluded.expires_at, table.expires_at),
+        "status": excluded.status,
+        "last_error": excluded.last_error,
+        "updated_at": func.now(),
+    }
+    if scopes:
+        update_values["scopes"] = excluded.scopes
+    statement = (
+        statement.on_conflict_do_update(
+            constraint="uq_connector_credentials_tenant_type",
+            set_=update_values,
         )
-    else:
-        if access_token:
-            row.encrypted_access_token = encrypt_secret(access_token)
-        if refresh_token:
-            row.encrypted_refresh_token = encrypt_secret(refresh_token)
-        row.expires_at = expires_at if expires_at is not None else row.expires_at
-        row.scopes = scopes or row.scopes or []
-        row.status = status
-        row.last_error = last_error
-    db.add(row)
-    return row
+        .returning(ConnectorCredential)
+        .execution_options(populate_existing=True)
+    )
+    return db.execute(statement).scalar_one()
 
 
 def sync_credential_from_social_account(db: Session, *, account: SocialAccount, scopes: list[str] | None = None) -> None:
@@ -67,13 +82,27 @@ def sync_credential_from_social_account(db: Session, *, account: SocialAccount,
 
 def get_connector_credential(db: Session, *, tenant_id: UUID, connector_type: str) -> ConnectorCredential | None:
     return db.execute(
-        select(ConnectorCredential).where(
-            ConnectorCredential.tenant_id == tenant_id,
-            ConnectorCredential.connector_type == connector_type.strip().lower(),
-        )
+        _STMT_CREDENTIAL_BY_TENANT_TYPE,
+        {"tenant_id": tenant_id, "connector_type": connector_type.strip().lower()},
     ).scalar_one_or_none()
 
 
+def get_connector_credentials(
+    db: Session,
+    *,
+    tenant_id: UUID,
+    connector_types: list[str],
+) -> dict[str, ConnectorCredential]:
+    normalized = sorted({value.strip().lower() for value in connector_types})
+    if not normalized:
+        return {}
+    credentials = db.execute(
+        _STMT_CREDENTIALS_BY_TENANT_TYPES,
+        {"tenant_id": tenant_id, "connector_types": normalized},
+    ).scalars()
+    return {credential.connector_type: credential for credential in credentials}
+
+
 def mark_connector_credential_error(
     db: Session,
     *,
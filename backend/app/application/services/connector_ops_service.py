@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import case, func, select
+from sqlalchemy import bindparam, case, func, select
 from sqlalchemy.orm import Session
 
 from app.domain.models.channel import Channel
@@ -15,6 +15,11 @@ CONNECTOR_BACKOFF_PREFIX = "connector_backoff"
 CONNECTOR_COOLDOWN_PREFIX = "connector_health_cooldown"
 CONNECTOR_SANDBOX_PREFIX = "connector_sandbox"
 
+_STMT_CHANNEL_BY_TENANT = select(Channel).where(
+    Channel.id == bindparam("channel_id"),
+    Channel.company_id == bindparam("tenant_id"),
+)
+
 
 def _backoff_key(channel_id: UUID) -> str:
     return f"{CONNECTOR_BACKOFF_PREFIX}:{channel_id}"
@@ -35,8 +40,7 @@ def set_connector_backoff(channel_id: UUID, *, seconds: int) -> None:
 
 def get_connector_backoff_ttl(channel_id: UUID) -> int:
     redis_client = get_redis_client()
-    ttl = redis_client.ttl(_backoff_key(channel_id))
-    return max(0, int(ttl if ttl and ttl > 0 else 0))
+    return _normalize_ttl(redis_client.ttl(_backoff_key(channel_id)))
 
 
 def set_connector_cooldown(channel_id: UUID, *, seconds: int) -> None:
@@ -46,7 +50,10 @@ def set_connector_cooldown(channel_id: UUID, *, seconds: int) -> None:
 
 def get_connector_cooldown_ttl(channel_id: UUID) -> int:
     redis_client = get_redis_client()
-    ttl = redis_client.ttl(_cooldown_key(channel_id))
+    return _normalize_ttl(redis_client.ttl(_cooldown_key(channel_id)))
+
+
+def _normalize_ttl(ttl: int | None) -> int:
     return max(0, int(ttl if ttl and ttl > 0 else 0))
 
 
@@ -68,74 +75,107 @@ def clear_connector_sandbox_mode(channel_id: UUID) -> None:
     redis_client.delete(_sandbox_key(channel_id))
 
 
+def get_connector_ttls_many(channel_ids: list[UUID]) -> dict[UUID, tuple[int, int]]:
+    if not channel_ids:
+        return {}
+    redis_client = get_redis_client()
+    pipeline = redis_client.pipeline(transaction=False)
+    for channel_id in channel_ids:
+        pipeline.ttl(_cooldown_key(channel_id))
+        pipeline.ttl(_backoff_key(channel_id))
+    values = pipeline.execute()
+    return {
+        channel_id: (_normalize_ttl(values[index * 2]), _normalize_ttl(values[index * 2 + 1]))
+        for index, channel_id in enumerate(channel_ids)
+    }
+
+
 def calculate_connector_health(db: Session, *, tenant_id: UUID, channel_id: UUID) -> dict:
-    channel = db.execute(
-        select(Channel).where(Channel.id == channel_id, Channel.company_id == tenant_id)
-    ).scalar_one_or_none()
-    if channel is None:
-        return {"score": 0, "status": "missing"}
+    healths = calculate_connector_healths(db, tenant_id=tenant_id, channel_ids=[channel_id])
+    return healths.get(channel_id) or {"score": 0, "status": "missing"}
 
-    credential = db.execute(
-        select(ConnectorCredential).where(
-            ConnectorCredential.tenant_id == tenant_id,
-            ConnectorCredential.connector_type == channel.type,
-        )
-    ).scalar_one_or_none()
 
-    recent_q = db.execute(
-        select(
-            func.count(PublishEvent.id),
-            func.sum(case((PublishEvent.status == "ok", 1), else_=0)),
-            func.sum(case((PublishEvent.status == "error", 1), else_=0)),
-            func.sum(
-                case(
-                    (PublishEvent.metadata_json["normalized_error"]["category"].astext == "rate_limit", 1),
-                    else_=0,
-                )
-            ),
-        ).where(
-            PublishEvent.company_id == tenant_id,
-            PublishEvent.channel_id == channel_id,
-            PublishEvent.event_type.in_(["ChannelPublishSucceeded", "ChannelPublishFailed"]),
-        )
-    ).one()
+def calculate_connector_healths(db: Session, *, tenant_id: UUID, channel_ids: list[UUID]) -> dict[UUID, dict]:
+    unique_ids = list(dict.fromkeys(channel_ids))
+    if not unique_ids:
+        return {}
 
-    total = int(recent_q[0] or 0)
-    success = int(recent_q[1] or 0)
-    failed = int(recent_q[2] or 0)
-    rate_limited = int(recent_q[3] or 0)
-    success_ratio = (success / total) if total else 1.0
-    failure_ratio = (failed / total) if total else 0.0
-    rate_limit_ratio = (rate_limited / total) if total else 0.0
-
-    token_ok = bool(credential and credential.status == "active")
-    token_valid_factor = 1.0 if token_ok else 0.4
-
-    score = int(
-        max(
-            0.0,
-            min(
-                100.0,
-                (success_ratio * 65.0)
-                + ((1.0 - rate_limit_ratio) * 20.0)
-                + (token_valid_factor * 15.0),
-            ),
-        )
-    )
+    channels = db.execute(
+        select(Channel).where(Channel.id.in_(unique_ids), Channel.company_id == tenant_id)
+    ).scalars().all()
+    if not channels:
+        return {}
+
+    connector_types = {channel.type for channel in channels}
+    credentials = {
+        credential.connector_type: credential
+        for credential in db.execute(
+            select(ConnectorCredential).where(
+                ConnectorCredential.tenant_id == tenant_id,
+                ConnectorCredential.connector_type.in_(connector_types),
+            )
+        ).scalars()
+    }
 
-    return {
-        "channel_id": str(channel.id),
-        "connector_type": channel.type,
-        "score": score,
-        "success_ratio": round(success_ratio, 4),
-        "failure_ratio": round(failure_ratio, 4),
-        "rate_limit_ratio": round(rate_limit_ratio, 4),
-        "token_status": (credential.status if credential else "missing"),
-        "token_expires_at": credential.expires_at.isoformat() if credential and credential.expires_at else None,
-        "last_error": credential.last_error if credential else None,
-        "cooldown_seconds": get_connector_cooldown_ttl(channel.id),
-        "backoff_seconds": get_connector_backoff_ttl(channel.id),
+    stats_by_channel = {
+        row[0]: row[1:]
+        for row in db.execute(
+            select(
+                PublishEvent.channel_id,
+                func.count(PublishEvent.id),
+                func.sum(case((PublishEvent.status == "ok", 1), else_=0)),
+                func.sum(case((PublishEvent.status == "error", 1), else_=0)),
+                func.sum(case((PublishEvent.normalized_error_category == "rate_limit", 1), else_=0)),
+            )
+            .where(
+                PublishEvent.company_id == tenant_id,
+                PublishEvent.channel_id.in_([channel.id for channel in channels]),
+                PublishEvent.event_type.in_(["ChannelPublishSucceeded", "ChannelPublishFailed"]),
+            )
+            .group_by(PublishEvent.channel_id)
+        ).all()
     }
+    ttls = get_connector_ttls_many([channel.id for channel in channels])
+
+    healths: dict[UUID, dict] = {}
+    for channel in channels:
+        credential = credentials.get(channel.type)
+        stats = stats_by_channel.get(channel.id, (0, 0, 0, 0))
+        total, success, failed, rate_limited = (int(value or 0) for value in stats)
+        success_ratio = (success / total) if total else 1.0
+        failure_ratio = (failed / total) if total else 0.0
+        rate_limit_ratio = (rate_limited / total) if total else 0.0
+
+        token_ok = bool(credential and credential.status == "active")
+        token_valid_factor = 1.0 if token_ok else 0.4
+
+        score = int(
+            max(
+                0.0,
+                min(
+                    100.0,
+                    (success_ratio * 65.0)
+                    + ((1.0 - rate_limit_ratio) * 20.0)
+                    + (token_valid_factor * 15.0),
+                ),
+            )
+        )
+
+        cooldown_seconds, backoff_seconds = ttls.get(channel.id, (0, 0))
+        healths[channel.id] = {
+            "channel_id": str(channel.id),
+            "connector_type": channel.type,
+            "score": score,
+            "success_ratio": round(success_ratio, 4),
+            "failure_ratio": round(failure_ratio, 4),
+            "rate_limit_ratio": round(rate_limit_ratio, 4),
+            "token_status": (credential.status if credential else "missing"),
+            "token_expires_at": credential.expires_at.isoformat() if credential and credential.expires_at else None,
+            "last_error": credential.last_error if credential else None,
+            "cooldown_seconds": cooldown_seconds,
+            "backoff_seconds": backoff_seconds,
+        }
+    return healths
 
 
 def maybe_trip_connector_circuit_breaker(
@@ -146,12 +186,12 @@ def maybe_trip_connector_circuit_breaker(
     consecutive_failures_threshold: int,
 ) -> bool:
     channel = db.execute(
-        select(Channel).where(Channel.id == channel_id, Channel.company_id == tenant_id)
+        _STMT_CHANNEL_BY_TENANT, {"channel_id": channel_id, "tenant_id": tenant_id}
     ).scalar_one_or_none()
     if channel is None:
         return False
 
-    rows = db.execute(
+    recent = (
         select(PublishEvent.status)
         .where(
             PublishEvent.company_id == tenant_id,
@@ -160,10 +200,12 @@ def maybe_trip_connector_circuit_breaker(
         )
         .order_by(PublishEvent.created_at.desc())
         .limit(max(1, consecutive_failures_threshold))
-    ).scalars().all()
-    if len(rows) < consecutive_failures_threshold:
-        return False
-    if any(value == "ok" for value in rows):
+        .subquery()
+    )
+    recent_count, any_ok = db.execute(
+        select(func.count(), func.coalesce(func.bool_or(recent.c.status == "ok"), False)).select_from(recent)
+    ).one()
+    if int(recent_count or 0) < consecutive_failures_threshold or any_ok:
         return False
 
     channel.status = "disabled"
@@ -173,7 +215,7 @@ def maybe_trip_connector_circuit_breaker(
 
 def mark_connector_reenabled(db: Session, *, tenant_id: UUID, channel_id: UUID) -> None:
     channel = db.execute(
-        select(Channel).where(Channel.id == channel_id, Channel.company_id == tenant_id)
+        _STMT_CHANNEL_BY_TENANT, {"channel_id": channel_id, "tenant_id": tenant_id}
     ).scalar_one_or_none()
     if channel is None:
         return
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-import json
-from uuid import UUID
+from contextvars import ContextVar
+from time import monotonic
+from uuid import UUID, uuid4
 
+import orjson
+from redis import Redis
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -35,76 +39,193 @@ FLAG_KEYS = [
     ("v1_billing_enforcement", "Billing-aware write restrictions and grace-period controls"),
 ]
 
+_STMT_ALL_FLAGS = select(FeatureFlag).order_by(FeatureFlag.key.asc())
+_STMT_FLAG_KEYS = select(FeatureFlag.key)
+_STMT_FLAG_STATES = select(FeatureFlag.key, FeatureFlag.enabled_globally, FeatureFlag.enabled_per_tenant)
+
+# Process-level {flag_key: may_be_enabled}; False means off globally with no tenant overrides,
+# which lets is_feature_enabled answer the common case from memory, without Redis or the DB.
+# Once per TTL window the snapshot is compared with the shared version stamp that every invalidation
+# bumps: an unchanged stamp renews it, a moved one rebuilds it, so a flag flip made by another process
+# reaches this one within one window.
+FEATURE_FLAG_VERSION_KEY = "feature_flag_version"
+_GLOBAL_FLAG_SNAPSHOT: dict[str, bool] = {}
+_GLOBAL_FLAG_SNAPSHOT_VERSION: str | None = None
+_GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT = 0.0
+
 
 def bootstrap_feature_flags(db: Session) -> None:
     existing_keys = {
         key
-        for (key,) in db.execute(select(FeatureFlag.key)).all()
+        for (key,) in db.execute(_STMT_FLAG_KEYS).all()
     }
-    for key, description in FLAG_KEYS:
-        if key in existing_keys:
-            continue
-        db.add(
-            FeatureFlag(
-                key=key,
-                enabled_globally=False,
-                enabled_per_tenant={},
-                description=description,
-            )
-        )
+    missing = [
+        {
+            "id": uuid4(),
+            "key": key,
+            "enabled_globally": False,
+            "enabled_per_tenant": {},
+            "description": description,
+        }
+        for key, description in FLAG_KEYS
+        if key not in existing_keys
+    ]
+    if not missing:
+        return
+    # One multi-row INSERT; concurrent bootstraps racing on the same keys are harmless.
+    db.execute(pg_insert(FeatureFlag).values(missing).on_conflict_do_nothing(index_elements=[FeatureFlag.key]))
 
 
 def _cache_key(tenant_id: UUID | None) -> str:
     return f"feature_flags:{str(tenant_id) if tenant_id else 'global'}"
 
 
+def _map_cache_key(tenant_id: UUID | None) -> str:
+    return f"feature_flags_map:{str(tenant_id) if tenant_id else 'global'}"
+
+
+# Per-request memo of {cache_key: {flag_key: effective_enabled}}; None outside an HTTP request.
+_request_flag_cache: ContextVar[dict[str, dict[str, bool]] | None] = ContextVar("feature_flag_request_cache", default=None)
+
+
+def begin_feature_flag_request_cache() -> object:
+    return _request_flag_cache.set({})
+
+
+def reset_feature_flag_request_cache(token: object) -> None:
+    _request_flag_cache.reset(token)
+
+
+def _store_global_flag_snapshot(rows, version: str | None) -> dict[str, bool]:
+    global _GLOBAL_FLAG_SNAPSHOT, _GLOBAL_FLAG_SNAPSHOT_VERSION, _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT
+    snapshot: dict[str, bool] = {}
+    for key, enabled_globally, enabled_per_tenant in rows:
+        has_overrides = isinstance(enabled_per_tenant, dict) and any(enabled_per_tenant.values())
+        snapshot[key] = bool(enabled_globally) or has_overrides
+    _GLOBAL_FLAG_SNAPSHOT = snapshot
+    _GLOBAL_FLAG_SNAPSHOT_VERSION = version
+    _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT = monotonic() + max(10, settings.feature_flag_cache_ttl_seconds)
+    return snapshot
+
+
+def _get_global_flag_snapshot(db: Session) -> dict[str, bool]:
+    global _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT
+    if monotonic() < _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT:
+        return _GLOBAL_FLAG_SNAPSHOT
+
+    # Read the stamp before the rows: an invalidation landing in between leaves an older stamp on the
+    # snapshot, so the next check rebuilds instead of pinning stale state.
+    version = get_redis_client().get(FEATURE_FLAG_VERSION_KEY)
+    if _GLOBAL_FLAG_SNAPSHOT and version == _GLOBAL_FLAG_SNAPSHOT_VERSION:
+        _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT = monotonic() + max(10, settings.feature_flag_cache_ttl_seconds)
+        return _GLOBAL_FLAG_SNAPSHOT
+    return _store_global_flag_snapshot(db.execute(_STMT_FLAG_STATES).all(), version)
+
+
 def invalidate_feature_flags_cache(tenant_id: UUID | None = None) -> None:
+    global _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT
+    _GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT = 0.0
+    request_cache = _request_flag_cache.get()
+    if request_cache is not None:
+        request_cache.clear()
     redis = get_redis_client()
+    # Tenant overrides feed the snapshot too, so every invalidation moves the shared stamp.
+    redis.incr(FEATURE_FLAG_VERSION_KEY)
     if tenant_id is None:
-        keys = redis.keys("feature_flags:*")
+        keys = [*redis.keys("feature_flags:*"), *redis.keys("feature_flags_map:*")]
         if keys:
             redis.delete(*keys)
         return
-    redis.delete(_cache_key(tenant_id))
+    redis.delete(_cache_key(tenant_id), _map_cache_key(tenant_id))
 
 
 def _serialize_flags(flags: list[FeatureFlag], tenant_id: UUID | None) -> list[dict]:
-    tenant_key = str(tenant_id) if tenant_id else ""
-    payload: list[dict] = []
-    for flag in flags:
-        enabled_for_tenant = False
-        if tenant_key and isinstance(flag.enabled_per_tenant, dict):
-            enabled_for_tenant = bool(flag.enabled_per_tenant.get(tenant_key, False))
-        payload.append(
-            {
-                "id": str(flag.id),
-                "key": flag.key,
-                "description": flag.description,
-                "enabled_globally": bool(flag.enabled_globally),
-                "enabled_for_tenant": enabled_for_tenant,
-                "effective_enabled": bool(flag.enabled_globally) or enabled_for_tenant,
-                "updated_at": flag.updated_at.isoformat(),
-            }
+    tenant_key = str(tenant_id) if tenant_id else None
+    # enabled_per_tenant is a non-null JSONB column defaulting to {}.
+    rows = (
+        (
+            flag,
+            bool(flag.enabled_globally),
+            bool(tenant_key and (flag.enabled_per_tenant or {}).get(tenant_key, False)),
         )
+        for flag in flags
+    )
+    return [
+        {
+            "id": str(flag.id),
+            "key": flag.key,
+            "description": flag.description,
+            "enabled_globally": enabled_globally,
+            "enabled_for_tenant": enabled_for_tenant,
+            "effective_enabled": enabled_globally or enabled_for_tenant,
+            "updated_at": flag.updated_at.isoformat(),
+        }
+        for flag, enabled_globally, enabled_for_tenant in rows
+    ]
+
+
+def _flag_map(payload: list[dict]) -> dict[str, bool]:
+    return {item["key"]: bool(item["effective_enabled"]) for item in payload}
+
+
+def _load_and_cache_flags(db: Session, redis: Redis, *, tenant_id: UUID | None) -> list[dict]:
+    version = redis.get(FEATURE_FLAG_VERSION_KEY)
+    flags = db.execute(_STMT_ALL_FLAGS).scalars().all()
+    _store_global_flag_snapshot(
+        ((flag.key, flag.enabled_globally, flag.enabled_per_tenant) for flag in flags),
+        version,
+    )
+    payload = _serialize_flags(flags, tenant_id)
+    ttl = max(10, settings.feature_flag_cache_ttl_seconds)
+    pipeline = redis.pipeline()
+    pipeline.set(_cache_key(tenant_id), orjson.dumps(payload), ex=ttl)
+    pipeline.set(_map_cache_key(tenant_id), orjson.dumps(_flag_map(payload)), ex=ttl)
+    pipeline.execute()
     return payload
 
 
 def list_feature_flags(db: Session, *, tenant_id: UUID | None) -> list[dict]:
     redis = get_redis_client()
-    cache_key = _cache_key(tenant_id)
+    cached = redis.get(_cache_key(tenant_id))
+    if cached:
+        return orjson.loads(cached)
+    return _load_and_cache_flags(db, redis, tenant_id=tenant_id)
+
+
+def _get_flag_map(db: Session, *, tenant_id: UUID | None) -> dict[str, bool]:
+    cache_key = _map_cache_key(tenant_id)
+    request_cache = _request_flag_cache.get()
+    if request_cache is not None:
+        flag_map = request_cache.get(cache_key)
+        if flag_map is not None:
+            return flag_map
+
+    redis = get_redis_client()
     cached = redis.get(cache_key)
     if cached:
-        return json.loads(cached)
+        flag_map = orjson.loads(cached)
+    else:
+        flag_map = _flag_map(_load_and_cache_flags(db, redis, tenant_id=tenant_id))
 
-    flags = db.execute(select(FeatureFlag).order_by(FeatureFlag.key.asc())).scalars().all()
-    payload = _serialize_flags(flags, tenant_id)
-    redis.set(cache_key, json.dumps(payload), ex=max(10, settings.feature_flag_cache_ttl_seconds))
-    return payload
+    if request_cache is not None:
+        request_cache[cache_key] = flag_map
+    return flag_map
+
+
+def load_feature_flag_states(db: Session, *, keys: list[str]) -> dict[str, tuple[bool, dict]]:
+    rows = db.execute(_STMT_FLAG_STATES.where(FeatureFlag.key.in_(keys))).all()
+    return {key: (bool(enabled_globally), enabled_per_tenant or {}) for key, enabled_globally, enabled_per_tenant in rows}
+
+
+def feature_enabled_in(states: dict[str, tuple[bool, dict]], *, key: str, tenant_id: UUID | None) -> bool:
+    state = states.get(key)
+    if state is None:
+        return False
+    enabled_globally, enabled_per_tenant = state
+    return enabled_globally or (tenant_id is not None and bool(enabled_per_tenant.get(str(tenant_id), False)))
 
 
 def is_feature_enabled(db: Session, *, key: str, tenant_id: UUID | None) -> bool:
-    flags = list_feature_flags(db, tenant_id=tenant_id)
-    for flag in flags:
-        if flag["key"] == key:
-            return bool(flag["effective_enabled"])
-    return False
+    if not _get_global_flag_snapshot(db).get(key, True):
+        return False
+    return bool(_get_flag_map(db, tenant_id=tenant_id).get(key, False))
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime, timedelta
+from heapq import nlargest
+from math import fsum
 from statistics import mean
 from time import perf_counter
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select, text
+import orjson
+from sqlalchemy import Float, bindparam, case, cast, func, insert, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.application.services.audit_service import log_audit_event
-from app.application.services.feature_flag_service import is_feature_enabled
+from app.application.services.feature_flag_service import (
+    feature_enabled_in,
+    is_feature_enabled,
+    load_feature_flag_states,
+)
 from app.core.config import settings
 from app.domain.models.channel import Channel
 from app.domain.models.company import Company
@@ -30,9 +38,31 @@ from app.infrastructure.cache.redis_client import get_redis_client
 
 AUTO_THROTTLE_TTL_SECONDS = 15 * 60
 TENANT_RISK_THRESHOLD = settings.tenant_risk_manual_approval_threshold
-
-
-@dataclass(frozen=True)
+PUBLISH_ATTEMPT_EVENT_TYPES = ("ChannelPublishSucceeded", "ChannelPublishFailed")
+
+# Health thresholds are fixed for the life of the process; resolve them once.
+_PUBLISH_FAILURE_WARN_PCT = settings.system_publish_failure_alert_threshold * 100
+_PUBLISH_FAILURE_CRIT_PCT = _PUBLISH_FAILURE_WARN_PCT * 2
+_DB_LATENCY_WARN_MS = float(settings.system_db_latency_alert_ms)
+_DB_LATENCY_CRIT_MS = _DB_LATENCY_WARN_MS * 2
+_WORKER_BACKLOG_WARN = float(settings.system_worker_backlog_alert_threshold)
+_WORKER_BACKLOG_CRIT = _WORKER_BACKLOG_WARN * 3
+
+# Dashboards poll health from several clients; collapse bursts onto one evaluation.
+HEALTH_SCORE_CACHE_KEY = "platform:health:score:v1"
+HEALTH_SCORE_LOCK_KEY = "platform:health:lock"
+HEALTH_SCORE_CACHE_TTL_SECONDS = 5
+HEALTH_SCORE_LOCK_TTL_SECONDS = 10
+# Last good score, kept past the fresh TTL so callers that lose the lock answer immediately instead of
+# blocking on the evaluating worker.
+HEALTH_SCORE_STALE_KEY = "platform:health:score:stale:v1"
+HEALTH_SCORE_STALE_TTL_SECONDS = 60
+
+# Celery queues whose depth makes up the worker backlog component.
+HEALTH_QUEUE_NAMES = ("publishing", "scheduler", "analytics")
+
+
+@dataclass(frozen=True, slots=True)
 class SystemHealthScore:
     score: int
     components: list[dict]
@@ -43,62 +73,142 @@ class SystemHealthScore:
     request_latency_ms: float
 
 
-def _upsert_system_health(
-    db: Session,
-    *,
-    component: str,
-    status: str,
-    latency_ms: float,
-    error_rate: float,
-) -> None:
-    existing = db.execute(select(SystemHealth).where(SystemHealth.component == component)).scalar_one_or_none()
-    if existing is None:
-        existing = SystemHealth(component=component)
-    existing.status = status
-    existing.latency_ms = float(max(0.0, latency_ms))
-    existing.error_rate = float(max(0.0, error_rate))
-    existing.updated_at = datetime.now(UTC)
-    db.add(existing)
+def _system_health_row(*, component: str, status: str, latency_ms: float, error_rate: float, now: datetime) -> dict:
+    return {
+        "id": uuid4(),
+        "component": component,
+        "status": status,
+        "latency_ms": float(max(0.0, latency_ms)),
+        "error_rate": float(max(0.0, error_rate)),
+        "updated_at": now,
+    }
 
 
-def _worker_backlog_size() -> int:
-    redis = get_redis_client()
+def _upsert_system_health(db: Session, rows: list[dict]) -> list[dict]:
+    statement = pg_insert(SystemHealth).values(rows)
+    excluded = statement.excluded
+    upserted = db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[SystemHealth.component],
+            set_={
+                "status": excluded.status,
+                "latency_ms": excluded.latency_ms,
+                "error_rate": excluded.error_rate,
+                "updated_at": excluded.updated_at,
+            },
+        ).returning(
+            SystemHealth.component,
+            SystemHealth.status,
+            SystemHealth.latency_ms,
+            SystemHealth.error_rate,
+            SystemHealth.updated_at,
+        )
+    ).all()
+    return [
+        {
+            "component": item.component,
+            "status": item.status,
+            "latency_ms": item.latency_ms,
+            "error_rate": item.error_rate,
+            "updated_at": item.updated_at,
+        }
+        for item in sorted(upserted, key=lambda item: item.component)
+    ]
+
+
+def _redis_health_probes() -> tuple[float, int, float]:
+    # One round trip answers every Redis probe: its elapsed time is the latency sample, and the same reply
+    # carries the queue depths and the rolling request latency.
+    pipeline = get_redis_client().pipeline(transaction=False)
+    pipeline.ping()
+    for queue_name in HEALTH_QUEUE_NAMES:
+        pipeline.llen(queue_name)
+    pipeline.get("platform:perf:request_latency_ms:avg")
+    started = perf_counter()
+    _, *queue_lengths, request_latency_raw = pipeline.execute(raise_on_error=False)
+    redis_latency_ms = round((perf_counter() - started) * 1000, 3)
+    worker_backlog_size = sum(value for value in queue_lengths if isinstance(value, int))
+    try:
+        request_latency_ms = float(request_latency_raw) if request_latency_raw is not None else 0.0
+    except (TypeError, ValueError):
+        request_latency_ms = 0.0
+    return redis_latency_ms, worker_backlog_size, request_latency_ms
+
+
+# Hot statements are built once at import; each call only binds parameters.
+_STMT_PUBLISH_FAILURE_RATE = select(
+    func.count(PublishEvent.id).filter(PublishEvent.event_type == "ChannelPublishFailed"),
+    func.count(PublishEvent.id),
+).where(
+    PublishEvent.created_at >= bindparam("since"),
+    PublishEvent.event_type.in_(PUBLISH_ATTEMPT_EVENT_TYPES),
+)
+
+
+# Per-minute publish outcome counters; the health path sums the last hour of buckets with one MGET.
+PUBLISH_ATTEMPTS_BUCKET_PREFIX = "platform:publish:attempts"
+PUBLISH_FAILURES_BUCKET_PREFIX = "platform:publish:failures"
+PUBLISH_BUCKET_TTL_SECONDS = 3700
+# First minute bucket counted since the counters (re)started; set once with NX. Buckets older than this
+# were never counted, so a window reaching past it is incomplete and must be answered from SQL. A flush or
+# eviction drops the marker, which restarts coverage at the next recorded bucket.
+PUBLISH_BUCKETS_SINCE_KEY = "platform:publish:buckets_since"
+
+
+def _publish_minute_bucket(moment: datetime) -> int:
+    return int(moment.timestamp()) // 60
+
+
+def record_publish_outcomes(*, succeeded: int, failed: int) -> None:
+    attempts = succeeded + failed
+    if attempts <= 0:
+        return
+    bucket = _publish_minute_bucket(datetime.now(UTC))
     try:
-        return sum(int(redis.llen(queue_name) or 0) for queue_name in ("publishing", "scheduler", "analytics"))
+        pipeline = get_redis_client().pipeline(transaction=False)
+        pipeline.set(PUBLISH_BUCKETS_SINCE_KEY, bucket, nx=True)
+        pipeline.incrby(f"{PUBLISH_ATTEMPTS_BUCKET_PREFIX}:{bucket}", attempts)
+        pipeline.expire(f"{PUBLISH_ATTEMPTS_BUCKET_PREFIX}:{bucket}", PUBLISH_BUCKET_TTL_SECONDS)
+        if failed > 0:
+            pipeline.incrby(f"{PUBLISH_FAILURES_BUCKET_PREFIX}:{bucket}", failed)
+            pipeline.expire(f"{PUBLISH_FAILURES_BUCKET_PREFIX}:{bucket}", PUBLISH_BUCKET_TTL_SECONDS)
+        pipeline.execute()
     except Exception:
-        return 0
+        return
 
 
-def _request_latency_ms_sample() -> float:
-    redis = get_redis_client()
+def _counted_publish_outcomes(*, now: datetime, window_minutes: int) -> tuple[int, int] | None:
+    # None means the counters do not cover the whole window and the caller has to ask SQL.
+    current = _publish_minute_bucket(now)
+    first = current - window_minutes + 1
+    buckets = range(first, current + 1)
+    keys = [PUBLISH_BUCKETS_SINCE_KEY]
+    keys.extend(f"{PUBLISH_ATTEMPTS_BUCKET_PREFIX}:{bucket}" for bucket in buckets)
+    keys.extend(f"{PUBLISH_FAILURES_BUCKET_PREFIX}:{bucket}" for bucket in buckets)
     try:
-        raw = redis.get("platform:perf:request_latency_ms:avg")
-        if raw is None:
-            return 0.0
-        return float(raw)
+        covered_since, *values = get_redis_client().mget(keys)
     except Exception:
-        return 0.0
+        return None
+    if covered_since is None or int(covered_since) > first:
+        return None
+    counts = [int(value or 0) for value in values]
+    return sum(counts[:window_minutes]), sum(counts[window_minutes:])
 
 
-def _publish_failure_rate(db: Session, *, window_minutes: int = 60) -> float:
-    since = datetime.now(UTC) - timedelta(minutes=window_minutes)
-    attempts = db.execute(
-        select(func.count(PublishEvent.id)).where(
-            PublishEvent.created_at >= since,
-            PublishEvent.event_type.in_(["ChannelPublishSucceeded", "ChannelPublishFailed"]),
-        )
-    ).scalar_one()
-    failures = db.execute(
-        select(func.count(PublishEvent.id)).where(
-            PublishEvent.created_at >= since,
-            PublishEvent.event_type == "ChannelPublishFailed",
-        )
-    ).scalar_one()
+def _publish_failure_rate(db: Session, *, now: datetime, window_minutes: int = 60) -> float:
+    counted = _counted_publish_outcomes(now=now, window_minutes=window_minutes)
+    if counted is not None:
+        attempts_counted, failures_counted = counted
+        if attempts_counted <= 0:
+            return 0.0
+        return min(1.0, failures_counted / attempts_counted)
+    # Partial coverage (fresh or flushed Redis, counters started mid-window): scan the event log instead.
+    since = now - timedelta(minutes=window_minutes)
+    failures, attempts = db.execute(_STMT_PUBLISH_FAILURE_RATE, {"since": since}).one()
     attempts_value = float(attempts or 0)
-    failures_value = float(failures or 0)
     if attempts_value <= 0:
         return 0.0
-    return failures_value / attempts_value
+    return float(failures or 0) / attempts_value
 
 
 def _db_latency_ms(db: Session) -> float:
@@ -107,13 +217,6 @@ def _db_latency_ms(db: Session) -> float:
     return round((perf_counter() - started) * 1000, 3)
 
 
-def _redis_latency_ms() -> float:
-    redis = get_redis_client()
-    started = perf_counter()
-    redis.ping()
-    return round((perf_counter() - started) * 1000, 3)
-
-
 def _status_for_threshold(value: float, warning: float, critical: float) -> str:
     if value >= critical:
         return "critical"
@@ -122,61 +225,92 @@ def _status_for_threshold(value: float, warning: float, critical: float) -> str:
     return "ok"
 
 
+def _cached_system_health_score(key: str = HEALTH_SCORE_CACHE_KEY) -> SystemHealthScore | None:
+    raw = get_redis_client().get(key)
+    if not raw:
+        return None
+    payload = orjson.loads(raw)
+    # JSON carries updated_at as an ISO string; restore the datetime a fresh evaluation returns.
+    for component in payload["components"]:
+        component["updated_at"] = datetime.fromisoformat(component["updated_at"])
+    return SystemHealthScore(**payload)
+
+
 def calculate_system_health_score(db: Session) -> SystemHealthScore:
-    publish_failure_rate = _publish_failure_rate(db)
+    cached = _cached_system_health_score()
+    if cached is not None:
+        return cached
+
+    redis = get_redis_client()
+    acquired = bool(redis.set(HEALTH_SCORE_LOCK_KEY, "1", nx=True, ex=HEALTH_SCORE_LOCK_TTL_SECONDS))
+    if not acquired:
+        # Another worker is evaluating; serve the previous score rather than waiting on it.
+        stale = _cached_system_health_score(HEALTH_SCORE_STALE_KEY)
+        if stale is not None:
+            return stale
+    try:
+        health = _evaluate_system_health_score(db)
+        encoded = orjson.dumps(asdict(health))
+        pipeline = redis.pipeline(transaction=False)
+        pipeline.set(HEALTH_SCORE_CACHE_KEY, encoded, ex=HEALTH_SCORE_CACHE_TTL_SECONDS)
+        pipeline.set(HEALTH_SCORE_STALE_KEY, encoded, ex=HEALTH_SCORE_STALE_TTL_SECONDS)
+        pipeline.execute()
+        return health
+    finally:
+        if acquired:
+            redis.delete(HEALTH_SCORE_LOCK_KEY)
+
+
+def _evaluate_system_health_score(db: Session) -> SystemHealthScore:
+    now = datetime.now(UTC)
+    publish_failure_rate = _publish_failure_rate(db, now=now)
     db_latency_ms = _db_latency_ms(db)
-    redis_latency_ms = _redis_latency_ms()
-    worker_backlog_size = _worker_backlog_size()
-    request_latency_ms = _request_latency_ms_sample()
+    redis_latency_ms, worker_backlog_size, request_latency_ms = _redis_health_probes()
 
-    _upsert_system_health(
-        db,
-        component="publishing",
-        status=_status_for_threshold(
-            publish_failure_rate * 100,
-            settings.system_publish_failure_alert_threshold * 100,
-            (settings.system_publish_failure_alert_threshold * 100) * 2,
-        ),
-        latency_ms=0.0,
-        error_rate=publish_failure_rate,
-    )
-    _upsert_system_health(
+    components = _upsert_system_health(
         db,
-        component="database",
-        status=_status_for_threshold(
-            db_latency_ms,
-            float(settings.system_db_latency_alert_ms),
-            float(settings.system_db_latency_alert_ms * 2),
-        ),
-        latency_ms=db_latency_ms,
-        error_rate=0.0,
-    )
-    _upsert_system_health(
-        db,
-        component="redis",
-        status=_status_for_threshold(redis_latency_ms, 40, 100),
-        latency_ms=redis_latency_ms,
-        error_rate=0.0,
-    )
-    _upsert_system_health(
-        db,
-        component="worker_backlog",
-        status=_status_for_threshold(
-            float(worker_backlog_size),
-            float(settings.system_worker_backlog_alert_threshold),
-            float(settings.system_worker_backlog_alert_threshold * 3),
-        ),
-        latency_ms=0.0,
-        error_rate=0.0,
-    )
-    _upsert_system_health(
-        db,
-        component="api_requests",
-        status=_status_for_threshold(request_latency_ms, 250, 700),
-        latency_ms=request_latency_ms,
-        error_rate=0.0,
+        [
+            _system_health_row(
+                component="publishing",
+                status=_status_for_threshold(
+                    publish_failure_rate * 100, _PUBLISH_FAILURE_WARN_PCT, _PUBLISH_FAILURE_CRIT_PCT
+                ),
+                latency_ms=0.0,
+                error_rate=publish_failure_rate,
+                now=now,
+            ),
+            _system_health_row(
+                component="database",
+                status=_status_for_threshold(db_latency_ms, _DB_LATENCY_WARN_MS, _DB_LATENCY_CRIT_MS),
+                latency_ms=db_latency_ms,
+                error_rate=0.0,
+                now=now,
+            ),
+            _system_health_row(
+                component="redis",
+                status=_status_for_threshold(redis_latency_ms, 40, 100),
+                latency_ms=redis_latency_ms,
+                error_rate=0.0,
+                now=now,
+            ),
+            _system_health_row(
+                component="worker_backlog",
+                status=_status_for_threshold(
+                    float(worker_backlog_size), _WORKER_BACKLOG_WARN, _WORKER_BACKLOG_CRIT
+                ),
+                latency_ms=0.0,
+                error_rate=0.0,
+                now=now,
+            ),
+            _system_health_row(
+                component="api_requests",
+                status=_status_for_threshold(request_latency_ms, 250, 700),
+                latency_ms=request_latency_ms,
+                error_rate=0.0,
+                now=now,
+            ),
+        ],
     )
-    db.flush()
 
     penalties = [
         min(35.0, publish_failure_rate * 400.0),
@@ -186,19 +320,9 @@ def calculate_system_health_score(db: Session) -> SystemHealthScore:
         min(10.0, max(0.0, request_latency_ms - 120.0) / 20.0),
     ]
     score = int(max(0.0, min(100.0, 100.0 - sum(penalties))))
-    components = db.execute(select(SystemHealth).order_by(SystemHealth.component.asc())).scalars().all()
     return SystemHealthScore(
         score=score,
-        components=[
-            {
-                "component": item.component,
-                "status": item.status,
-                "latency_ms": item.latency_ms,
-                "error_rate": item.error_rate,
-                "updated_at": item.updated_at.isoformat(),
-            }
-            for item in components
-        ],
+        components=components,
         publish_failure_rate=publish_failure_rate,
         db_latency_ms=db_latency_ms,
         redis_latency_ms=redis_latency_ms,
@@ -239,58 +363,122 @@ def resolve_incident(db: Session, *, incident_id: UUID, resolved_by: str) -> Pla
     return incident
 
 
-def _tenant_publish_failure_ratio(db: Session, company_id: UUID, window_days: int = 7) -> float:
-    since = datetime.now(UTC) - timedelta(days=window_days)
-    attempts = db.execute(
-        select(func.count(PublishEvent.id)).where(
-            PublishEvent.company_id == company_id,
-            PublishEvent.created_at >= since,
-            PublishEvent.event_type.in_(["ChannelPublishSucceeded", "ChannelPublishFailed"]),
-        )
-    ).scalar_one()
-    failures = db.execute(
-        select(func.count(PublishEvent.id)).where(
-            PublishEvent.company_id == company_id,
-            PublishEvent.created_at >= since,
-            PublishEvent.event_type == "ChannelPublishFailed",
-        )
-    ).scalar_one()
-    attempts_value = float(attempts or 0)
-    if attempts_value <= 0:
-        return 0.0
-    return float(failures or 0) / attempts_value
+_UPSERT_CHUNK_SIZE = 500
 
 
-def _tenant_flagged_content_ratio(db: Session, company_id: UUID, window_days: int = 30) -> float:
-    since = datetime.now(UTC) - timedelta(days=window_days)
-    ai_items = db.execute(
-        select(ContentItem).where(ContentItem.company_id == company_id, ContentItem.created_at >= since)
-    ).scalars().all()
-    if not ai_items:
-        return 0.0
-    flagged = 0
-    for item in ai_items:
-        quality = (item.metadata_json or {}).get("quality", {})
-        risk_score = float(quality.get("risk_score", 0.0) or 0.0) if isinstance(quality, dict) else 0.0
-        if item.status == "needs_review" or risk_score >= 0.65:
-            flagged += 1
-    return flagged / len(ai_items)
+def _chunks(rows: list[dict], size: int = _UPSERT_CHUNK_SIZE):
+    for index in range(0, len(rows), size):
+        yield rows[index : index + size]
+
+
+_STMT_TENANT_PUBLISH_FAILURES = (
+    select(
+        PublishEvent.company_id,
+        func.count(PublishEvent.id).filter(PublishEvent.event_type == "ChannelPublishFailed"),
+        func.count(PublishEvent.id),
+    )
+    .where(
+        PublishEvent.created_at >= bindparam("since"),
+        PublishEvent.event_type.in_(PUBLISH_ATTEMPT_EVENT_TYPES),
+    )
+    .group_by(PublishEvent.company_id)
+)
+_STMT_TENANT_PUBLISH_FAILURES_SCOPED = _STMT_TENANT_PUBLISH_FAILURES.where(
+    PublishEvent.company_id.in_(bindparam("company_ids", expanding=True))
+)
 
 
-def _tenant_rate_limit_violations(company_id: UUID) -> int:
+def _tenant_publish_failure_ratios(
+    db: Session,
+    company_ids: list[UUID] | None = None,
+    *,
+    now: datetime,
+    window_days: int = 7,
+) -> dict[UUID, float]:
+    params: dict = {"since": now - timedelta(days=window_days)}
+    statement = _STMT_TENANT_PUBLISH_FAILURES
+    if company_ids is not None:
+        statement = _STMT_TENANT_PUBLISH_FAILURES_SCOPED
+        params["company_ids"] = company_ids
+    return {
+        company_id: (float(failures or 0) / float(attempts)) if attempts else 0.0
+        for company_id, failures, attempts in db.execute(statement, params).all()
+    }
+
+
+_CONTENT_RISK_SCORE_JSON = ContentItem.metadata_json["quality"]["risk_score"]
+_CONTENT_RISK_SCORE = case(
+    (func.jsonb_typeof(_CONTENT_RISK_SCORE_JSON) == "number", cast(_CONTENT_RISK_SCORE_JSON.astext, Float)),
+    else_=0.0,
+)
+_STMT_TENANT_FLAGGED_CONTENT = (
+    select(
+        ContentItem.company_id,
+        func.count(ContentItem.id).filter(
+            or_(ContentItem.status == "needs_review", _CONTENT_RISK_SCORE >= 0.65)
+        ),
+        func.count(ContentItem.id),
+    )
+    .where(ContentItem.created_at >= bindparam("since"))
+    .group_by(ContentItem.company_id)
+)
+_STMT_TENANT_FLAGGED_CONTENT_SCOPED = _STMT_TENANT_FLAGGED_CONTENT.where(
+    ContentItem.company_id.in_(bindparam("company_ids", expanding=True))
+)
+
+
+def _tenant_flagged_content_ratios(
+    db: Session,
+    company_ids: list[UUID] | None = None,
+    *,
+    now: datetime,
+    window_days: int = 30,
+) -> dict[UUID, float]:
+    params: dict = {"since": now - timedelta(days=window_days)}
+    statement = _STMT_TENANT_FLAGGED_CONTENT
+    if company_ids is not None:
+        statement = _STMT_TENANT_FLAGGED_CONTENT_SCOPED
+        params["company_ids"] = company_ids
+    return {
+        company_id: (float(flagged or 0) / float(total)) if total else 0.0
+        for company_id, flagged, total in db.execute(statement, params).all()
+    }
+
+
+def _tenant_rate_limit_violations(company_ids: list[UUID]) -> dict[UUID, int]:
+    if not company_ids:
+        return {}
     redis = get_redis_client()
     try:
-        return int(redis.get(f"tenant:rate_limit_violations:{company_id}") or 0)
+        values = redis.mget([f"tenant:rate_limit_violations:{company_id}" for company_id in company_ids])
     except Exception:
-        return 0
+        return {}
+    violations: dict[UUID, int] = {}
+    for company_id, value in zip(company_ids, values):
+        try:
+            violations[company_id] = int(value or 0)
+        except (TypeError, ValueError):
+            violations[company_id] = 0
+    return violations
 
 
-def calculate_tenant_risk_score(db: Session, *, company_id: UUID) -> dict:
-    publish_failure_ratio = _tenant_publish_failure_ratio(db, company_id)
-    flagged_content_ratio = _tenant_flagged_content_ratio(db, company_id)
-    rate_limit_violations = _tenant_rate_limit_violations(company_id)
-    abuse_rate = min(1.0, rate_limit_violations / 100.0)
+def _risk_level(score_value: int) -> str:
+    if score_value >= 80:
+        return "critical"
+    if score_value >= 60:
+        return "high"
+    if score_value >= 35:
+        return "medium"
+    return "low"
+
 
+def _compute_tenant_risk(
+    *,
+    publish_failure_ratio: float,
+    flagged_content_ratio: float,
+    rate_limit_violations: int,
+) -> dict:
+    abuse_rate = min(1.0, rate_limit_violations / 100.0)
     score_value = int(
         min(
             100,
@@ -301,89 +489,173 @@ def calculate_tenant_risk_score(db: Session, *, company_id: UUID) -> dict:
             ),
         )
     )
-    risk_level = "low"
-    if score_value >= 80:
-        risk_level = "critical"
-    elif score_value >= 60:
-        risk_level = "high"
-    elif score_value >= 35:
-        risk_level = "medium"
-
-    existing = db.execute(
-        select(TenantRiskScore).where(TenantRiskScore.company_id == company_id)
-    ).scalar_one_or_none()
-    if existing is None:
-        existing = TenantRiskScore(company_id=company_id)
-    existing.risk_score = score_value
-    existing.publish_failure_ratio = publish_failure_ratio
-    existing.flagged_content_ratio = flagged_content_ratio
-    existing.abuse_rate = abuse_rate
-    existing.rate_limit_violations = rate_limit_violations
-    existing.risk_level = risk_level
-    existing.metadata_json = {
-        "threshold_manual_approval": TENANT_RISK_THRESHOLD,
-        "window_days": 7,
-    }
-    existing.updated_at = datetime.now(UTC)
-    db.add(existing)
-    db.flush()
     return {
-        "company_id": str(company_id),
         "risk_score": score_value,
-        "risk_level": risk_level,
-        "publish_failure_ratio": round(publish_failure_ratio, 4),
-        "flagged_content_ratio": round(flagged_content_ratio, 4),
-        "abuse_rate": round(abuse_rate, 4),
+        "risk_level": _risk_level(score_value),
+        "publish_failure_ratio": publish_failure_ratio,
+        "flagged_content_ratio": flagged_content_ratio,
+        "abuse_rate": abuse_rate,
         "rate_limit_violations": rate_limit_violations,
     }
 
 
+def calculate_tenant_risk_score(db: Session, *, company_id: UUID) -> dict:
+    return calculate_tenant_risk_scores(db, company_ids=[company_id])[company_id]
+
+
+def calculate_tenant_risk_scores(db: Session, *, company_ids: list[UUID]) -> dict[UUID, dict]:
+    company_ids = list(dict.fromkeys(company_ids))
+    if not company_ids:
+        return {}
+    # Aggregate every tenant in a handful of grouped queries; single-tenant lookups pass a one-item list.
+    now = datetime.now(UTC)
+    scoped_ids = company_ids if len(company_ids) <= _UPSERT_CHUNK_SIZE else None
+    failure_ratios = _tenant_publish_failure_ratios(db, scoped_ids, now=now)
+    flagged_ratios = _tenant_flagged_content_ratios(db, scoped_ids, now=now)
+    violations = _tenant_rate_limit_violations(company_ids)
+
+    results: dict[UUID, dict] = {}
+    rows: list[dict] = []
+    for company_id in company_ids:
+        risk = _compute_tenant_risk(
+            publish_failure_ratio=failure_ratios.get(company_id, 0.0),
+            flagged_content_ratio=flagged_ratios.get(company_id, 0.0),
+            rate_limit_violations=violations.get(company_id, 0),
+        )
+        rows.append(
+            {
+                "id": uuid4(),
+                "company_id": company_id,
+                **risk,
+                "metadata_json": {
+                    "threshold_manual_approval": TENANT_RISK_THRESHOLD,
+                    "window_days": 7,
+                },
+                "updated_at": now,
+            }
+        )
+        results[company_id] = {
+            "company_id": str(company_id),
+            "risk_score": risk["risk_score"],
+            "risk_level": risk["risk_level"],
+            "publish_failure_ratio": round(risk["publish_failure_ratio"], 4),
+            "flagged_content_ratio": round(risk["flagged_content_ratio"], 4),
+            "abuse_rate": round(risk["abuse_rate"], 4),
+            "rate_limit_violations": risk["rate_limit_violations"],
+        }
+
+    for chunk in _chunks(rows):
+        statement = pg_insert(TenantRiskScore).values(chunk)
+        excluded = statement.excluded
+        db.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_tenant_risk_scores_company",
+                set_={
+                    "risk_score": excluded.risk_score,
+                    "publish_failure_ratio": excluded.publish_failure_ratio,
+                    "flagged_content_ratio": excluded.flagged_content_ratio,
+                    "abuse_rate": excluded.abuse_rate,
+                    "rate_limit_violations": excluded.rate_limit_violations,
+                    "risk_level": excluded.risk_level,
+                    "metadata_json": excluded.metadata_json,
+                    "updated_at": excluded.updated_at,
+                },
+            )
+        )
+    return results
+
+
 def calculate_revenue_metrics(db: Session, *, company_id: UUID) -> dict:
-    subscription = db.execute(
-        select(CompanySubscription).where(CompanySubscription.company_id == company_id)
-    ).scalar_one_or_none()
-    usage = db.execute(select(CompanyUsage).where(CompanyUsage.company_id == company_id)).scalar_one_or_none()
-    plan = None
-    if subscription is not None:
-        plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.id == subscription.plan_id)).scalar_one_or_none()
-
-    monthly_price = float(plan.monthly_price) if plan else 0.0
-    usage_count = int(usage.posts_used_current_period if usage else 0)
-    max_posts = int(plan.max_posts_per_month if plan else 1)
-    usage_percent = max(0.0, min(1.0, usage_count / max(1, max_posts)))
-    publish_failure_ratio = _tenant_publish_failure_ratio(db, company_id)
-    churn_risk_score = max(0.0, min(1.0, ((1.0 - usage_percent) * 0.6) + (publish_failure_ratio * 0.4)))
-    upgrade_probability = max(0.0, min(1.0, (usage_percent * 0.75) + (0.2 if usage_percent > 0.85 else 0.0)))
-    overuse_detected = usage_percent > 1.0
-
-    row = db.execute(
-        select(RevenueMetric).where(RevenueMetric.company_id == company_id)
-    ).scalar_one_or_none()
-    if row is None:
-        row = RevenueMetric(company_id=company_id)
-    row.mrr = monthly_price
-    row.plan = plan.name if plan else "Starter"
-    row.usage_percent = usage_percent
-    row.churn_risk_score = churn_risk_score
-    row.upgrade_probability = upgrade_probability
-    row.overuse_detected = overuse_detected
-    row.updated_at = datetime.now(UTC)
-    db.add(row)
-    db.flush()
-    return {
-        "company_id": str(company_id),
-        "mrr": float(monthly_price),
-        "plan": row.plan,
-        "usage_percent": round(usage_percent, 4),
-        "churn_risk_score": round(churn_risk_score, 4),
-        "upgrade_probability": round(upgrade_probability, 4),
-        "overuse_detected": overuse_detected,
-    }
+    return _calculate_revenue_metrics(db, company_ids=[company_id])[0]
+
+
+_STMT_REVENUE_INPUTS = (
+    select(
+        Company.id,
+        SubscriptionPlan.name,
+        SubscriptionPlan.monthly_price,
+        SubscriptionPlan.max_posts_per_month,
+        CompanyUsage.posts_used_current_period,
+    )
+    .outerjoin(CompanySubscription, CompanySubscription.company_id == Company.id)
+    .outerjoin(SubscriptionPlan, SubscriptionPlan.id == CompanySubscription.plan_id)
+    .outerjoin(CompanyUsage, CompanyUsage.company_id == Company.id)
+)
+_STMT_REVENUE_INPUTS_SCOPED = _STMT_REVENUE_INPUTS.where(
+    Company.id.in_(bindparam("company_ids", expanding=True))
+)
+
+
+def _calculate_revenue_metrics(db: Session, *, company_ids: list[UUID] | None = None) -> list[dict]:
+    if company_ids is None:
+        tenants = db.execute(_STMT_REVENUE_INPUTS).all()
+    else:
+        tenants = db.execute(_STMT_REVENUE_INPUTS_SCOPED, {"company_ids": company_ids}).all()
+    if not tenants:
+        return []
+    now = datetime.now(UTC)
+    failure_ratios = _tenant_publish_failure_ratios(db, company_ids, now=now)
+
+    items: list[dict] = []
+    rows: list[dict] = []
+    for company_id, plan_name, plan_price, plan_max_posts, posts_used in tenants:
+        has_plan = plan_name is not None
+        monthly_price = float(plan_price) if has_plan else 0.0
+        usage_count = int(posts_used or 0)
+        max_posts = int(plan_max_posts if has_plan else 1)
+        usage_percent = max(0.0, min(1.0, usage_count / max(1, max_posts)))
+        publish_failure_ratio = failure_ratios.get(company_id, 0.0)
+        churn_risk_score = max(0.0, min(1.0, ((1.0 - usage_percent) * 0.6) + (publish_failure_ratio * 0.4)))
+        upgrade_probability = max(0.0, min(1.0, (usage_percent * 0.75) + (0.2 if usage_percent > 0.85 else 0.0)))
+        overuse_detected = usage_percent > 1.0
+        plan_label = plan_name if has_plan else "Starter"
+        rows.append(
+            {
+                "id": uuid4(),
+                "company_id": company_id,
+                "mrr": monthly_price,
+                "plan": plan_label,
+                "usage_percent": usage_percent,
+                "churn_risk_score": churn_risk_score,
+                "upgrade_probability": upgrade_probability,
+                "overuse_detected": overuse_detected,
+                "updated_at": now,
+            }
+        )
+        items.append(
+            {
+                "company_id": str(company_id),
+                "mrr": float(monthly_price),
+                "plan": plan_label,
+                "usage_percent": round(usage_percent, 4),
+                "churn_risk_score": round(churn_risk_score, 4),
+                "upgrade_probability": round(upgrade_probability, 4),
+                "overuse_detected": overuse_detected,
+            }
+        )
+
+    for chunk in _chunks(rows):
+        statement = pg_insert(RevenueMetric).values(chunk)
+        excluded = statement.excluded
+        db.execute(
+            statement.on_conflict_do_update(
+                constraint="uq_revenue_metrics_company",
+                set_={
+                    "mrr": excluded.mrr,
+                    "plan": excluded.plan,
+                    "usage_percent": excluded.usage_percent,
+                    "churn_risk_score": excluded.churn_risk_score,
+                    "upgrade_probability": excluded.upgrade_probability,
+                    "overuse_detected": excluded.overuse_detected,
+                    "updated_at": excluded.updated_at,
+                },
+            )
+        )
+    return items
 
 
 def calculate_revenue_overview(db: Session) -> dict:
-    company_ids = [company_id for (company_id,) in db.execute(select(Company.id)).all()]
-    items = [calculate_revenue_metrics(db, company_id=company_id) for company_id in company_ids]
+    items = _calculate_revenue_metrics(db)
     total_mrr = sum(item["mrr"] for item in items)
     churn_risk_avg = mean(item["churn_risk_score"] for item in items) if items else 0.0
     return {
@@ -403,140 +675,232 @@ def record_performance_baseline(
     metric_name: str,
     samples: list[float],
 ) -> None:
-    if not samples:
+    record_performance_baselines(db, [(component, metric_name, samples)])
+
+
+def record_performance_baselines(db: Session, batches: list[tuple[str, str, list[float]]]) -> None:
+    stats: dict[tuple[str, str], tuple[float, float, int]] = {}
+    for component, metric_name, samples in batches:
+        if not samples:
+            continue
+        sample_size = len(samples)
+        p95_index = min(sample_size - 1, max(0, int(sample_size * 0.95) - 1))
+        # statistics.mean is exact-fraction arithmetic; fsum is a single C pass. The p95 only needs the
+        # top ~5% of samples, so select them with a bounded heap instead of sorting the whole batch.
+        avg_value = fsum(samples) / sample_size
+        p95_value = float(nlargest(sample_size - p95_index, samples)[-1])
+        stats[(component, metric_name)] = (avg_value, p95_value, sample_size)
+    if not stats:
         return
-    sorted_samples = sorted(samples)
-    p95_index = min(len(sorted_samples) - 1, max(0, int(len(sorted_samples) * 0.95) - 1))
-    avg_value = float(mean(sorted_samples))
-    p95_value = float(sorted_samples[p95_index])
 
-    recent = db.execute(
-        select(PerformanceBaseline)
-        .where(
-            PerformanceBaseline.component == component,
-            PerformanceBaseline.metric_name == metric_name,
-        )
-        .order_by(PerformanceBaseline.recorded_at.desc())
-        .limit(5)
-    ).scalars().all()
-    previous_avg = mean([item.avg_value for item in recent]) if recent else avg_value
-    regression_detected = previous_avg > 0 and avg_value > (previous_avg * 1.25)
-
-    db.add(
-        PerformanceBaseline(
-            component=component,
-            metric_name=metric_name,
-            avg_value=avg_value,
-            p95_value=p95_value,
-            sample_size=len(samples),
-            regression_detected=regression_detected,
+    # Last five baselines for every metric in one windowed query.
+    ranked = (
+        select(
+            PerformanceBaseline.component,
+            PerformanceBaseline.metric_name,
+            PerformanceBaseline.avg_value,
+            func.row_number()
+            .over(
+                partition_by=(PerformanceBaseline.component, PerformanceBaseline.metric_name),
+                order_by=PerformanceBaseline.recorded_at.desc(),
+            )
+            .label("position"),
         )
+        .where(tuple_(PerformanceBaseline.component, PerformanceBaseline.metric_name).in_(list(stats)))
+        .subquery()
     )
-
-
-def _fetch_perf_samples(redis_key: str, *, max_items: int = 500) -> list[float]:
-    redis = get_redis_client()
-    values = redis.lrange(redis_key, 0, max_items - 1)
-    samples: list[float] = []
-    for value in values:
-        try:
-            samples.append(float(value))
-        except (TypeError, ValueError):
-            continue
-    return samples
+    recent: dict[tuple[str, str], list[float]] = {}
+    for component, metric_name, previous_value in db.execute(
+        select(ranked.c.component, ranked.c.metric_name, ranked.c.avg_value).where(ranked.c.position <= 5)
+    ).all():
+        recent.setdefault((component, metric_name), []).append(previous_value)
+
+    rows: list[dict] = []
+    for (component, metric_name), (avg_value, p95_value, sample_size) in stats.items():
+        previous_values = recent.get((component, metric_name))
+        previous_avg = mean(previous_values) if previous_values else avg_value
+        rows.append(
+            {
+                "component": component,
+                "metric_name": metric_name,
+                "avg_value": avg_value,
+                "p95_value": p95_value,
+                "sample_size": sample_size,
+                "regression_detected": previous_avg > 0 and avg_value > (previous_avg * 1.25),
+            }
+        )
+    db.execute(insert(PerformanceBaseline), rows)
+
+
+def _fetch_perf_samples_many(redis_keys: list[str], *, max_items: int = 500) -> list[list[float]]:
+    pipeline = get_redis_client().pipeline(transaction=False)
+    for redis_key in redis_keys:
+        pipeline.lrange(redis_key, 0, max_items - 1)
+    batches: list[list[float]] = []
+    for values in pipeline.execute():
+        samples: list[float] = []
+        for value in values:
+            try:
+                samples.append(float(value))
+            except (TypeError, ValueError):
+                continue
+        batches.append(samples)
+    return batches
 
 
 def collect_and_store_performance_baselines(db: Session) -> dict:
-    publish_samples = db.execute(
-        select(PublishEvent.metadata_json)
+    publish_duration = PublishEvent.metadata_json["publish_duration_ms"]
+    publish_latency_values = db.execute(
+        select(cast(publish_duration.astext, Float))
         .where(
-            PublishEvent.event_type.in_(["ChannelPublishSucceeded", "ChannelPublishFailed"]),
+            PublishEvent.event_type.in_(PUBLISH_ATTEMPT_EVENT_TYPES),
             PublishEvent.created_at >= datetime.now(UTC) - timedelta(hours=4),
+            func.jsonb_typeof(publish_duration) == "number",
         )
         .limit(1000)
     ).scalars().all()
-    publish_latency_values: list[float] = []
-    for metadata in publish_samples:
-        if not isinstance(metadata, dict):
-            continue
-        value = metadata.get("publish_duration_ms")
-        try:
-            publish_latency_values.append(float(value))
-        except (TypeError, ValueError):
-            continue
-    record_performance_baseline(
-        db,
-        component="publishing",
-        metric_name="average_publish_latency_ms",
-        samples=publish_latency_values,
+    scheduler_samples, analytics_samples, dashboard_samples = _fetch_perf_samples_many(
+        [
+            "platform:perf:scheduler_scan_duration_ms",
+            "platform:perf:analytics_query_duration_ms",
+            "platform:perf:dashboard_load_time_ms",
+        ]
     )
-    record_performance_baseline(
+    record_performance_baselines(
         db,
-        component="scheduler",
-        metric_name="scheduler_scan_duration_ms",
-        samples=_fetch_perf_samples("platform:perf:scheduler_scan_duration_ms"),
-    )
-    record_performance_baseline(
-        db,
-        component="analytics",
-        metric_name="analytics_query_duration_ms",
-        samples=_fetch_perf_samples("platform:perf:analytics_query_duration_ms"),
-    )
-    record_performance_baseline(
-        db,
-        component="dashboard",
-        metric_name="dashboard_load_time_ms",
-        samples=_fetch_perf_samples("platform:perf:dashboard_load_time_ms"),
+        [
+            ("publishing", "average_publish_latency_ms", publish_latency_values),
+            ("scheduler", "scheduler_scan_duration_ms", scheduler_samples),
+            ("analytics", "analytics_query_duration_ms", analytics_samples),
+            ("dashboard", "dashboard_load_time_ms", dashboard_samples),
+        ],
     )
     return {"stored": True}
 
 
+# Pushes a sample and keeps a running sum of the retained window so the mean is O(1) per append.
+# The sum is rebuilt from the list whenever either key is missing (first use, eviction, flush), and both
+# keys share one TTL refreshed on every append so an idle metric cannot leave an orphaned sum behind.
+_ROLLING_MEAN_LUA = """
+local samples_key, sum_key, avg_key = KEYS[1], KEYS[2], KEYS[3]
+local max_samples = tonumber(ARGV[2])
+local window_ttl = tonumber(ARGV[4])
+if redis.call('EXISTS', sum_key) == 0 or redis.call('EXISTS', samples_key) == 0 then
+    redis.call('LTRIM', samples_key, 0, max_samples - 1)
+    local total = 0
+    for _, raw in ipairs(redis.call('LRANGE', samples_key, 0, -1)) do
+        total = total + (tonumber(raw) or 0)
+    end
+    redis.call('SET', sum_key, string.format('%.6f', total))
+end
+redis.call('LPUSH', samples_key, ARGV[1])
+local total = tonumber(redis.call('INCRBYFLOAT', sum_key, ARGV[1]))
+while redis.call('LLEN', samples_key) > max_samples do
+    local evicted = tonumber(redis.call('RPOP', samples_key)) or 0
+    total = tonumber(redis.call('INCRBYFLOAT', sum_key, string.format('%.6f', -evicted)))
+end
+local count = redis.call('LLEN', samples_key)
+redis.call('EXPIRE', samples_key, window_ttl)
+redis.call('EXPIRE', sum_key, window_ttl)
+redis.call('SET', avg_key, string.format('%.6f', total / count), 'EX', tonumber(ARGV[3]))
+return count
+"""
+_ROLLING_MEAN_WINDOW_TTL_SECONDS = 24 * 60 * 60
+_rolling_mean_script = None
+
+
 def append_perf_sample(metric_name: str, value_ms: float, *, max_samples: int = 500) -> None:
+    global _rolling_mean_script
     redis = get_redis_client()
     key = f"platform:perf:{metric_name}"
-    redis.lpush(key, f"{float(value_ms):.6f}")
-    redis.ltrim(key, 0, max_samples - 1)
+    sample = f"{float(value_ms):.6f}"
     if metric_name == "request_latency_ms":
-        values = _fetch_perf_samples(key)
-        if values:
-            redis.set("platform:perf:request_latency_ms:avg", f"{mean(values):.6f}", ex=300)
+        if _rolling_mean_script is None:
+            _rolling_mean_script = redis.register_script(_ROLLING_MEAN_LUA)
+        _rolling_mean_script(
+            keys=[key, f"{key}:sum", "platform:perf:request_latency_ms:avg"],
+            args=[sample, max_samples, 300, _ROLLING_MEAN_WINDOW_TTL_SECONDS],
+            client=redis,
+        )
+        return
+    pipeline = redis.pipeline(transaction=False)
+    pipeline.lpush(key, sample)
+    pipeline.ltrim(key, 0, max_samples - 1)
+    pipeline.execute()
 
 
 def set_global_publish_breaker(enabled: bool, *, reason: str) -> None:
-    redis = get_redis_client()
-    redis.set("platform:breaker:global_publish", "1" if enabled else "0")
-    redis.set("platform:breaker:global_publish:reason", reason, ex=3600)
+    pipeline = get_redis_client().pipeline(transaction=False)
+    pipeline.set("platform:breaker:global_publish", "1" if enabled else "0")
+    pipeline.set("platform:breaker:global_publish:reason", reason, ex=3600)
+    pipeline.execute()
+
+
+def _queue_tenant_publish_breaker(pipeline, tenant_id: UUID, *, reason: str) -> None:
+    key = f"platform:breaker:tenant:{tenant_id}"
+    pipeline.set(key, "1", ex=1800)
+    pipeline.set(f"{key}:reason", reason, ex=1800)
 
 
 def set_tenant_publish_breaker(tenant_id: UUID, enabled: bool, *, reason: str) -> None:
     redis = get_redis_client()
-    key = f"platform:breaker:tenant:{tenant_id}"
     if enabled:
-        redis.set(key, "1", ex=1800)
-        redis.set(f"{key}:reason", reason, ex=1800)
+        pipeline = redis.pipeline(transaction=False)
+        _queue_tenant_publish_breaker(pipeline, tenant_id, reason=reason)
+        pipeline.execute()
     else:
-        redis.delete(key)
-        redis.delete(f"{key}:reason")
+        key = f"platform:breaker:tenant:{tenant_id}"
+        redis.delete(key, f"{key}:reason")
 
 
 def is_global_publish_paused() -> tuple[bool, str | None]:
-    redis = get_redis_client()
-    paused = str(redis.get("platform:breaker:global_publish") or "0") == "1"
-    reason = redis.get("platform:breaker:global_publish:reason") if paused else None
-    return paused, reason
+    flag, reason = get_redis_client().mget("platform:breaker:global_publish", "platform:breaker:global_publish:reason")
+    paused = str(flag or "0") == "1"
+    return paused, (reason if paused else None)
 
 
 def is_tenant_publish_paused(tenant_id: UUID) -> tuple[bool, str | None]:
-    redis = get_redis_client()
     key = f"platform:breaker:tenant:{tenant_id}"
-    paused = str(redis.get(key) or "0") == "1"
-    reason = redis.get(f"{key}:reason") if paused else None
-    return paused, reason
+    flag, reason = get_redis_client().mget(key, f"{key}:reason")
+    paused = str(flag or "0") == "1"
+    return paused, (reason if paused else None)
+
+
+_FAILING_CHANNELS = (
+    select(PublishEvent.channel_id, func.count(PublishEvent.id).label("failures"))
+    .where(
+        PublishEvent.event_type == "ChannelPublishFailed",
+        PublishEvent.created_at >= bindparam("since"),
+        PublishEvent.channel_id.is_not(None),
+    )
+    .group_by(PublishEvent.channel_id)
+    .having(func.count(PublishEvent.id) >= 5)
+    .subquery()
+)
+# Flips every offending channel in one UPDATE ... FROM and returns what changed.
+_STMT_DISABLE_FAILING_CHANNELS = (
+    update(Channel)
+    .where(
+        Channel.id == _FAILING_CHANNELS.c.channel_id,
+        Channel.status.is_distinct_from("disabled"),
+    )
+    .values(status="disabled")
+    .returning(Channel.id, Channel.company_id, _FAILING_CHANNELS.c.failures)
+    .execution_options(synchronize_session=False)
+)
 
 
 def execute_auto_recovery(db: Session) -> dict:
     redis = get_redis_client()
     actions: list[dict] = []
+    flags = load_feature_flag_states(
+        db,
+        keys=[
+            "auto_disable_connector_on_repeated_failures",
+            "auto_throttle_tenant_on_high_error_rate",
+            "enable_tenant_publish_circuit_breaker",
+        ],
+    )
 
     # Worker heartbeat recovery signal.
     worker_heartbeat = redis.get(settings.worker_heartbeat_key)
@@ -550,48 +914,39 @@ def execute_auto_recovery(db: Session) -> dict:
         actions.append({"action": "worker_restart_event", "incident_id": str(incident.id)})
 
     # Channel auto-disable on repeated failures.
-    if is_feature_enabled(db, key="auto_disable_connector_on_repeated_failures", tenant_id=None):
-        since = datetime.now(UTC) - timedelta(hours=1)
-        failure_rows = db.execute(
-            select(PublishEvent.channel_id, func.count(PublishEvent.id))
-            .where(
-                PublishEvent.event_type == "ChannelPublishFailed",
-                PublishEvent.created_at >= since,
-                PublishEvent.channel_id.is_not(None),
-            )
-            .group_by(PublishEvent.channel_id)
-            .having(func.count(PublishEvent.id) >= 5)
+    if feature_enabled_in(flags, key="auto_disable_connector_on_repeated_failures", tenant_id=None):
+        disabled_rows = db.execute(
+            _STMT_DISABLE_FAILING_CHANNELS,
+            {"since": datetime.now(UTC) - timedelta(hours=1)},
         ).all()
-        for channel_id, failures in failure_rows:
-            channel = db.execute(select(Channel).where(Channel.id == channel_id)).scalar_one_or_none()
-            if channel is None or channel.status == "disabled":
-                continue
-            channel.status = "disabled"
-            db.add(channel)
+        # The unit of work flushes the staged audit and incident rows as batched INSERTs.
+        for channel_id, company_id, failures in disabled_rows:
             log_audit_event(
                 db,
-                company_id=channel.company_id,
+                company_id=company_id,
                 action="auto_recovery.connector_disabled",
-                metadata={"channel_id": str(channel.id), "failures": int(failures or 0)},
+                metadata={"channel_id": str(channel_id), "failures": int(failures or 0)},
             )
             create_incident(
                 db,
-                company_id=channel.company_id,
+                company_id=company_id,
                 incident_type="connector_disabled_repeated_failures",
                 severity="warning",
-                message=f"Channel {channel.id} disabled after repeated failures",
+                message=f"Channel {channel_id} disabled after repeated failures",
                 metadata_json={"failures": int(failures or 0)},
             )
-            actions.append({"action": "connector_disabled", "channel_id": str(channel.id)})
+            actions.append({"action": "connector_disabled", "channel_id": str(channel_id)})
 
     # Tenant temporary throttling.
-    if is_feature_enabled(db, key="auto_throttle_tenant_on_high_error_rate", tenant_id=None):
+    if feature_enabled_in(flags, key="auto_throttle_tenant_on_high_error_rate", tenant_id=None):
         tenants = [tenant_id for (tenant_id,) in db.execute(select(Company.id)).all()]
+        risks = calculate_tenant_risk_scores(db, company_ids=tenants)
+        # Throttle and breaker keys for every risky tenant go out in one pipeline.
+        pipeline = redis.pipeline(transaction=False)
         for tenant_id in tenants:
-            risk = calculate_tenant_risk_score(db, company_id=tenant_id)
+            risk = risks[tenant_id]
             if risk["risk_score"] >= TENANT_RISK_THRESHOLD:
-                throttle_key = f"tenant:throttle:{tenant_id}"
-                redis.set(throttle_key, "1", ex=AUTO_THROTTLE_TTL_SECONDS)
+                pipeline.set(f"tenant:throttle:{tenant_id}", "1", ex=AUTO_THROTTLE_TTL_SECONDS)
                 log_audit_event(
                     db,
                     company_id=tenant_id,
@@ -599,13 +954,15 @@ def execute_auto_recovery(db: Session) -> dict:
                     metadata={"risk_score": risk["risk_score"], "ttl_seconds": AUTO_THROTTLE_TTL_SECONDS},
                 )
                 actions.append({"action": "tenant_throttled", "tenant_id": str(tenant_id)})
-                if is_feature_enabled(db, key="enable_tenant_publish_circuit_breaker", tenant_id=tenant_id):
-                    set_tenant_publish_breaker(
+                if feature_enabled_in(flags, key="enable_tenant_publish_circuit_breaker", tenant_id=tenant_id):
+                    _queue_tenant_publish_breaker(
+                        pipeline,
                         tenant_id,
-                        True,
                         reason="Automatic tenant publish breaker enabled by risk controls",
                     )
                     actions.append({"action": "tenant_publish_breaker_enabled", "tenant_id": str(tenant_id)})
+        if len(pipeline):
+            pipeline.execute()
     return {"actions": actions}
 
 
@@ -626,11 +983,21 @@ def evaluate_platform_guardrails(db: Session, *, health: SystemHealthScore) -> d
 
 def get_active_incidents(db: Session, *, limit: int = 100) -> list[dict]:
     incidents = db.execute(
-        select(PlatformIncident)
+        select(
+            PlatformIncident.id,
+            PlatformIncident.company_id,
+            PlatformIncident.incident_type,
+            PlatformIncident.severity,
+            PlatformIncident.status,
+            PlatformIncident.message,
+            PlatformIncident.metadata_json,
+            PlatformIncident.created_at,
+            PlatformIncident.resolved_at,
+        )
         .where(PlatformIncident.status == "open")
         .order_by(PlatformIncident.created_at.desc())
         .limit(limit)
-    ).scalars().all()
+    ).all()
     return [
         {
             "id": str(item.id),
@@ -640,8 +1007,8 @@ def get_active_incidents(db: Session, *, limit: int = 100) -> list[dict]:
             "status": item.status,
             "message": item.message,
             "metadata_json": item.metadata_json or {},
-            "created_at": item.created_at.isoformat(),
-            "resolved_at": item.resolved_at.isoformat() if item.resolved_at else None,
+            "created_at": item.created_at,
+            "resolved_at": item.resolved_at,
         }
         for item in incidents
     ]
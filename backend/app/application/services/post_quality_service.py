@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, Literal, Protocol
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import case, or_, select
 from sqlalchemy.orm import Session
 
 from app.domain.models.brand_profile import BrandProfile
@@ -13,16 +18,33 @@ from app.domain.models.post import Post
 from app.domain.models.post_quality_report import PostQualityReport
 
 
-TONE_KEYWORDS: dict[str, list[str]] = {
-    "professional": ["strategy", "results", "performance", "efficiency", "insight"],
-    "friendly": ["hello", "together", "community", "thanks", "share"],
-    "premium": ["exclusive", "premium", "craft", "luxury", "elevated"],
-    "playful": ["fun", "wow", "creative", "challenge", "spark"],
+TONE_KEYWORDS: dict[str, frozenset[str]] = {
+    "professional": frozenset(("strategy", "results", "performance", "efficiency", "insight")),
+    "friendly": frozenset(("hello", "together", "community", "thanks", "share")),
+    "premium": frozenset(("exclusive", "premium", "craft", "luxury", "elevated")),
+    "playful": frozenset(("fun", "wow", "creative", "challenge", "spark")),
 }
 
-PII_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+# The lookbehind pins matches to the start of a local-part run; without it a long run that ends in a
+# non-matching address is rescanned from every offset (quadratic backtracking).
+PII_EMAIL_RE = re.compile(r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
 PII_PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?(?:\(?\d{2,4}\)?[\s.-]?)\d{3}[\s.-]?\d{3,4}")
 SPAM_PUNCT_RE = re.compile(r"[!?]{4,}")
+DIGIT_RE = re.compile(r"\d")
+WHITESPACE_RE = re.compile(r"\s+")
+NON_WORD_RE = re.compile(r"[^a-zA-Z0-9\s]")
+_ASCII_NON_ALPHA = bytes(byte for byte in range(128) if not chr(byte).isalpha())
+_ASCII_LOWER = bytes(range(ord("a"), ord("z") + 1))
+DUPLICATE_SIMILARITY_THRESHOLD = 0.72
+
+
+QualityCheckMode = Literal["full", "gate"]
+
+
+class RecentPostText(Protocol):
+    # Duplicate detection only reads these two fields, so callers can pass column rows instead of Posts.
+    title: str
+    content: str
 
 
 @dataclass(frozen=True)
@@ -55,28 +77,79 @@ def _normalize_list(values: list[str] | None) -> list[str]:
     return [str(item).strip() for item in values if str(item).strip()]
 
 
-def _tokenize(text: str) -> set[str]:
-    clean = re.sub(r"[^a-zA-Z0-9\s]", " ", text.lower())
-    return {token for token in clean.split() if token}
+def _tokenize(text: str) -> frozenset[str]:
+    return frozenset(NON_WORD_RE.sub(" ", text.lower()).split())
 
 
-def _trigrams(text: str) -> set[str]:
-    clean = re.sub(r"\s+", " ", text.lower().strip())
-    if len(clean) < 3:
-        return {clean} if clean else set()
-    return {clean[i : i + 3] for i in range(len(clean) - 2)}
+def _clean_for_trigrams(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text.lower().strip())
 
 
-def _jaccard_similarity(a: str, b: str) -> float:
-    a_tokens = _trigrams(a)
-    b_tokens = _trigrams(b)
+def _trigrams(text: str) -> frozenset[str]:
+    return _clean_trigrams(_clean_for_trigrams(text))
+
+
+# The same recent posts are compared against every draft in a project, so their trigram sets are
+# reused across checks instead of re-allocating thousands of 3-char strings each time.
+@lru_cache(maxsize=256)
+def _clean_trigrams(clean: str) -> frozenset[str]:
+    if len(clean) < 3:
+        return frozenset((clean,)) if clean else frozenset()
+    return frozenset([clean[i : i + 3] for i in range(len(clean) - 2)])
+
+
+def _caps_counts(text: str) -> tuple[int, int]:
+    if text.isascii():
+        # bytes.translate deletes in C, so ASCII posts avoid a per-character Python loop.
+        letters = text.encode("ascii").translate(None, _ASCII_NON_ALPHA)
+        return len(letters), len(letters.translate(None, _ASCII_LOWER))
+    alpha_count = 0
+    upper_count = 0
+    for char in text:
+        if char.isalpha():
+            alpha_count += 1
+            if char.isupper():
+                upper_count += 1
+    return alpha_count, upper_count
+
+
+def _jaccard_similarity(a_tokens: frozenset[str], b_tokens: frozenset[str]) -> float:
     if not a_tokens or not b_tokens:
         return 0.0
     overlap = len(a_tokens.intersection(b_tokens))
-    universe = len(a_tokens.union(b_tokens))
+    universe = len(a_tokens) + len(b_tokens) - overlap
     return overlap / universe if universe else 0.0
 
 
+@lru_cache(maxsize=512)
+def _term_pattern(terms: tuple[str, ...]) -> tuple[re.Pattern[str], frozenset[str]] | None:
+    if not terms:
+        return None
+    # Longest terms first inside a lookahead so every start position reports its longest match.
+    alternation = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    # Every match has to start with one of these characters; a text containing none of them
+    # cannot match and skips the regex scan (the same idea as CPython's fastsearch bloom mask).
+    return re.compile(f"(?=({alternation}))"), frozenset(term[0] for term in terms)
+
+
+def _matched_terms(normalized: str, *term_lists: Sequence[str]) -> list[list[str]]:
+    # Every term list is matched in the same pass over the text.
+    lowered_lists = [[term.lower() for term in terms] for terms in term_lists]
+    compiled = _term_pattern(tuple(sorted({term for lowered in lowered_lists for term in lowered})))
+    hits: set[str] = set()
+    if compiled is not None:
+        pattern, first_chars = compiled
+        if not first_chars.isdisjoint(normalized):
+            hits = {match.group(1) for match in pattern.finditer(normalized)}
+    if not hits:
+        return [[] for _ in term_lists]
+    # A shorter term sharing a start position with a longer hit is a substring of that hit.
+    return [
+        [term for term, term_lower in zip(terms, lowered) if any(term_lower in hit for hit in hits)]
+        for terms, lowered in zip(term_lists, lowered_lists)
+    ]
+
+
 def resolve_brand_profile(
     db: Session,
     *,
@@ -84,69 +157,204 @@ def resolve_brand_profile(
     project_id: UUID,
     brand_profile_id: UUID | None = None,
 ) -> BrandProfile | None:
+    # One round trip: explicit profile first, then the project profile, then the tenant default.
+    candidates = [BrandProfile.project_id == project_id, BrandProfile.project_id.is_(None)]
+    priority = [(BrandProfile.project_id == project_id, 1)]
     if brand_profile_id is not None:
-        explicit = db.execute(
-            select(BrandProfile).where(
-                BrandProfile.id == brand_profile_id,
-                BrandProfile.company_id == tenant_id,
-            )
-        ).scalar_one_or_none()
-        if explicit is not None:
-            return explicit
-
-    project_profile = db.execute(
-        select(BrandProfile).where(
-            BrandProfile.company_id == tenant_id,
-            BrandProfile.project_id == project_id,
-        )
-    ).scalar_one_or_none()
-    if project_profile is not None:
-        return project_profile
-
+        candidates.append(BrandProfile.id == brand_profile_id)
+        priority.insert(0, (BrandProfile.id == brand_profile_id, 0))
     return db.execute(
-        select(BrandProfile).where(
-            BrandProfile.company_id == tenant_id,
-            BrandProfile.project_id.is_(None),
-        )
+        select(BrandProfile)
+        .where(BrandProfile.company_id == tenant_id, or_(*candidates))
+        .order_by(case(*priority, else_=2))
+        .limit(1)
     ).scalar_one_or_none()
 
 
+def _duplicate_similarity_issue(text: str, recent_posts: Sequence[RecentPostText]) -> Issue | None:
+    max_similarity = 0.0
+    text_trigrams = _trigrams(text)
+    # Jaccard is bounded by min(|A|, |B|) / max(|A|, |B|), and a string has at most len - 2 distinct
+    # trigrams, so posts that cannot reach the threshold are skipped before any set work.
+    min_trigrams = DUPLICATE_SIMILARITY_THRESHOLD * len(text_trigrams)
+    max_trigrams = len(text_trigrams) / DUPLICATE_SIMILARITY_THRESHOLD
+    if text_trigrams:
+        for recent in recent_posts:
+            candidate = _clean_for_trigrams(f"{recent.title}\n{recent.content}")
+            if max(1, len(candidate) - 2) < min_trigrams:
+                continue
+            candidate_trigrams = _clean_trigrams(candidate)
+            if not min_trigrams <= len(candidate_trigrams) <= max_trigrams:
+                continue
+            max_similarity = max(max_similarity, _jaccard_similarity(text_trigrams, candidate_trigrams))
+    if max_similarity < DUPLICATE_SIMILARITY_THRESHOLD:
+        return None
+    return Issue(
+        code="duplicate_similarity",
+        message=f"Content is too similar to recent posts ({max_similarity:.2f}).",
+        severity="warn",
+        suggestion="Change angle, hook, and CTA to avoid repetition.",
+    )
+
+
+@dataclass(frozen=True)
+class _BrandRules:
+    forbidden_claims: tuple[str, ...]
+    prohibited_words: tuple[str, ...]
+    tone: str
+    tone_keywords: frozenset[str]
+
+
+# A profile is evaluated against many posts, so its normalized term lists and tone keywords are resolved
+# once per distinct profile content. Keying on the content rather than (id, updated_at) keeps unflushed
+# in-memory edits from being served stale rules.
+@lru_cache(maxsize=256)
+def _compile_brand_rules(
+    tone: str,
+    forbidden_claims: tuple[str, ...],
+    prohibited_words: tuple[str, ...],
+) -> _BrandRules:
+    normalized_tone = tone.strip().lower()
+    return _BrandRules(
+        forbidden_claims=forbidden_claims,
+        prohibited_words=prohibited_words,
+        tone=normalized_tone,
+        tone_keywords=TONE_KEYWORDS.get(normalized_tone, TONE_KEYWORDS["professional"]),
+    )
+
+
+def _brand_rules(brand_profile: BrandProfile | None) -> _BrandRules:
+    if brand_profile is None:
+        return _compile_brand_rules("professional", (), ())
+    return _compile_brand_rules(
+        brand_profile.tone,
+        tuple(_normalize_list(brand_profile.forbidden_claims)),
+        tuple(_normalize_list(brand_profile.dont_list)),
+    )
+
+
+def _tone_issue(text: str, rules: _BrandRules) -> Issue | None:
+    tone = rules.tone
+    keywords = rules.tone_keywords
+    token_set = _tokenize(text)
+    tone_hits = len(keywords & token_set)
+    tone_score = tone_hits / len(keywords) if keywords else 1.0
+    if tone_score >= 0.2:
+        return None
+    return Issue(
+        code="tone_mismatch",
+        message=f"Content tone may not match '{tone}'.",
+        severity="warn",
+        suggestion="Adjust wording to better match selected brand tone.",
+    )
+
+
+# Editor previews re-check the same draft repeatedly; results are memoized on a digest of every input
+# the evaluation reads, so a profile edit or a new recent post simply produces a different key.
+_QUALITY_CACHE: OrderedDict[bytes, QualityCheckResult] = OrderedDict()
+_QUALITY_CACHE_LOCK = threading.Lock()
+_QUALITY_CACHE_MAX_ENTRIES = 4096
+
+
+def _quality_cache_key(
+    *,
+    title: str,
+    body: str,
+    rules: _BrandRules,
+    recent_posts: Sequence[RecentPostText],
+    mode: QualityCheckMode,
+) -> bytes:
+    parts: list[str] = [
+        mode,
+        title,
+        body,
+        rules.tone,
+        str(len(rules.forbidden_claims)),
+        *rules.forbidden_claims,
+        str(len(rules.prohibited_words)),
+        *rules.prohibited_words,
+        *(f"{recent.title}\n{recent.content}" for recent in recent_posts),
+    ]
+    digest = blake2b(digest_size=20)
+    for part in parts:
+        # Length-prefixed (and list-counted) so no arrangement of user text can make two inputs collide.
+        encoded = part.encode("utf-8", "surrogatepass")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.digest()
+
+
 def evaluate_post_quality(
     *,
     title: str,
     body: str,
     brand_profile: BrandProfile | None,
-    recent_posts: list[Post],
+    recent_posts: Sequence[RecentPostText],
+    mode: QualityCheckMode = "full",
+) -> QualityCheckResult:
+    rules = _brand_rules(brand_profile)
+    cache_key = _quality_cache_key(
+        title=title,
+        body=body,
+        rules=rules,
+        recent_posts=recent_posts,
+        mode=mode,
+    )
+    with _QUALITY_CACHE_LOCK:
+        cached = _QUALITY_CACHE.get(cache_key)
+        if cached is not None:
+            _QUALITY_CACHE.move_to_end(cache_key)
+            return cached
+
+    result = _evaluate_post_quality(
+        title=title,
+        body=body,
+        rules=rules,
+        recent_posts=recent_posts,
+        mode=mode,
+    )
+    with _QUALITY_CACHE_LOCK:
+        _QUALITY_CACHE[cache_key] = result
+        if len(_QUALITY_CACHE) > _QUALITY_CACHE_MAX_ENTRIES:
+            _QUALITY_CACHE.popitem(last=False)
+    return result
+
+
+def _evaluate_post_quality(
+    *,
+    title: str,
+    body: str,
+    rules: _BrandRules,
+    recent_posts: Sequence[RecentPostText],
+    mode: QualityCheckMode,
 ) -> QualityCheckResult:
     text = f"{title}\n{body}".strip()
     normalized = text.lower()
     issues: list[Issue] = []
 
-    forbidden_claims = _normalize_list(brand_profile.forbidden_claims if brand_profile else [])
-    for claim in forbidden_claims:
-        if claim.lower() in normalized:
-            issues.append(
-                Issue(
-                    code="forbidden_claim",
-                    message=f"Forbidden claim detected: '{claim}'.",
-                    severity="block",
-                    suggestion="Remove absolute or non-compliant claims from the post.",
-                )
+    matched_claims, matched_words = _matched_terms(normalized, rules.forbidden_claims, rules.prohibited_words)
+    for claim in matched_claims:
+        issues.append(
+            Issue(
+                code="forbidden_claim",
+                message=f"Forbidden claim detected: '{claim}'.",
+                severity="block",
+                suggestion="Remove absolute or non-compliant claims from the post.",
             )
+        )
 
-    prohibited_words = _normalize_list(brand_profile.dont_list if brand_profile else [])
-    for word in prohibited_words:
-        if word.lower() in normalized:
-            issues.append(
-                Issue(
-                    code="prohibited_word",
-                    message=f"Prohibited word detected: '{word}'.",
-                    severity="warn",
-                    suggestion="Replace prohibited wording with neutral brand-safe phrasing.",
-                )
+    for word in matched_words:
+        issues.append(
+            Issue(
+                code="prohibited_word",
+                message=f"Prohibited word detected: '{word}'.",
+                severity="warn",
+                suggestion="Replace prohibited wording with neutral brand-safe phrasing.",
             )
+        )
 
-    if PII_EMAIL_RE.search(text):
+    # Most posts carry no candidate character; the literal probes skip the full regex scan for them.
+    if "@" in text and PII_EMAIL_RE.search(text):
         issues.append(
             Issue(
                 code="pii_email",
@@ -155,7 +363,7 @@ def evaluate_post_quality(
                 suggestion="Remove personal emails from public posts.",
             )
         )
-    if PII_PHONE_RE.search(text):
+    if DIGIT_RE.search(text) and PII_PHONE_RE.search(text):
         issues.append(
             Issue(
                 code="pii_phone",
@@ -165,8 +373,8 @@ def evaluate_post_quality(
             )
         )
 
-    alpha_chars = [char for char in text if char.isalpha()]
-    caps_ratio = (sum(1 for char in alpha_chars if char.isupper()) / len(alpha_chars)) if alpha_chars else 0.0
+    alpha_count, upper_count = _caps_counts(text)
+    caps_ratio = (upper_count / alpha_count) if alpha_count else 0.0
     if caps_ratio > 0.45:
         issues.append(
             Issue(
@@ -177,7 +385,7 @@ def evaluate_post_quality(
             )
         )
 
-    if SPAM_PUNCT_RE.search(text):
+    if ("!" in text or "?" in text) and SPAM_PUNCT_RE.search(text):
         issues.append(
             Issue(
                 code="spam_punctuation",
@@ -187,34 +395,15 @@ def evaluate_post_quality(
             )
         )
 
-    max_similarity = 0.0
-    for recent in recent_posts:
-        candidate = f"{recent.title}\n{recent.content}".strip()
-        max_similarity = max(max_similarity, _jaccard_similarity(text, candidate))
-    if max_similarity >= 0.72:
-        issues.append(
-            Issue(
-                code="duplicate_similarity",
-                message=f"Content is too similar to recent posts ({max_similarity:.2f}).",
-                severity="warn",
-                suggestion="Change angle, hook, and CTA to avoid repetition.",
-            )
-        )
-
-    tone = (brand_profile.tone if brand_profile else "professional").strip().lower()
-    keywords = TONE_KEYWORDS.get(tone, TONE_KEYWORDS["professional"])
-    token_set = _tokenize(text)
-    tone_hits = sum(1 for token in keywords if token in token_set)
-    tone_score = tone_hits / len(keywords) if keywords else 1.0
-    if tone_score < 0.2:
-        issues.append(
-            Issue(
-                code="tone_mismatch",
-                message=f"Content tone may not match '{tone}'.",
-                severity="warn",
-                suggestion="Adjust wording to better match selected brand tone.",
-            )
-        )
+    # Gate callers only need the verdict; once a blocker is found the outcome is already "high", so the
+    # recent-post similarity scan and tone scoring are skipped.
+    if mode == "full" or not any(issue.severity == "block" for issue in issues):
+        for issue in (
+            _duplicate_similarity_issue(text, recent_posts),
+            _tone_issue(text, rules),
+        ):
+            if issue is not None:
+                issues.append(issue)
 
     score = 100
     for issue in issues:
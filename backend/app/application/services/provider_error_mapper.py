@@ -1,4 +1,6 @@
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -10,48 +12,50 @@ class NormalizedProviderError:
     suggested_action: str
 
 
-def map_provider_error(*, provider: str, error_code: str | None, message: str) -> NormalizedProviderError:
-    normalized_provider = provider.strip().lower()
-    code = (error_code or "unknown_error").strip().lower()
-    text = (message or "").lower()
+# (category, retryable, suggested_action) in match priority order; the last entry is the fallback.
+_ERROR_RULES: tuple[tuple[str, bool, str], ...] = (
+    ("auth", False, "Reconnect connector and refresh credentials"),
+    ("rate_limit", True, "Wait for cooldown and retry with backoff"),
+    ("content_rejected", False, "Adjust content to platform policy and retry"),
+    ("server_error", True, "Retry later; provider instability detected"),
+    ("server_error", True, "Retry later and inspect provider diagnostics"),
+)
+_FALLBACK_RULE = len(_ERROR_RULES) - 1
+
+# One scan per input; group N (1-based) maps to _ERROR_RULES[N - 1]. The lookahead reports every
+# token start so a token overlapping an earlier match is still seen.
+_CODE_TOKENS_RE = re.compile(
+    r"(?=(?:(auth|token|invalid_grant)|(rate|throttle|too_many_requests)|(content|policy|rejected)"
+    r"|(server|timeout|unavailable|network)))"
+)
+_MESSAGE_TOKENS_RE = re.compile(r"(unauthorized)|(rate limit)")
 
-    if any(token in code for token in ("auth", "token", "invalid_grant")) or "unauthorized" in text:
-        return NormalizedProviderError(
-            provider=normalized_provider,
-            error_code=code,
-            category="auth",
-            retryable=False,
-            suggested_action="Reconnect connector and refresh credentials",
-        )
-    if any(token in code for token in ("rate", "throttle", "too_many_requests")) or "rate limit" in text:
-        return NormalizedProviderError(
-            provider=normalized_provider,
-            error_code=code,
-            category="rate_limit",
-            retryable=True,
-            suggested_action="Wait for cooldown and retry with backoff",
-        )
-    if any(token in code for token in ("content", "policy", "rejected")):
-        return NormalizedProviderError(
-            provider=normalized_provider,
-            error_code=code,
-            category="content_rejected",
-            retryable=False,
-            suggested_action="Adjust content to platform policy and retry",
-        )
-    if any(token in code for token in ("server", "timeout", "unavailable", "network")):
-        return NormalizedProviderError(
-            provider=normalized_provider,
-            error_code=code,
-            category="server_error",
-            retryable=True,
-            suggested_action="Retry later; provider instability detected",
-        )
 
+@lru_cache(maxsize=1024)
+def _normalized_error(provider: str, code: str, rule_index: int) -> NormalizedProviderError:
+    category, retryable, suggested_action = _ERROR_RULES[rule_index]
     return NormalizedProviderError(
-        provider=normalized_provider,
+        provider=provider,
         error_code=code,
-        category="server_error",
-        retryable=True,
-        suggested_action="Retry later and inspect provider diagnostics",
+        category=category,
+        retryable=retryable,
+        suggested_action=suggested_action,
     )
+
+
+def map_provider_error(*, provider: str, error_code: str | None, message: str) -> NormalizedProviderError:
+    normalized_provider = provider.strip().lower()
+    code = (error_code or "unknown_error").strip().lower()
+    text = (message or "").lower()
+
+    rule_index = _FALLBACK_RULE
+    for match in _CODE_TOKENS_RE.finditer(code):
+        rule_index = min(rule_index, match.lastindex - 1)
+        if rule_index == 0:
+            break
+    if rule_index > 0:
+        for match in _MESSAGE_TOKENS_RE.finditer(text):
+            rule_index = min(rule_index, match.lastindex - 1)
+            if rule_index == 0:
+                break
+    return _normalized_error(normalized_provider, code, rule_index)
@@ -1,9 +1,12 @@
+import importlib
 import logging
 import re
 from datetime import UTC, datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from celery import group
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.domain.models.channel import Channel, ChannelStatus, ChannelType
@@ -15,6 +18,16 @@ logger = logging.getLogger(__name__)
 
 SLUG_SANITIZE_PATTERN = re.compile(r"[^a-z0-9]+")
 
+_publish_post_task = None
+
+
+def _get_publish_post_task():
+    # Resolved on first use: workers.tasks imports this module, so a top-level import would cycle.
+    global _publish_post_task
+    if _publish_post_task is None:
+        _publish_post_task = importlib.import_module("workers.tasks").publish_post
+    return _publish_post_task
+
 
 def emit_publish_event(
     db: Session,
@@ -28,6 +41,8 @@ def emit_publish_event(
     channel_id: UUID | None = None,
     metadata_json: dict | None = None,
 ) -> PublishEvent:
+    metadata_json = metadata_json or {}
+    normalized_error = metadata_json.get("normalized_error")
     event = PublishEvent(
         company_id=company_id,
         project_id=project_id,
@@ -36,7 +51,8 @@ def emit_publish_event(
         event_type=event_type,
         status=status,
         attempt=attempt,
-        metadata_json=metadata_json or {},
+        metadata_json=metadata_json,
+        normalized_error_category=normalized_error.get("category") if isinstance(normalized_error, dict) else None,
     )
     db.add(event)
     return event
@@ -47,22 +63,34 @@ def build_slug_base(title: str) -> str:
     return normalized or "post"
 
 
-def generate_unique_company_slug(db: Session, *, company_id: UUID, title: str, post_id: UUID) -> str:
-    base = build_slug_base(title)
+def build_publication_slug(*, title: str, post_id: UUID) -> str:
     suffix = str(post_id).split("-")[0]
-    candidate = f"{base}-{suffix}"
-
-    exists = db.execute(
-        select(WebsitePublication.id).where(
-            WebsitePublication.company_id == company_id,
-            WebsitePublication.slug == candidate,
-        )
+    return f"{build_slug_base(title)}-{suffix}"
+
+
+def create_website_publication(db: Session, *, post: Post, published_at: datetime) -> tuple[UUID, str]:
+    values = {
+        "company_id": post.company_id,
+        "project_id": post.project_id,
+        "post_id": post.id,
+        "title": post.title,
+        "content": post.content,
+        "published_at": published_at,
+    }
+    # The (company_id, slug) unique constraint arbitrates; only an actual collision pays for a second insert.
+    slug = build_publication_slug(title=post.title, post_id=post.id)
+    publication_id = db.execute(
+        pg_insert(WebsitePublication)
+        .values(slug=slug, **values)
+        .on_conflict_do_nothing(constraint="uq_website_publications_company_slug")
+        .returning(WebsitePublication.id)
     ).scalar_one_or_none()
-    if exists is None:
-        return candidate
-
-    timestamp_suffix = int(datetime.now(UTC).timestamp())
-    return f"{candidate}-{timestamp_suffix}"
+    if publication_id is None:
+        slug = f"{slug}-{int(datetime.now(UTC).timestamp())}"
+        publication_id = db.execute(
+            insert(WebsitePublication).values(slug=slug, **values).returning(WebsitePublication.id)
+        ).scalar_one()
+    return publication_id, slug
 
 
 def get_active_website_channel(db: Session, *, company_id: UUID, project_id: UUID) -> Channel | None:
@@ -100,9 +128,7 @@ def get_existing_website_publication(db: Session, *, company_id: UUID, post_id:
 
 
 def publish_post_async(company_id: UUID, post_id: UUID, countdown: int | None = None) -> None:
-    from workers.tasks import publish_post  # local import to avoid import cycle
-
-    publish_post.apply_async(
+    _get_publish_post_task().apply_async(
         kwargs={
             "company_id": str(company_id),
             "post_id": str(post_id),
@@ -115,3 +141,19 @@ def publish_post_async(company_id: UUID, post_id: UUID, countdown: int | None =
         post_id,
         countdown if countdown is not None else 0,
     )
+
+
+def publish_posts_async(items: list[tuple[UUID, UUID]], *, chunk_size: int = 50) -> int:
+    if not items:
+        return 0
+    publish_post = _get_publish_post_task()
+    # Each post is still its own broker message so publish_post keeps per-post locking, retries and
+    # acks_late; grouping in chunks only reuses one producer connection per chunk instead of one per call.
+    step = max(1, chunk_size)
+    for offset in range(0, len(items), step):
+        batch = items[offset : offset + step]
+        group(
+            publish_post.si(company_id=str(company_id), post_id=str(post_id)) for company_id, post_id in batch
+        ).apply_async()
+    logger.info("publish_posts_enqueued count=%s chunk_size=%s", len(items), step)
+    return len(items)
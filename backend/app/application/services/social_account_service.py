@@ -5,10 +5,24 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.application.services.connector_credentials_service import upsert_connector_credential
-from app.core.security import encrypt_secret
+from app.core.security import decrypt_secret, encrypt_secret
 from app.domain.models.social_account import SocialAccount
 
 
+def _maybe_reencrypt(current: str | None, new_plain: str | None) -> str | None:
+    # Keep the stored ciphertext when the token did not change: Fernet output is randomized, so
+    # re-encrypting would dirty the row and force an UPDATE on every refresh cycle.
+    if not new_plain:
+        return current
+    if current:
+        try:
+            if decrypt_secret(current) == new_plain:
+                return current
+        except ValueError:
+            pass
+    return encrypt_secret(new_plain)
+
+
 def upsert_social_account(
     db: Session,
     *,
@@ -43,10 +57,8 @@ def upsert_social_account(
         )
     else:
         account.display_name = display_name
-        account.access_token = encrypt_secret(access_token) if access_token else account.access_token
-        account.refresh_token = (
-            encrypt_secret(refresh_token) if refresh_token else account.refresh_token
-        )
+        account.access_token = _maybe_reencrypt(account.access_token, access_token)
+        account.refresh_token = _maybe_reencrypt(account.refresh_token, refresh_token)
         account.expires_at = expires_at if expires_at is not None else account.expires_at
         account.metadata_json = metadata_json or account.metadata_json or {}
 
@@ -89,10 +101,8 @@ def update_social_account_tokens(
     refresh_token: str | None,
     expires_at: datetime | None = None,
 ) -> SocialAccount:
-    if access_token:
-        account.access_token = encrypt_secret(access_token)
-    if refresh_token:
-        account.refresh_token = encrypt_secret(refresh_token)
+    account.access_token = _maybe_reencrypt(account.access_token, access_token)
+    account.refresh_token = _maybe_reencrypt(account.refresh_token, refresh_token)
     if expires_at is not None:
         account.expires_at = expires_at
     db.add(account)
@@ -1,23 +1,34 @@
 from __future__ import annotations
 
+import atexit
 import hmac
 import hashlib
-import json
+import re
+import threading
+import time
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from types import MappingProxyType
 from uuid import UUID
 
 import httpx
+import orjson
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.application.services.billing_service import PlanSnapshot, get_cached_plan, get_cached_plan_by_name
 from app.core.config import settings
 from app.domain.models.company import Company
 from app.domain.models.company_subscription import CompanySubscription
-from app.domain.models.subscription_plan import SubscriptionPlan
 
 STRIPE_API_BASE = "https://api.stripe.com/v1"
+# Form fields every subscription checkout session shares; the per-call payload only adds its own.
+_CHECKOUT_SESSION_BASE_FIELDS = MappingProxyType({"mode": "subscription", "line_items[0][quantity]": "1"})
+# Only the timestamp and v1 entries of the Stripe-Signature header are read.
+STRIPE_SIGNATURE_FIELD_RE = re.compile(r"(?:^|,)\s*(t|v1)\s*=([^,]*)")
+
+_stripe_client: httpx.Client | None = None
+_stripe_client_lock = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -31,8 +42,27 @@ class PortalSessionResult:
     portal_url: str
 
 
-def _headers() -> dict[str, str]:
-    return {"Authorization": f"Bearer {settings.stripe_api_key}"}
+def _client() -> httpx.Client:
+    # Shared keep-alive pool so checkout, portal and plan changes reuse the TLS session to Stripe.
+    global _stripe_client
+    client = _stripe_client
+    if client is not None:
+        return client
+    with _stripe_client_lock:
+        if _stripe_client is None:
+            _stripe_client = httpx.Client(
+                base_url=STRIPE_API_BASE,
+                headers={"Authorization": f"Bearer {settings.stripe_api_key}"},
+                timeout=httpx.Timeout(20.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60.0),
+            )
+        return _stripe_client
+
+
+@atexit.register
+def _close_client() -> None:
+    if _stripe_client is not None:
+        _stripe_client.close()
 
 
 def _require_stripe() -> None:
@@ -40,15 +70,15 @@ def _require_stripe() -> None:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Stripe is not configured")
 
 
-def _resolve_plan_by_name(db: Session, plan_name: str) -> SubscriptionPlan:
-    plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.name == plan_name)).scalar_one_or_none()
+def _resolve_plan_by_name(db: Session, plan_name: str) -> PlanSnapshot:
+    plan = get_cached_plan_by_name(db, plan_name)
     if plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
     return plan
 
 
-def _resolve_plan_by_id(db: Session, plan_id: UUID) -> SubscriptionPlan:
-    plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.id == plan_id)).scalar_one_or_none()
+def _resolve_plan_by_id(db: Session, plan_id: UUID) -> PlanSnapshot:
+    plan = get_cached_plan(db, plan_id)
     if plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
     return plan
@@ -57,7 +87,7 @@ def _resolve_plan_by_id(db: Session, plan_id: UUID) -> SubscriptionPlan:
 def _ensure_customer(db: Session, *, company_id: UUID, company_name: str | None) -> CompanySubscription:
     subscription = db.execute(select(CompanySubscription).where(CompanySubscription.company_id == company_id)).scalar_one_or_none()
     if subscription is None:
-        starter = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.name == "Starter")).scalar_one_or_none()
+        starter = get_cached_plan_by_name(db, "Starter")
         if starter is None:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Starter plan missing")
         subscription = CompanySubscription(company_id=company_id, plan_id=starter.id, status="incomplete")
@@ -71,17 +101,15 @@ def _ensure_customer(db: Session, *, company_id: UUID, company_name: str | None)
         "name": company_name or f"Tenant {company_id}",
         "metadata[company_id]": str(company_id),
     }
-    with httpx.Client(timeout=20.0) as client:
-        response = client.post(f"{STRIPE_API_BASE}/customers", headers=_headers(), data=payload)
+    response = _client().post("/customers", data=payload)
     if response.status_code >= 400:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Stripe customer error: {response.text[:200]}")
-    body = response.json()
+    body = orjson.loads(response.content)
     customer_id = str(body.get("id") or "")
     if not customer_id:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Stripe customer response invalid")
 
     subscription.stripe_customer_id = customer_id
-    db.add(subscription)
     db.flush()
     return subscription
 
@@ -124,9 +152,8 @@ def create_checkout_session_by_plan_id(
     subscription = _ensure_customer(db, company_id=company_id, company_name=company.name)
 
     payload = {
-        "mode": "subscription",
+        **_CHECKOUT_SESSION_BASE_FIELDS,
         "line_items[0][price]": plan.stripe_price_id,
-        "line_items[0][quantity]": "1",
         "success_url": success_url or settings.stripe_checkout_success_url,
         "cancel_url": cancel_url or settings.stripe_checkout_cancel_url,
         "customer": subscription.stripe_customer_id,
@@ -136,11 +163,10 @@ def create_checkout_session_by_plan_id(
         "metadata[plan_name]": plan.name,
     }
 
-    with httpx.Client(timeout=20.0) as client:
-        response = client.post(f"{STRIPE_API_BASE}/checkout/sessions", headers=_headers(), data=payload)
+    response = _client().post("/checkout/sessions", data=payload)
     if response.status_code >= 400:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Stripe checkout error: {response.text[:200]}")
-    body = response.json()
+    body = orjson.loads(response.content)
     checkout_url = str(body.get("url") or "")
     session_id = str(body.get("id") or "")
     if not checkout_url or not session_id:
@@ -164,17 +190,49 @@ def create_billing_portal_session(
         "customer": subscription.stripe_customer_id,
         "return_url": return_url or settings.stripe_billing_portal_return_url,
     }
-    with httpx.Client(timeout=20.0) as client:
-        response = client.post(f"{STRIPE_API_BASE}/billing_portal/sessions", headers=_headers(), data=payload)
+    response = _client().post("/billing_portal/sessions", data=payload)
     if response.status_code >= 400:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Stripe portal error: {response.text[:200]}")
-    body = response.json()
+    body = orjson.loads(response.content)
     url = str(body.get("url") or "")
     if not url:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Stripe portal response invalid")
     return PortalSessionResult(portal_url=url)
 
 
+def _fetch_subscription_item_id(stripe_subscription_id: str) -> str:
+    existing = _client().get(
+        f"/subscriptions/{stripe_subscription_id}",
+        params={"expand[]": "items.data.price"},
+    )
+    if existing.status_code >= 400:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Stripe subscription fetch error: {existing.text[:200]}")
+    existing_body = orjson.loads(existing.content)
+    items = ((existing_body.get("items") or {}).get("data") or [])
+    if not items:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Stripe subscription items missing")
+    item_id = str(items[0].get("id") or "")
+    if not item_id:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Stripe subscription item id missing")
+    return item_id
+
+
+def _is_missing_item_error(response: httpx.Response) -> bool:
+    # Only an error pointing at the item id means the stored id is stale. A bad price or proration
+    # parameter is also a 400 (an unknown price is even "resource_missing", on items[0][price]) and must
+    # surface instead of triggering a refetch and a second update.
+    if response.status_code not in {400, 404}:
+        return False
+    try:
+        error = orjson.loads(response.content).get("error")
+    except (orjson.JSONDecodeError, AttributeError):
+        return False
+    if not isinstance(error, dict):
+        return False
+    param = error.get("param")
+    return param == "items[0][id]" or (error.get("code") == "resource_missing" and not param)
+
+
 def change_subscription_plan(
     db: Session,
     *,
@@ -190,34 +248,24 @@ def change_subscription_plan(
     if subscription is None or not subscription.stripe_subscription_id:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No active Stripe subscription")
 
-    with httpx.Client(timeout=20.0) as client:
-        existing = client.get(
-            f"{STRIPE_API_BASE}/subscriptions/{subscription.stripe_subscription_id}",
-            headers=_headers(),
-            params={"expand[]": "items.data.price"},
-        )
-    if existing.status_code >= 400:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Stripe subscription fetch error: {existing.text[:200]}")
-    existing_body = existing.json()
-    items = ((existing_body.get("items") or {}).get("data") or [])
-    if not items:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Stripe subscription items missing")
-    item_id = str(items[0].get("id") or "")
-    if not item_id:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Stripe subscription item id missing")
-
     proration_behavior = settings.billing_proration_mode
-    payload = {
-        "items[0][id]": item_id,
-        "items[0][price]": target_plan.stripe_price_id,
-        "proration_behavior": proration_behavior,
-    }
-    with httpx.Client(timeout=20.0) as client:
-        update = client.post(
-            f"{STRIPE_API_BASE}/subscriptions/{subscription.stripe_subscription_id}",
-            headers=_headers(),
-            data=payload,
-        )
+
+    def _update(item_id: str) -> httpx.Response:
+        payload = {
+            "items[0][id]": item_id,
+            "items[0][price]": target_plan.stripe_price_id,
+            "proration_behavior": proration_behavior,
+        }
+        return _client().post(f"/subscriptions/{subscription.stripe_subscription_id}", data=payload)
+
+    # The item id is remembered from earlier plan changes and subscription webhooks, so the usual plan
+    # change is a single Stripe call. An id Stripe reports as missing is refetched once before giving up.
+    update = None
+    if subscription.stripe_subscription_item_id:
+        update = _update(subscription.stripe_subscription_item_id)
+    if update is None or _is_missing_item_error(update):
+        subscription.stripe_subscription_item_id = _fetch_subscription_item_id(subscription.stripe_subscription_id)
+        update = _update(subscription.stripe_subscription_item_id)
     if update.status_code >= 400:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Stripe subscription update error: {update.text[:200]}")
 
@@ -226,7 +274,6 @@ def change_subscription_plan(
     subscription.status = "active"
     subscription.last_payment_error = None
     subscription.last_invoice_status = "pending_webhook_confirmation"
-    db.add(subscription)
     db.flush()
 
     return {
@@ -241,20 +288,19 @@ def change_subscription_plan(
 
 
 def verify_stripe_signature(*, payload_bytes: bytes, signature_header: str | None) -> None:
-    if not settings.stripe_webhook_secret:
+    webhook_secret = settings.stripe_webhook_secret
+    if not webhook_secret:
         return
     if not signature_header:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing Stripe signature")
 
-    parts = {}
-    for chunk in signature_header.split(","):
-        if "=" not in chunk:
-            continue
-        key, value = chunk.split("=", 1)
-        parts[key.strip()] = value.strip()
-
-    timestamp = parts.get("t")
-    signature = parts.get("v1")
+    timestamp = signature = None
+    # Later entries win, as with the previous split-into-dict parsing.
+    for match in STRIPE_SIGNATURE_FIELD_RE.finditer(signature_header):
+        if match.group(1) == "t":
+            timestamp = match.group(2).strip()
+        else:
+            signature = match.group(2).strip()
     if not timestamp or not signature:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe signature header")
 
@@ -263,25 +309,33 @@ def verify_stripe_signature(*, payload_bytes: bytes, signature_header: str | Non
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe signature timestamp") from exc
 
-    age = abs(int(datetime.now(UTC).timestamp()) - signed_at)
+    age = abs(int(time.time()) - signed_at)
     if age > max(1, settings.stripe_webhook_tolerance_seconds):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expired Stripe signature")
 
-    signed_payload = f"{timestamp}.".encode("utf-8") + payload_bytes
-    expected = hmac.new(
-        settings.stripe_webhook_secret.encode("utf-8"),
-        signed_payload,
-        hashlib.sha256,
-    ).hexdigest()
+    # A v1 signature is a 64-char SHA-256 hex digest; anything else is rejected before hashing the payload.
+    if len(signature) != 64:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe signature")
+    try:
+        signature_bytes = bytes.fromhex(signature)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe signature") from exc
+
+    # Fed in pieces so the (possibly large) payload is not copied into a prefixed buffer first.
+    mac = hmac.new(webhook_secret.encode("utf-8"), None, hashlib.sha256)
+    mac.update(timestamp.encode("utf-8"))
+    mac.update(b".")
+    mac.update(payload_bytes)
 
-    if not hmac.compare_digest(expected, signature):
+    if not hmac.compare_digest(mac.digest(), signature_bytes):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe signature")
 
 
 def parse_stripe_webhook_payload(payload_bytes: bytes) -> dict:
     try:
-        payload = json.loads(payload_bytes.decode("utf-8"))
-    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        # orjson parses the raw bytes directly and rejects invalid UTF-8 as a decode error.
+        payload = orjson.loads(payload_bytes)
+    except orjson.JSONDecodeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe payload") from exc
     if not isinstance(payload, dict):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Stripe payload")
@@ -1,53 +1,82 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import bindparam, literal, select
 from sqlalchemy.orm import Session
 
 from app.application.services.audit_service import log_audit_event
+from app.application.services.billing_service import (
+    PlanSnapshot,
+    get_cached_cheapest_plan,
+    get_cached_plan,
+    get_cached_plan_by_name,
+)
 from app.core.config import settings
 from app.domain.models.billing_event import BillingEvent
 from app.domain.models.company_subscription import CompanySubscription
 from app.domain.models.stripe_event import StripeEvent
-from app.domain.models.subscription_plan import SubscriptionPlan
+
+
+# Webhook statements are built once; each event only binds parameters.
+_STMT_SUBSCRIPTION_BY_COMPANY = select(CompanySubscription).where(CompanySubscription.company_id == bindparam("company_id"))
+_STMT_SUBSCRIPTION_BY_STRIPE_ID = select(CompanySubscription).where(
+    CompanySubscription.stripe_subscription_id == bindparam("stripe_subscription_id")
+)
+_STMT_EVENT_BY_ID = select(StripeEvent).where(StripeEvent.stripe_event_id == bindparam("event_id"))
+# Anchored on a one-row select so the dedup row and the target subscription come back in one round trip
+# even when either of them does not exist yet.
+_EVENT_ANCHOR = select(literal(1).label("anchor")).subquery()
+_STMT_EVENT_WITH_SUBSCRIPTION = (
+    select(StripeEvent, CompanySubscription)
+    .select_from(_EVENT_ANCHOR)
+    .outerjoin(StripeEvent, StripeEvent.stripe_event_id == bindparam("event_id"))
+    .outerjoin(
+        CompanySubscription,
+        CompanySubscription.stripe_subscription_id == bindparam("stripe_subscription_id"),
+    )
+)
 
 
 def _from_unix(value) -> datetime | None:
     if value is None:
         return None
     try:
-        return datetime.fromtimestamp(int(value), tz=UTC)
+        # Stripe sends epoch seconds as JSON integers, which need no conversion; out-of-range values
+        # still fall through to None.
+        return datetime.fromtimestamp(value if type(value) is int else int(value), tz=UTC)
     except Exception:
         return None
 
 
-def _get_or_create_subscription(db: Session, *, company_id: UUID, default_plan: SubscriptionPlan | None = None) -> CompanySubscription:
-    subscription = db.execute(select(CompanySubscription).where(CompanySubscription.company_id == company_id)).scalar_one_or_none()
+def _get_or_create_subscription(db: Session, *, company_id: UUID, default_plan: PlanSnapshot | None = None) -> CompanySubscription:
+    subscription = db.execute(_STMT_SUBSCRIPTION_BY_COMPANY, {"company_id": company_id}).scalar_one_or_none()
     if subscription is not None:
         return subscription
 
     plan = default_plan
     if plan is None:
-        plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.name == "Starter")).scalar_one_or_none()
+        plan = get_cached_plan_by_name(db, "Starter")
     if plan is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Starter plan missing")
 
+    now = datetime.now(UTC)
     subscription = CompanySubscription(
         company_id=company_id,
         plan_id=plan.id,
         status="incomplete",
-        current_period_start=datetime.now(UTC),
-        current_period_end=datetime.now(UTC) + timedelta(days=30),
+        current_period_start=now,
+        current_period_end=now + timedelta(days=30),
     )
     db.add(subscription)
     db.flush()
     return subscription
 
 
-def _plan_from_event(db: Session, event_object: dict) -> SubscriptionPlan | None:
+def _plan_from_event(db: Session, event_object: dict) -> PlanSnapshot | None:
     metadata = event_object.get("metadata") if isinstance(event_object, dict) else None
     plan_id_raw = metadata.get("plan_id") if isinstance(metadata, dict) else None
     plan_name = metadata.get("plan_name") if isinstance(metadata, dict) else None
@@ -55,18 +84,18 @@ def _plan_from_event(db: Session, event_object: dict) -> SubscriptionPlan | None
     if plan_id_raw:
         try:
             plan_id = UUID(str(plan_id_raw))
-            plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.id == plan_id)).scalar_one_or_none()
+            plan = get_cached_plan(db, plan_id)
             if plan is not None:
                 return plan
         except ValueError:
             pass
 
     if plan_name:
-        plan = db.execute(select(SubscriptionPlan).where(SubscriptionPlan.name == str(plan_name))).scalar_one_or_none()
+        plan = get_cached_plan_by_name(db, str(plan_name))
         if plan is not None:
             return plan
 
-    return db.execute(select(SubscriptionPlan).order_by(SubscriptionPlan.monthly_price.asc())).scalars().first()
+    return get_cached_cheapest_plan(db)
 
 
 def _extract_company_id(event_object: dict) -> UUID | None:
@@ -92,19 +121,209 @@ def _record_billing_event(db: Session, *, company_id: UUID, event_type: str, mes
 
 
 def _set_subscription_from_stripe_object(
-    db: Session,
     *,
     subscription: CompanySubscription,
     stripe_subscription: dict,
 ) -> None:
     status_value = str(stripe_subscription.get("status") or subscription.status or "incomplete")
     subscription.status = status_value
+    previous_subscription_id = subscription.stripe_subscription_id
     subscription.stripe_subscription_id = str(stripe_subscription.get("id") or subscription.stripe_subscription_id or "") or None
+    items = ((stripe_subscription.get("items") or {}).get("data") or [])
+    item_id = str(items[0].get("id") or "") if items else ""
+    if item_id:
+        subscription.stripe_subscription_item_id = item_id
+    elif subscription.stripe_subscription_id != previous_subscription_id:
+        subscription.stripe_subscription_item_id = None
     subscription.stripe_customer_id = str(stripe_subscription.get("customer") or subscription.stripe_customer_id or "") or None
     subscription.current_period_start = _from_unix(stripe_subscription.get("current_period_start"))
     subscription.current_period_end = _from_unix(stripe_subscription.get("current_period_end"))
     subscription.cancel_at_period_end = bool(stripe_subscription.get("cancel_at_period_end", False))
-    db.add(subscription)
+
+
+def _record_webhook_applied(
+    db: Session,
+    *,
+    company_id: UUID,
+    event_type: str,
+    event_id: str,
+    message: str,
+    metadata: dict,
+) -> None:
+    _record_billing_event(db, company_id=company_id, event_type=event_type, message=message, metadata=metadata)
+    log_audit_event(db, company_id=company_id, action="billing.webhook_applied", metadata={"event_type": event_type, "stripe_event_id": event_id})
+
+
+def _subscription_by_stripe_id(db: Session, stripe_subscription_id: str) -> CompanySubscription | None:
+    return db.execute(
+        _STMT_SUBSCRIPTION_BY_STRIPE_ID, {"stripe_subscription_id": stripe_subscription_id}
+    ).scalar_one_or_none()
+
+
+def _event_stripe_subscription_id(event_type: str, event_object: dict) -> str:
+    if event_type.startswith("customer.subscription."):
+        return str(event_object.get("id") or "")
+    if event_type.startswith("invoice."):
+        return str(event_object.get("subscription") or "")
+    if event_type.startswith("payment_intent."):
+        return str((event_object.get("metadata") or {}).get("subscription_id") or "")
+    return ""
+
+
+def _apply_payment_failure(
+    db: Session,
+    *,
+    subscription: CompanySubscription,
+    event_id: str,
+    error_message: str,
+) -> None:
+    subscription.status = "past_due"
+    subscription.last_payment_error = error_message
+    subscription.grace_period_end = datetime.now(UTC) + timedelta(days=max(1, settings.billing_grace_period_days))
+    log_audit_event(
+        db,
+        company_id=subscription.company_id,
+        action="billing.payment_failed",
+        metadata={"stripe_event_id": event_id, "grace_period_end": subscription.grace_period_end.isoformat() if subscription.grace_period_end else None},
+    )
+    log_audit_event(
+        db,
+        company_id=subscription.company_id,
+        action="billing.grace_activated",
+        metadata={"stripe_event_id": event_id},
+    )
+
+
+def _handle_checkout_completed(
+    db: Session,
+    event_object: dict,
+    event_type: str,
+    event_id: str,
+    subscription: CompanySubscription | None,
+) -> None:
+    company_id = _extract_company_id(event_object)
+    if company_id is None:
+        return
+    plan = _plan_from_event(db, event_object)
+    subscription = _get_or_create_subscription(db, company_id=company_id, default_plan=plan)
+    if plan is not None:
+        subscription.plan_id = plan.id
+    subscription.status = "active"
+    subscription.stripe_customer_id = str(event_object.get("customer") or subscription.stripe_customer_id or "") or None
+    stripe_subscription_id = str(event_object.get("subscription") or subscription.stripe_subscription_id or "") or None
+    if stripe_subscription_id != subscription.stripe_subscription_id:
+        # A new Stripe subscription has its own items; the cached item id belongs to the old one.
+        subscription.stripe_subscription_item_id = None
+    subscription.stripe_subscription_id = stripe_subscription_id
+    subscription.last_payment_error = None
+    _record_webhook_applied(
+        db,
+        company_id=company_id,
+        event_type=event_type,
+        event_id=event_id,
+        message="Checkout session completed",
+        metadata={"stripe_event_id": event_id},
+    )
+
+
+def _handle_subscription_event(
+    db: Session,
+    event_object: dict,
+    event_type: str,
+    event_id: str,
+    subscription: CompanySubscription | None,
+) -> None:
+    stripe_subscription_id = str(event_object.get("id") or "")
+    if subscription is None:
+        return
+    _set_subscription_from_stripe_object(subscription=subscription, stripe_subscription=event_object)
+    if event_type == "customer.subscription.deleted":
+        subscription.status = "canceled"
+    _record_webhook_applied(
+        db,
+        company_id=subscription.company_id,
+        event_type=event_type,
+        event_id=event_id,
+        message=f"Subscription event: {event_type}",
+        metadata={"stripe_subscription_id": stripe_subscription_id, "stripe_event_id": event_id},
+    )
+
+
+def _handle_invoice_event(
+    db: Session,
+    event_object: dict,
+    event_type: str,
+    event_id: str,
+    subscription: CompanySubscription | None,
+) -> None:
+    stripe_subscription_id = str(event_object.get("subscription") or "")
+    if subscription is None:
+        return
+    invoice_status = str(event_object.get("status") or "")
+    subscription.last_invoice_status = invoice_status or subscription.last_invoice_status
+    if event_type == "invoice.paid":
+        subscription.status = "active"
+        subscription.last_payment_error = None
+        subscription.grace_period_end = None
+    elif event_type == "invoice.payment_failed":
+        _apply_payment_failure(
+            db,
+            subscription=subscription,
+            event_id=event_id,
+            error_message=str((event_object.get("last_finalization_error") or {}).get("message") or "payment_failed"),
+        )
+    _record_webhook_applied(
+        db,
+        company_id=subscription.company_id,
+        event_type=event_type,
+        event_id=event_id,
+        message=f"Invoice event: {event_type}",
+        metadata={"stripe_subscription_id": stripe_subscription_id, "invoice_status": invoice_status, "stripe_event_id": event_id},
+    )
+
+
+def _handle_payment_intent_event(
+    db: Session,
+    event_object: dict,
+    event_type: str,
+    event_id: str,
+    subscription: CompanySubscription | None,
+) -> None:
+    if subscription is None:
+        return
+    if event_type == "payment_intent.payment_failed":
+        _apply_payment_failure(
+            db,
+            subscription=subscription,
+            event_id=event_id,
+            error_message=str((event_object.get("last_payment_error") or {}).get("message") or "payment_failed"),
+        )
+    elif event_type == "payment_intent.succeeded":
+        subscription.last_payment_error = None
+        if subscription.status in {"past_due", "unpaid", "incomplete"}:
+            subscription.status = "active"
+        subscription.grace_period_end = None
+    _record_webhook_applied(
+        db,
+        company_id=subscription.company_id,
+        event_type=event_type,
+        event_id=event_id,
+        message=f"Payment intent event: {event_type}",
+        metadata={"stripe_event_id": event_id},
+    )
+
+
+_EVENT_HANDLERS: dict[str, Callable[[Session, dict, str, str, CompanySubscription | None], None]] = {
+    "checkout.session.completed": _handle_checkout_completed,
+    "customer.subscription.created": _handle_subscription_event,
+    "customer.subscription.updated": _handle_subscription_event,
+    "customer.subscription.deleted": _handle_subscription_event,
+    "invoice.paid": _handle_invoice_event,
+    "invoice.payment_failed": _handle_invoice_event,
+    "invoice.finalized": _handle_invoice_event,
+    "payment_intent.succeeded": _handle_payment_intent_event,
+    "payment_intent.payment_failed": _handle_payment_intent_event,
+}
 
 
 def process_stripe_event_payload(db: Session, payload: dict) -> dict:
@@ -115,7 +334,20 @@ def process_stripe_event_payload(db: Session, payload: dict) -> dict:
     if not event_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing Stripe event id")
 
-    existing = db.execute(select(StripeEvent).where(StripeEvent.stripe_event_id == event_id)).scalar_one_or_none()
+    handler = _EVENT_HANDLERS.get(event_type)
+    stripe_subscription_id = _event_stripe_subscription_id(event_type, event_object) if handler is not None else ""
+    preloaded: list = []
+    # Pending rows from the caller (the raw webhook record) are written with the event row's flush below
+    # instead of in a separate autoflush before this lookup.
+    with db.no_autoflush:
+        if stripe_subscription_id:
+            preloaded = db.execute(
+                _STMT_EVENT_WITH_SUBSCRIPTION,
+                {"event_id": event_id, "stripe_subscription_id": stripe_subscription_id},
+            ).all()
+            existing = preloaded[0][0]
+        else:
+            existing = db.execute(_STMT_EVENT_BY_ID, {"event_id": event_id}).scalar_one_or_none()
     if existing is not None and existing.status == "processed":
         return {"received": True, "deduplicated": True, "stripe_event_id": event_id}
 
@@ -127,134 +359,21 @@ def process_stripe_event_payload(db: Session, payload: dict) -> dict:
     db.flush()
 
     try:
-        if event_type == "checkout.session.completed":
-            company_id = _extract_company_id(event_object)
-            if company_id is not None:
-                plan = _plan_from_event(db, event_object)
-                subscription = _get_or_create_subscription(db, company_id=company_id, default_plan=plan)
-                if plan is not None:
-                    subscription.plan_id = plan.id
-                subscription.status = "active"
-                subscription.stripe_customer_id = str(event_object.get("customer") or subscription.stripe_customer_id or "") or None
-                subscription.stripe_subscription_id = str(event_object.get("subscription") or subscription.stripe_subscription_id or "") or None
-                subscription.last_payment_error = None
-                db.add(subscription)
-                _record_billing_event(
-                    db,
-                    company_id=company_id,
-                    event_type=event_type,
-                    message="Checkout session completed",
-                    metadata={"stripe_event_id": event_id},
-                )
-                log_audit_event(db, company_id=company_id, action="billing.webhook_applied", metadata={"event_type": event_type, "stripe_event_id": event_id})
-
-        elif event_type in {"customer.subscription.created", "customer.subscription.updated", "customer.subscription.deleted"}:
-            stripe_subscription_id = str(event_object.get("id") or "")
-            if stripe_subscription_id:
-                subscription = db.execute(
-                    select(CompanySubscription).where(CompanySubscription.stripe_subscription_id == stripe_subscription_id)
-                ).scalar_one_or_none()
-                if subscription is not None:
-                    _set_subscription_from_stripe_object(db, subscription=subscription, stripe_subscription=event_object)
-                    if event_type == "customer.subscription.deleted":
-                        subscription.status = "canceled"
-                        db.add(subscription)
-                    _record_billing_event(
-                        db,
-                        company_id=subscription.company_id,
-                        event_type=event_type,
-                        message=f"Subscription event: {event_type}",
-                        metadata={"stripe_subscription_id": stripe_subscription_id, "stripe_event_id": event_id},
-                    )
-                    log_audit_event(db, company_id=subscription.company_id, action="billing.webhook_applied", metadata={"event_type": event_type, "stripe_event_id": event_id})
-
-        elif event_type in {"invoice.paid", "invoice.payment_failed", "invoice.finalized"}:
-            stripe_subscription_id = str(event_object.get("subscription") or "")
-            if stripe_subscription_id:
-                subscription = db.execute(
-                    select(CompanySubscription).where(CompanySubscription.stripe_subscription_id == stripe_subscription_id)
-                ).scalar_one_or_none()
-                if subscription is not None:
-                    invoice_status = str(event_object.get("status") or "")
-                    subscription.last_invoice_status = invoice_status or subscription.last_invoice_status
-                    if event_type == "invoice.paid":
-                        subscription.status = "active"
-                        subscription.last_payment_error = None
-                        subscription.grace_period_end = None
-                    elif event_type == "invoice.payment_failed":
-                        subscription.status = "past_due"
-                        subscription.last_payment_error = str((event_object.get("last_finalization_error") or {}).get("message") or "payment_failed")
-                        subscription.grace_period_end = datetime.now(UTC) + timedelta(days=max(1, settings.billing_grace_period_days))
-                        log_audit_event(
-                            db,
-                            company_id=subscription.company_id,
-                            action="billing.payment_failed",
-                            metadata={"stripe_event_id": event_id, "grace_period_end": subscription.grace_period_end.isoformat() if subscription.grace_period_end else None},
-                        )
-                        log_audit_event(
-                            db,
-                            company_id=subscription.company_id,
-                            action="billing.grace_activated",
-                            metadata={"stripe_event_id": event_id},
-                        )
-                    db.add(subscription)
-                    _record_billing_event(
-                        db,
-                        company_id=subscription.company_id,
-                        event_type=event_type,
-                        message=f"Invoice event: {event_type}",
-                        metadata={"stripe_subscription_id": stripe_subscription_id, "invoice_status": invoice_status, "stripe_event_id": event_id},
-                    )
-                    log_audit_event(db, company_id=subscription.company_id, action="billing.webhook_applied", metadata={"event_type": event_type, "stripe_event_id": event_id})
-
-        elif event_type in {"payment_intent.succeeded", "payment_intent.payment_failed"}:
-            metadata = event_object.get("metadata") or {}
-            subscription_id = str(metadata.get("subscription_id") or "")
+        if handler is not None:
             subscription = None
-            if subscription_id:
-                subscription = db.execute(
-                    select(CompanySubscription).where(CompanySubscription.stripe_subscription_id == subscription_id)
-                ).scalar_one_or_none()
-            if subscription is not None:
-                if event_type == "payment_intent.payment_failed":
-                    subscription.status = "past_due"
-                    subscription.last_payment_error = str((event_object.get("last_payment_error") or {}).get("message") or "payment_failed")
-                    subscription.grace_period_end = datetime.now(UTC) + timedelta(days=max(1, settings.billing_grace_period_days))
-                    log_audit_event(
-                        db,
-                        company_id=subscription.company_id,
-                        action="billing.payment_failed",
-                        metadata={"stripe_event_id": event_id, "grace_period_end": subscription.grace_period_end.isoformat() if subscription.grace_period_end else None},
-                    )
-                    log_audit_event(
-                        db,
-                        company_id=subscription.company_id,
-                        action="billing.grace_activated",
-                        metadata={"stripe_event_id": event_id},
-                    )
-                elif event_type == "payment_intent.succeeded":
-                    subscription.last_payment_error = None
-                    if subscription.status in {"past_due", "unpaid", "incomplete"}:
-                        subscription.status = "active"
-                    subscription.grace_period_end = None
-                db.add(subscription)
-                _record_billing_event(
-                    db,
-                    company_id=subscription.company_id,
-                    event_type=event_type,
-                    message=f"Payment intent event: {event_type}",
-                    metadata={"stripe_event_id": event_id},
-                )
-                log_audit_event(db, company_id=subscription.company_id, action="billing.webhook_applied", metadata={"event_type": event_type, "stripe_event_id": event_id})
+            if len(preloaded) == 1:
+                subscription = preloaded[0][1]
+            elif preloaded:
+                # Duplicate subscription ids surface the same lookup error as a direct query would.
+                subscription = _subscription_by_stripe_id(db, stripe_subscription_id)
+            handler(db, event_object, event_type, event_id, subscription)
 
         stripe_event.status = "processed"
         stripe_event.processed_at = datetime.now(UTC)
-        db.add(stripe_event)
         return {"received": True, "processed": True, "stripe_event_id": event_id}
 
     except Exception as exc:
         stripe_event.status = "error"
         stripe_event.error = str(exc)[:4000]
         stripe_event.processed_at = datetime.now(UTC)
-        db.add(stripe_event)
         raise
@@ -17,8 +17,22 @@ def _resolve_path(payload: dict[str, Any], path: str) -> str:
 
 
 def render_prompt_template(template: str, variables: dict[str, Any]) -> str:
-    def _replace(match: re.Match[str]) -> str:
-        key = match.group(1).strip()
-        return _resolve_path(variables, key)
-
-    return TEMPLATE_VAR_PATTERN.sub(_replace, template)
+    if "{{" not in template:
+        return template
+    # Templates repeat placeholders (project name, tone), so each distinct path is walked once per render.
+    # Only referenced paths are resolved; flattening the whole payload up front would cost more for large
+    # variable dicts and would also match keys that themselves contain dots.
+    resolved: dict[str, str] = {}
+    # One pass over the matches, assembling literal spans and values without a per-match sub() callback.
+    parts: list[str] = []
+    last = 0
+    for match in TEMPLATE_VAR_PATTERN.finditer(template):
+        key = match.group(1)
+        value = resolved.get(key)
+        if value is None:
+            value = resolved[key] = _resolve_path(variables, key)
+        parts.append(template[last : match.start()])
+        parts.append(value)
+        last = match.end()
+    parts.append(template[last:])
+    return "".join(parts)
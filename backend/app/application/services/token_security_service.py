@@ -1,3 +1,5 @@
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 from sqlalchemy import delete, select
@@ -6,23 +8,63 @@ from sqlalchemy.orm import Session
 from app.core.security import get_token_identifier
 from app.domain.models.revoked_token import RevokedToken
 
+# A revocation never lapses before the token itself expires, so known revocations can be answered from
+# memory until expires_at. The cache is only filled from committed rows read back by is_token_revoked, so a
+# revocation rolled back with its request is never remembered. Misses are not cached: with refresh rotation
+# a token is checked once and then revoked, and a stale "not revoked" answer in another worker would reopen
+# a replay window.
+_REVOKED_CACHE: OrderedDict[str, datetime] = OrderedDict()
+_REVOKED_CACHE_LOCK = threading.Lock()
+_REVOKED_CACHE_MAX_ENTRIES = 10_000
+_PRUNE_CHUNK_SIZE = 5000
+
+
+def _remember_revoked(token_id: str, expires_at: datetime) -> None:
+    with _REVOKED_CACHE_LOCK:
+        _REVOKED_CACHE[token_id] = expires_at
+        _REVOKED_CACHE.move_to_end(token_id)
+        if len(_REVOKED_CACHE) > _REVOKED_CACHE_MAX_ENTRIES:
+            _REVOKED_CACHE.popitem(last=False)
+
 
 def revoke_token(db: Session, *, token: str, expires_at: datetime, claims: dict | None = None) -> None:
     token_id = get_token_identifier(token, claims)
-    existing = db.execute(select(RevokedToken).where(RevokedToken.token_id == token_id)).scalar_one_or_none()
+    existing = db.execute(select(RevokedToken.id).where(RevokedToken.token_id == token_id)).scalar_one_or_none()
     if existing is None:
         db.add(RevokedToken(token_id=token_id, expires_at=expires_at))
 
 
 def is_token_revoked(db: Session, *, token: str, claims: dict | None = None) -> bool:
     token_id = get_token_identifier(token, claims)
-    row = db.execute(select(RevokedToken).where(RevokedToken.token_id == token_id)).scalar_one_or_none()
-    if row is None:
-        return False
     now = datetime.now(timezone.utc)
-    return row.expires_at >= now
+    cached_expires_at = _REVOKED_CACHE.get(token_id)
+    if cached_expires_at is not None and cached_expires_at >= now:
+        return True
+
+    expires_at = db.execute(
+        select(RevokedToken.expires_at).where(RevokedToken.token_id == token_id)
+    ).scalar_one_or_none()
+    if expires_at is None:
+        return False
+    if expires_at >= now:
+        _remember_revoked(token_id, expires_at)
+        return True
+    return False
 
 
-def prune_expired_revoked_tokens(db: Session) -> None:
+def prune_expired_revoked_tokens(db: Session) -> int:
+    # Expired rows are already ignored by is_token_revoked, so this runs as scheduled maintenance rather than
+    # on the auth path. Each chunk is committed on its own so a large backlog never holds row locks for long.
     now = datetime.now(timezone.utc)
-    db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+    deleted = 0
+    while True:
+        expired_ids = (
+            select(RevokedToken.id).where(RevokedToken.expires_at < now).limit(_PRUNE_CHUNK_SIZE).scalar_subquery()
+        )
+        result = db.execute(
+            delete(RevokedToken).where(RevokedToken.id.in_(expired_ids)).execution_options(synchronize_session=False)
+        )
+        db.commit()
+        deleted += result.rowcount
+        if result.rowcount < _PRUNE_CHUNK_SIZE:
+            return deleted
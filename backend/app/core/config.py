@@ -1,6 +1,13 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+@lru_cache(maxsize=8)
+def _parse_email_list(raw: str) -> tuple[str, ...]:
+    return tuple(value.strip().lower() for value in raw.split(",") if value.strip())
+
+
 class Settings(BaseSettings):
     app_name: str = "Control Center"
     app_env: str = "development"
@@ -48,6 +55,7 @@ class Settings(BaseSettings):
     billing_past_due_allow_write: bool = True
     billing_restrict_connectors_in_grace: bool = False
     feature_flag_cache_ttl_seconds: int = 60
+    subscription_plan_cache_ttl_seconds: int = 300
     platform_admin_emails: str = ""
     system_publish_failure_alert_threshold: float = 0.05
     system_db_latency_alert_ms: int = 120
@@ -107,10 +115,10 @@ class Settings(BaseSettings):
     openai_temperature: float = 0.2
 
     @property
-    def platform_admin_email_list(self) -> list[str]:
-        if not self.platform_admin_emails.strip():
-            return []
-        return [value.strip().lower() for value in self.platform_admin_emails.split(",") if value.strip()]
+    def platform_admin_email_list(self) -> tuple[str, ...]:
+        # Checked on every admin-gated request; the parse is cached on the raw value, so runtime overrides
+        # of platform_admin_emails are still picked up.
+        return _parse_email_list(self.platform_admin_emails)
 
     @property
     def cors_allowed_origins(self) -> list[str]:
@@ -143,4 +151,10 @@ class Settings(BaseSettings):
         return f"redis://{self.redis_host}:{self.redis_port}/0"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    # One parsed instance per process; tests that change the environment can call get_settings.cache_clear().
+    return Settings()
+
+
+settings = get_settings()
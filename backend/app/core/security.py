@@ -1,42 +1,62 @@
 import base64
 import hashlib
-from datetime import datetime, timedelta, timezone
+import time
+from functools import lru_cache
 from uuid import UUID, uuid4
 
+import bcrypt
 import jwt
 from cryptography.fernet import Fernet, InvalidToken
-from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Same cost and $2b$ ident the previous passlib context produced, so stored hashes keep verifying.
+BCRYPT_ROUNDS = 12
+# bcrypt only reads the first 72 bytes; truncating explicitly keeps passlib's behavior on newer bcrypt
+# releases that reject longer inputs.
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# Signing settings are fixed for the process lifetime (rotating them invalidates every issued token), so
+# they are bound once at import. Everything that signs with the JWT secret (access/refresh tokens, OAuth
+# state) reads these bindings, so a runtime change to settings cannot split signers from verifiers.
+JWT_SECRET_KEY = settings.jwt_secret_key
+JWT_ALGORITHM = settings.jwt_algorithm
+JWT_ALGORITHMS = [settings.jwt_algorithm]
 
 
 def _get_fernet() -> Fernet:
-    secret_source = settings.token_encryption_key or settings.jwt_secret_key
+    return _fernet_for(settings.token_encryption_key or JWT_SECRET_KEY)
+
+
+# Keyed on the secret itself, so the SHA-256 derivation and Fernet setup run once per key rather than on
+# every encrypt and decrypt, and a changed key still gets its own instance.
+@lru_cache(maxsize=4)
+def _fernet_for(secret_source: str) -> Fernet:
     digest = hashlib.sha256(secret_source.encode("utf-8")).digest()
     key = base64.urlsafe_b64encode(digest)
     return Fernet(key)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    secret = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    secret = plain_password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.checkpw(secret, hashed_password.encode("ascii"))
 
 
 def _create_token(user_id: UUID, company_id: UUID, expires_minutes: int, token_type: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
+    # Epoch seconds are what PyJWT would serialize an aware datetime to anyway.
     payload = {
         "sub": str(user_id),
         "company_id": str(company_id),
-        "exp": expire,
+        "exp": int(time.time()) + expires_minutes * 60,
         "type": token_type,
         "jti": str(uuid4()),
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
 def create_access_token(user_id: UUID, company_id: UUID) -> str:
@@ -48,7 +68,7 @@ def create_refresh_token(user_id: UUID, company_id: UUID) -> str:
 
 
 def decode_token(token: str) -> dict:
-    return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    return jwt.decode(token, JWT_SECRET_KEY, algorithms=JWT_ALGORITHMS)
 
 
 def get_token_identifier(token: str, claims: dict | None = None) -> str:
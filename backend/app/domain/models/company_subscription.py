@@ -24,6 +24,7 @@ class CompanySubscription(Base):
     )
     stripe_customer_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     stripe_subscription_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    stripe_subscription_item_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="active")
     current_period_start: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     current_period_end: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,6 +11,14 @@ class PublishEvent(Base):
     __tablename__ = "publish_events"
     __table_args__ = (
         CheckConstraint("status IN ('ok', 'error')", name="ck_publish_events_status_values"),
+        Index(
+            "ix_publish_events_company_channel_type_created_at",
+            "company_id",
+            "channel_id",
+            "event_type",
+            text("created_at DESC"),
+        ),
+        Index("ix_publish_events_window", "event_type", "created_at", "company_id", "channel_id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -30,4 +38,5 @@ class PublishEvent(Base):
     status: Mapped[str] = mapped_column(String(10), nullable=False)
     attempt: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
     metadata_json: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    normalized_error_category: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -11,7 +11,7 @@ class SystemHealth(Base):
     __tablename__ = "system_health"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    component: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    component: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     latency_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
     error_rate: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
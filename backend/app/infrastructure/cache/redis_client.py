@@ -1,7 +1,20 @@
+import threading
+
 from redis import Redis
 
 from app.core.config import settings
 
+_redis_client: Redis | None = None
+_redis_client_lock = threading.Lock()
+
 
 def get_redis_client() -> Redis:
-    return Redis.from_url(settings.cache_redis_url, decode_responses=True)
+    # One client (and connection pool) per process; redis-py resets the pool after fork.
+    global _redis_client
+    client = _redis_client
+    if client is not None:
+        return client
+    with _redis_client_lock:
+        if _redis_client is None:
+            _redis_client = Redis.from_url(settings.cache_redis_url, decode_responses=True)
+        return _redis_client
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from app.core.config import settings
 from app.infrastructure.observability.metrics import observe_db_query
 
-async_engine = create_async_engine(settings.sqlalchemy_database_uri, pool_pre_ping=True)
+async_engine = create_async_engine(settings.sqlalchemy_database_uri, pool_pre_ping=True, query_cache_size=1024)
 AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False, autoflush=False)
 
 
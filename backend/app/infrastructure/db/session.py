@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 from app.infrastructure.observability.metrics import observe_db_query
 
-engine = create_engine(settings.sqlalchemy_database_uri, pool_pre_ping=True)
+engine = create_engine(settings.sqlalchemy_database_uri, pool_pre_ping=True, query_cache_size=1024)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -3,7 +3,7 @@ from datetime import UTC, datetime
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.application.services.publishing_service import generate_unique_company_slug
+from app.application.services.publishing_service import create_website_publication
 from app.domain.models.channel import Channel
 from app.domain.models.post import Post
 from app.domain.models.website_publication import WebsitePublication
@@ -41,34 +41,23 @@ class WebsiteAdapter(BaseChannelAdapter):
         return await self.publish_text(post=post, channel=channel)
 
     def _publish(self, *, post: Post, channel: Channel, media_metadata: dict | None) -> dict:
-        existing = self.db.execute(
-            select(WebsitePublication).where(
+        existing_id = self.db.execute(
+            select(WebsitePublication.id).where(
                 WebsitePublication.company_id == post.company_id,
                 WebsitePublication.post_id == post.id,
             )
         ).scalar_one_or_none()
-        if existing is not None:
+        if existing_id is not None:
             return {
-                "external_post_id": str(existing.id),
+                "external_post_id": str(existing_id),
                 "idempotent": True,
                 "channel_type": self.channel_type,
                 "platform": self.channel_type,
             }
 
-        slug = generate_unique_company_slug(self.db, company_id=post.company_id, title=post.title, post_id=post.id)
-        publication = WebsitePublication(
-            company_id=post.company_id,
-            project_id=post.project_id,
-            post_id=post.id,
-            slug=slug,
-            title=post.title,
-            content=post.content,
-            published_at=datetime.now(UTC),
-        )
-        self.db.add(publication)
-        self.db.flush()
+        publication_id, slug = create_website_publication(self.db, post=post, published_at=datetime.now(UTC))
         return {
-            "external_post_id": str(publication.id),
+            "external_post_id": str(publication_id),
             "slug": slug,
             "idempotent": False,
             "channel_type": self.channel_type,
@@ -9,7 +9,7 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from redis.exceptions import RedisError
 
-from app.core.config import settings
+from app.core.security import JWT_SECRET_KEY
 from app.infrastructure.cache.redis_client import get_redis_client
 
 STATE_TTL_SECONDS = 600
@@ -25,7 +25,7 @@ def _urlsafe_b64decode(value: str) -> bytes:
 
 
 def _sign_state(encoded_payload: str) -> str:
-    secret = settings.jwt_secret_key.encode("utf-8")
+    secret = JWT_SECRET_KEY.encode("utf-8")
     signature = hmac.new(secret, encoded_payload.encode("utf-8"), hashlib.sha256).digest()
     return _urlsafe_b64encode(signature)
 
@@ -9,6 +9,7 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.application.services.audit_service import log_audit_event
+from app.application.services.billing_service import invalidate_plan_cache
 from app.application.services.feature_flag_service import is_feature_enabled
 from app.core.security import create_access_token, create_refresh_token
 from app.domain.models.audit_log import AuditLog
@@ -148,6 +149,7 @@ def update_plan_stripe_mapping(
     plan.stripe_product_id = payload.stripe_product_id
     db.add(plan)
     db.commit()
+    invalidate_plan_cache(plan.id)
     return {
         "id": str(plan.id),
         "name": plan.name,
@@ -7,11 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.application.services.auth_service import AuthService
 from app.application.services.audit_service import log_audit_event
-from app.application.services.token_security_service import (
-    is_token_revoked,
-    prune_expired_revoked_tokens,
-    revoke_token,
-)
+from app.application.services.token_security_service import is_token_revoked, revoke_token
 from app.core.config import settings
 from app.core.security import create_access_token, create_refresh_token, decode_token
 from app.interfaces.api.deps import get_current_user, require_tenant_id
@@ -96,7 +92,6 @@ def refresh_tokens(
     if tenant_id != company_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Tenant mismatch")
 
-    prune_expired_revoked_tokens(db)
     if is_token_revoked(db, token=payload.refresh_token, claims=claims):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token revoked")
 
@@ -11,7 +11,6 @@ from app.application.services.audit_service import log_audit_event
 from app.application.services.billing_service import (
     bootstrap_company_billing,
     get_billing_status_payload,
-    seed_plan_stripe_mapping,
 )
 from app.application.services.feature_flag_service import is_feature_enabled
 from app.application.services.stripe_checkout_service import (
@@ -91,8 +90,6 @@ def _log_billing_event(
 
 @public_router.get("/plans", status_code=status.HTTP_200_OK)
 def list_public_plans(db: Session = Depends(get_db)) -> dict:
-    seed_plan_stripe_mapping(db)
-    db.commit()
     if not is_feature_enabled(db, key="beta_public_pricing", tenant_id=None):
         return {"items": [], "beta_disabled": True}
     plans = db.execute(select(SubscriptionPlan).order_by(SubscriptionPlan.monthly_price.asc())).scalars().all()
@@ -106,7 +103,6 @@ def list_plans(
     current_user: User = Depends(get_current_user),
 ) -> dict:
     bootstrap_company_billing(db, company_id=tenant_id)
-    seed_plan_stripe_mapping(db)
     db.commit()
     return list_public_plans(db)
 
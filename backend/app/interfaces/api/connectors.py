@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from app.application.services.audit_service import log_audit_event
 from app.application.services.connector_credentials_service import (
     get_connector_credential,
+    get_connector_credentials,
     mark_connector_credential_error,
     revoke_connector_credential,
     upsert_connector_credential,
@@ -81,11 +82,12 @@ def list_available_connectors(
     for discovered_platform in sorted(discovered):
         if discovered_platform not in platforms:
             platforms.append(discovered_platform)
+    credentials = get_connector_credentials(db, tenant_id=tenant_id, connector_types=platforms)
     items = []
     for platform in platforms:
         available = platform in discovered
         capabilities = get_adapter_capabilities(platform) if available else {}
-        credential = get_connector_credential(db, tenant_id=tenant_id, connector_type=platform)
+        credential = credentials.get(platform)
         last_status = db.execute(
             select(PublishEvent.status)
             .where(
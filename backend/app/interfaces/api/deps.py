@@ -6,7 +6,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
+from app.core.config import Settings, get_settings
 from app.core.security import decode_token
 from app.core.tenant import get_current_tenant
 from app.domain.models.user import User, UserRole
@@ -18,10 +18,11 @@ oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error
 def get_access_token_from_request(
     request: Request,
     bearer_token: str | None = Depends(oauth2_scheme_optional),
+    app_settings: Settings = Depends(get_settings),
 ) -> str:
     if bearer_token:
         return bearer_token
-    if settings.auth_use_httponly_cookies:
+    if app_settings.auth_use_httponly_cookies:
         cookie_token = request.cookies.get("access_token")
         if cookie_token:
             return cookie_token
@@ -75,7 +76,10 @@ def require_roles(*roles: UserRole):
     return _dependency
 
 
-def require_platform_admin(current_user: User = Depends(get_current_user)) -> User:
-    if current_user.email.lower() not in settings.platform_admin_email_list:
+def require_platform_admin(
+    current_user: User = Depends(get_current_user),
+    app_settings: Settings = Depends(get_settings),
+) -> User:
+    if current_user.email.lower() not in app_settings.platform_admin_email_list:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Platform admin access required")
     return current_user
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.application.services.social_account_service import upsert_social_account
 from app.core.config import settings
-from app.core.security import encrypt_secret
+from app.core.security import JWT_ALGORITHM, JWT_ALGORITHMS, JWT_SECRET_KEY, encrypt_secret
 from app.domain.models.channel import Channel, ChannelType
 from app.domain.models.linkedin_account import LinkedInAccount
 from app.domain.models.project import Project
@@ -37,12 +37,12 @@ def _create_state(*, company_id: UUID, project_id: UUID, user_id: UUID) -> str:
         "user_id": str(user_id),
         "exp": expires_at,
     }
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
 def decode_state(state: str) -> dict:
     try:
-        payload = jwt.decode(state, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = jwt.decode(state, JWT_SECRET_KEY, algorithms=JWT_ALGORITHMS)
     except jwt.PyJWTError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid OAuth state") from exc
 
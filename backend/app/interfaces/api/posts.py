@@ -12,6 +12,8 @@ from app.application.services.audit_service import log_audit_event
 from app.application.services.billing_service import enforce_billing_write_access, enforce_post_limit, increment_post_usage
 from app.application.services.feature_flag_service import is_feature_enabled
 from app.application.services.post_quality_service import (
+    QualityCheckMode,
+    QualityCheckResult,
     create_post_quality_report,
     evaluate_post_quality,
     extract_recommendations,
@@ -123,14 +125,15 @@ def _attach_quality_reports(db: Session, *, tenant_id: UUID, rows: list[Post]) -
         setattr(row, "_quality_report", latest_by_post.get(row.id))
 
 
-def _run_quality_check(
+def _evaluate_quality(
     db: Session,
     *,
     post: Post,
     tenant_id: UUID,
     brand_profile_id: UUID | None,
     recent_posts_window: int = 20,
-) -> PostQualityReport:
+    mode: QualityCheckMode = "full",
+) -> QualityCheckResult:
     profile = resolve_brand_profile(
         db,
         tenant_id=tenant_id,
@@ -138,7 +141,7 @@ def _run_quality_check(
         brand_profile_id=brand_profile_id,
     )
     recent_rows = db.execute(
-        select(Post)
+        select(Post.title, Post.content)
         .where(
             Post.company_id == tenant_id,
             Post.project_id == post.project_id,
@@ -146,12 +149,30 @@ def _run_quality_check(
         )
         .order_by(Post.created_at.desc())
         .limit(recent_posts_window)
-    ).scalars().all()
-    result = evaluate_post_quality(
+    ).all()
+    return evaluate_post_quality(
         title=post.title,
         body=post.content,
         brand_profile=profile,
         recent_posts=recent_rows,
+        mode=mode,
+    )
+
+
+def _run_quality_check(
+    db: Session,
+    *,
+    post: Post,
+    tenant_id: UUID,
+    brand_profile_id: UUID | None,
+    recent_posts_window: int = 20,
+) -> PostQualityReport:
+    result = _evaluate_quality(
+        db,
+        post=post,
+        tenant_id=tenant_id,
+        brand_profile_id=brand_profile_id,
+        recent_posts_window=recent_posts_window,
     )
     return create_post_quality_report(db, post=post, result=result)
 
@@ -164,9 +185,13 @@ def _enforce_quality_gate(db: Session, *, tenant_id: UUID, post: Post) -> None:
             status_code=status.HTTP_409_CONFLICT,
             detail="Post requires manual approval before publishing",
         )
-    report = get_latest_quality_report(db, tenant_id=tenant_id, post_id=post.id)
+    report: PostQualityReport | QualityCheckResult | None = get_latest_quality_report(
+        db, tenant_id=tenant_id, post_id=post.id
+    )
     if report is None:
-        report = _run_quality_check(db, post=post, tenant_id=tenant_id, brand_profile_id=None)
+        # A gate verdict stops at the first blocker, so it is not stored: the saved report must stay the
+        # full check that the post listing and quality endpoints show.
+        report = _evaluate_quality(db, post=post, tenant_id=tenant_id, brand_profile_id=None, mode="gate")
     has_block = any(str(item.get("severity")) == "block" for item in (report.issues or []))
     if report.risk_level == "high" or has_block:
         post.status = PostStatus.NEEDS_APPROVAL.value
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Header, Request, status
+from starlette.concurrency import run_in_threadpool
 
 from app.application.services.stripe_checkout_service import parse_stripe_webhook_payload, verify_stripe_signature
 from app.application.services.stripe_webhook_service import process_stripe_event_payload
@@ -8,12 +9,7 @@ from app.infrastructure.db.session import SessionLocal
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
-@router.post("/stripe", status_code=status.HTTP_200_OK)
-async def stripe_webhook(
-    request: Request,
-    stripe_signature: str | None = Header(default=None, alias="Stripe-Signature"),
-) -> dict:
-    payload_bytes = await request.body()
+def _handle_stripe_webhook(payload_bytes: bytes, stripe_signature: str | None) -> dict:
     verify_stripe_signature(payload_bytes=payload_bytes, signature_header=stripe_signature)
     payload = parse_stripe_webhook_payload(payload_bytes)
 
@@ -30,3 +26,13 @@ async def stripe_webhook(
         result = process_stripe_event_payload(db, payload)
         db.commit()
     return result
+
+
+@router.post("/stripe", status_code=status.HTTP_200_OK)
+async def stripe_webhook(
+    request: Request,
+    stripe_signature: str | None = Header(default=None, alias="Stripe-Signature"),
+) -> dict:
+    payload_bytes = await request.body()
+    # Verification, parsing and the sync session work would otherwise block the event loop.
+    return await run_in_threadpool(_handle_stripe_webhook, payload_bytes, stripe_signature)
@@ -1,6 +1,7 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -54,15 +55,17 @@ class MaintenanceModeRequest(BaseModel):
     enabled: bool
 
 
-@router.get("/system/health-score", status_code=status.HTTP_200_OK)
+# Health and incident payloads carry native datetimes; ORJSONResponse encodes them in C and skips
+# the per-row jsonable_encoder walk.
+@router.get("/system/health-score", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
 def get_system_health_score(
     db: Session = Depends(get_db),
     tenant_id: UUID = Depends(require_tenant_id),
     current_user: User = Depends(get_current_user),
-) -> dict:
+) -> ORJSONResponse:
     health = calculate_system_health_score(db)
     db.commit()
-    return {
+    return ORJSONResponse({
         "score": health.score,
         "components": health.components,
         "alerts": {
@@ -70,7 +73,7 @@ def get_system_health_score(
             "db_latency_exceeded": health.db_latency_ms > settings.system_db_latency_alert_ms,
             "worker_backlog_exceeded": health.worker_backlog_size > settings.system_worker_backlog_alert_threshold,
         },
-    }
+    })
 
 
 @router.get("/tenants/{tenant_id}/risk-score", status_code=status.HTTP_200_OK)
@@ -116,11 +119,11 @@ def track_dashboard_load(
     return {"accepted": True}
 
 
-@router.get("/admin/system/overview", status_code=status.HTTP_200_OK)
+@router.get("/admin/system/overview", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
 def admin_system_overview(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_platform_admin),
-) -> dict:
+) -> ORJSONResponse:
     health = calculate_system_health_score(db)
     top_risk = db.execute(
         select(TenantRiskScore).order_by(TenantRiskScore.risk_score.desc()).limit(10)
@@ -128,7 +131,7 @@ def admin_system_overview(
     incidents = get_active_incidents(db, limit=100)
     revenue = calculate_revenue_overview(db)
     db.commit()
-    return {
+    return ORJSONResponse({
         "system_health_score": health.score,
         "components": health.components,
         "worker_queue_depth": health.worker_backlog_size,
@@ -142,20 +145,20 @@ def admin_system_overview(
         ],
         "revenue": revenue["summary"],
         "active_incidents": incidents,
-    }
+    })
 
 
-@router.get("/admin/incidents", status_code=status.HTTP_200_OK)
+@router.get("/admin/incidents", status_code=status.HTTP_200_OK, response_class=ORJSONResponse)
 def admin_incidents(
     status_filter: str = Query(default="open", alias="status"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_platform_admin),
-) -> dict:
+) -> ORJSONResponse:
     query = select(PlatformIncident).order_by(PlatformIncident.created_at.desc())
     if status_filter:
         query = query.where(PlatformIncident.status == status_filter)
     rows = db.execute(query.limit(200)).scalars().all()
-    return {
+    return ORJSONResponse({
         "items": [
             {
                 "id": str(item.id),
@@ -165,12 +168,12 @@ def admin_incidents(
                 "status": item.status,
                 "message": item.message,
                 "metadata_json": item.metadata_json or {},
-                "created_at": item.created_at.isoformat(),
-                "resolved_at": item.resolved_at.isoformat() if item.resolved_at else None,
+                "created_at": item.created_at,
+                "resolved_at": item.resolved_at,
             }
             for item in rows
         ]
-    }
+    })
 
 
 @router.post("/admin/incidents/{incident_id}/resolve", status_code=status.HTTP_200_OK)
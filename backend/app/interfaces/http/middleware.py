@@ -6,6 +6,7 @@ from uuid import UUID, uuid4
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.tenant import reset_current_tenant, set_current_tenant
 from app.infrastructure.db.session import SessionLocal
@@ -17,7 +18,11 @@ from app.infrastructure.logging.context import (
     set_tenant_id,
 )
 from app.infrastructure.observability.metrics import measure_redis, record_request
-from app.application.services.feature_flag_service import is_feature_enabled
+from app.application.services.feature_flag_service import (
+    begin_feature_flag_request_cache,
+    is_feature_enabled,
+    reset_feature_flag_request_cache,
+)
 from app.application.services.platform_ops_service import (
     append_perf_sample,
     is_global_publish_paused,
@@ -97,6 +102,23 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             reset_request_id(request_token)
 
 
+class FeatureFlagRequestCacheMiddleware:
+    # Plain ASGI: the cache only needs a ContextVar scoped around the downstream app, so there is no reason
+    # to pay BaseHTTPMiddleware's extra task and response streaming on every request.
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cache_token = begin_feature_flag_request_cache()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_feature_flag_request_cache(cache_token)
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         response = await call_next(request)
@@ -1,17 +1,22 @@
 import logging
 import logging.config
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 
+from app.application.services.billing_service import seed_plan_stripe_mapping
 from app.core.config import settings
 from app.domain import models  # noqa: F401
+from app.infrastructure.db.session import SessionLocal
 from app.interfaces.api.router import api_router
 from app.interfaces.http.middleware import (
+    FeatureFlagRequestCacheMiddleware,
     MetricsMiddleware,
     PlanEnforcementMiddleware,
     PlatformGuardrailsMiddleware,
@@ -29,7 +34,22 @@ else:
 
 logger = logging.getLogger("app")
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Plan price ids only change on deploy (env) or through the admin mapping, so they are mapped once at
+    # startup instead of from request handlers. A database that is not migrated yet must not block boot;
+    # newly created plans are still mapped by bootstrap_company_billing.
+    try:
+        with SessionLocal() as db:
+            seed_plan_stripe_mapping(db)
+            db.commit()
+    except SQLAlchemyError:
+        logger.exception("plan_stripe_mapping_seed_failed")
+    yield
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_allowed_origins,
@@ -41,6 +61,7 @@ app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(TenantContextMiddleware)
 app.add_middleware(PlatformGuardrailsMiddleware)
 app.add_middleware(PlanEnforcementMiddleware)
+app.add_middleware(FeatureFlagRequestCacheMiddleware)
 app.add_middleware(TenantRateLimitMiddleware, requests_per_minute=settings.tenant_rate_limit_per_minute)
 app.add_middleware(RequestIDMiddleware)
 app.add_middleware(MetricsMiddleware)
@@ -1,6 +1,8 @@
+import random
+import re
 from uuid import uuid4
 
-from app.application.services.post_quality_service import evaluate_post_quality
+from app.application.services.post_quality_service import PII_EMAIL_RE, _matched_terms, evaluate_post_quality
 from app.domain.models.brand_profile import BrandProfile
 from app.domain.models.post import Post
 
@@ -69,3 +71,52 @@ def test_safe_text_returns_low_risk() -> None:
     )
     assert result.risk_level in {"low", "medium"}
     assert result.score >= 70
+
+
+def _reference_matches(normalized: str, *term_lists: list[str]) -> list[list[str]]:
+    return [[term for term in terms if term.lower() in normalized] for terms in term_lists]
+
+
+def test_term_matching_reports_overlapping_and_prefix_terms() -> None:
+    claims = ["Free Trial", "trial period", "guaranteed", "guaranteed roi"]
+    words = ["period", "roi"]
+
+    normalized = "start your free trial period today with guaranteed roi"
+    assert _matched_terms(normalized, claims, words) == [claims, words]
+
+    # Only the shorter prefix term is present.
+    assert _matched_terms("guaranteed results", claims, words) == [["guaranteed"], []]
+
+
+def test_term_matching_keeps_claims_and_words_that_share_text_apart() -> None:
+    claims = ["best price"]
+    words = ["price", "best"]
+
+    assert _matched_terms("the best price in town", claims, words) == [["best price"], ["price", "best"]]
+    assert _matched_terms("price match", claims, words) == [[], ["price"]]
+    assert _matched_terms("nothing to see", claims, words) == [[], []]
+
+
+def test_term_matching_agrees_with_per_term_search() -> None:
+    rng = random.Random(7)
+    for _ in range(500):
+        claims = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(0, 4))]
+        words = ["".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(0, 4))]
+        normalized = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 24)))
+        assert _matched_terms(normalized, claims, words) == _reference_matches(normalized, claims, words)
+
+
+def test_email_detection_handles_long_runs_before_a_non_matching_at() -> None:
+    # Without the lookbehind this rescans the run from every offset; it must stay a linear scan.
+    long_run = "a" * 50_000
+    assert PII_EMAIL_RE.search(f"{long_run}@nodomain") is None
+    assert PII_EMAIL_RE.search(f"{long_run} write to john.doe@example.com") is not None
+    assert PII_EMAIL_RE.search(f"{long_run}@example.com") is not None
+
+
+def test_email_detection_agrees_with_the_unanchored_pattern() -> None:
+    unanchored = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+    rng = random.Random(11)
+    for _ in range(2000):
+        text = "".join(rng.choice("ab.+@ -c1") for _ in range(rng.randint(0, 20)))
+        assert (PII_EMAIL_RE.search(text) is None) == (unanchored.search(text) is None)
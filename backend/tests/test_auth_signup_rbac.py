@@ -1,11 +1,20 @@
 import os
 import uuid
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 
+from app.application.services import token_security_service
+from app.application.services.token_security_service import (
+    is_token_revoked,
+    prune_expired_revoked_tokens,
+    revoke_token,
+)
+from app.core.security import decode_token, get_token_identifier, hash_password, verify_password
+from app.domain.models.revoked_token import RevokedToken
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.session import get_db
 from main import app
@@ -136,3 +145,85 @@ def test_rbac_project_requires_owner_or_admin(client: TestClient):
     body = create_project_response.json()
     assert body["name"] == "Project Alpha"
     assert body["company_id"] == company_id
+
+
+def test_refresh_replay_is_rejected_and_only_committed_revocations_are_cached(client: TestClient, db_session):
+    signup_response = client.post(
+        "/signup",
+        json={
+            "company_name": "Replay Tenant",
+            "owner_email": "owner@replay.test",
+            "owner_password": "secret123",
+        },
+    )
+    assert signup_response.status_code == 201
+    company_id = signup_response.json()["company"]["id"]
+    login_response = client.post(
+        "/auth/login",
+        headers={"X-Tenant-ID": company_id},
+        json={"email": "owner@replay.test", "password": "secret123"},
+    )
+    refresh_token = login_response.json()["refresh_token"]
+
+    first_refresh = client.post(
+        "/auth/refresh",
+        headers={"X-Tenant-ID": company_id},
+        json={"refresh_token": refresh_token},
+    )
+    assert first_refresh.status_code == 200
+    token_id = get_token_identifier(refresh_token, decode_token(refresh_token))
+    # Revoking does not fill the cache; only a committed row read back by the replay check does.
+    assert token_id not in token_security_service._REVOKED_CACHE
+
+    replay = client.post(
+        "/auth/refresh",
+        headers={"X-Tenant-ID": company_id},
+        json={"refresh_token": refresh_token},
+    )
+    assert replay.status_code == 401
+    assert token_id in token_security_service._REVOKED_CACHE
+
+    # A revocation rolled back with its request leaves the token valid in this worker too.
+    rotated_token = first_refresh.json()["refresh_token"]
+    rotated_claims = decode_token(rotated_token)
+    revoke_token(
+        db_session,
+        token=rotated_token,
+        expires_at=datetime.fromtimestamp(rotated_claims["exp"], tz=timezone.utc),
+        claims=rotated_claims,
+    )
+    db_session.rollback()
+    assert is_token_revoked(db_session, token=rotated_token, claims=rotated_claims) is False
+
+
+def test_prune_deletes_expired_revocations_in_committed_chunks(db_session, monkeypatch):
+    now = datetime.now(timezone.utc)
+    expired_ids = [f"expired-prune-{index}" for index in range(5)]
+    db_session.add_all(RevokedToken(token_id=token_id, expires_at=now - timedelta(hours=1)) for token_id in expired_ids)
+    db_session.add(RevokedToken(token_id="live-prune", expires_at=now + timedelta(hours=1)))
+    db_session.commit()
+
+    monkeypatch.setattr(token_security_service, "_PRUNE_CHUNK_SIZE", 2)
+    assert prune_expired_revoked_tokens(db_session) >= len(expired_ids)
+    # Every chunk is committed as it goes, so nothing is left for a rollback to undo.
+    db_session.rollback()
+
+    remaining = set(
+        db_session.execute(
+            select(RevokedToken.token_id).where(RevokedToken.token_id.in_([*expired_ids, "live-prune"]))
+        ).scalars()
+    )
+    assert remaining == {"live-prune"}
+
+
+# Produced by the previous passlib CryptContext(schemes=["bcrypt"]) for "legacy-secret123".
+PASSLIB_BCRYPT_HASH = "$2b$12$cXmE6jGIa..88gX9O0CwVuDc/EI1rT5lldkQHz0F2NDQVUeQl1JZ."
+
+
+def test_bcrypt_hashing_stays_compatible_with_passlib_hashes():
+    assert verify_password("legacy-secret123", PASSLIB_BCRYPT_HASH)
+    assert not verify_password("legacy-secret124", PASSLIB_BCRYPT_HASH)
+
+    hashed = hash_password("legacy-secret123")
+    assert hashed.startswith("$2b$12$")
+    assert verify_password("legacy-secret123", hashed)
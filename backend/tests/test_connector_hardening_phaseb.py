@@ -1,10 +1,20 @@
 import os
+from datetime import UTC, datetime
+from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, func, select, text
 from sqlalchemy.orm import sessionmaker
 
+from app.application.services.connector_credentials_service import (
+    get_connector_credentials,
+    upsert_connector_credential,
+)
+from app.application.services.social_account_service import update_social_account_tokens, upsert_social_account
+from app.core.config import settings
+from app.core.security import decrypt_secret
+from app.domain.models.connector_credential import ConnectorCredential
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.session import get_db
 from main import app
@@ -104,3 +114,105 @@ def test_connector_hardening_endpoints(client: TestClient):
     disconnect = client.post(f"/connectors/{channel_id}/disconnect", headers=headers)
     assert disconnect.status_code == 200
     assert disconnect.json()["updated"] is True
+
+
+def _signup_tenant(client: TestClient, *, company_name: str, email: str) -> UUID:
+    signup = client.post(
+        "/signup",
+        json={"company_name": company_name, "owner_email": email, "owner_password": "secret1234"},
+    )
+    assert signup.status_code == 201
+    return UUID(signup.json()["company"]["id"])
+
+
+def test_batch_credential_lookup_reads_coalesced_upserts(client: TestClient, db_session):
+    tenant_id = _signup_tenant(client, company_name="Credential Batch", email="owner@credential-batch.test")
+
+    upsert_connector_credential(
+        db_session,
+        tenant_id=tenant_id,
+        connector_type="LinkedIn",
+        access_token="li-access",
+        refresh_token="li-refresh",
+        expires_at=datetime(2030, 1, 1, tzinfo=UTC),
+        scopes=["w_member_social"],
+    )
+    upsert_connector_credential(
+        db_session,
+        tenant_id=tenant_id,
+        connector_type="meta",
+        access_token="meta-access",
+        refresh_token=None,
+        expires_at=None,
+    )
+    # A refresh without new tokens or scopes keeps what is already stored.
+    upsert_connector_credential(
+        db_session,
+        tenant_id=tenant_id,
+        connector_type="linkedin",
+        access_token=None,
+        refresh_token=None,
+        expires_at=None,
+        status="error",
+        last_error="rate limited",
+    )
+    db_session.commit()
+
+    credentials = get_connector_credentials(
+        db_session,
+        tenant_id=tenant_id,
+        connector_types=[" LINKEDIN ", "meta", "linkedin", "tiktok"],
+    )
+    assert set(credentials) == {"linkedin", "meta"}
+    linkedin = credentials["linkedin"]
+    assert decrypt_secret(linkedin.encrypted_access_token) == "li-access"
+    assert decrypt_secret(linkedin.encrypted_refresh_token) == "li-refresh"
+    assert linkedin.expires_at == datetime(2030, 1, 1, tzinfo=UTC)
+    assert linkedin.scopes == ["w_member_social"]
+    assert (linkedin.status, linkedin.last_error) == ("error", "rate limited")
+    assert decrypt_secret(credentials["meta"].encrypted_access_token) == "meta-access"
+    assert get_connector_credentials(db_session, tenant_id=tenant_id, connector_types=[]) == {}
+
+    count = db_session.execute(
+        select(func.count()).select_from(ConnectorCredential).where(ConnectorCredential.tenant_id == tenant_id)
+    ).scalar_one()
+    assert count == 2
+
+
+def test_token_from_rotated_key_is_reencrypted_once(client: TestClient, db_session, monkeypatch):
+    tenant_id = _signup_tenant(client, company_name="Rotated Key", email="owner@rotated-key.test")
+
+    monkeypatch.setattr(settings, "token_encryption_key", "old-token-encryption-key")
+    account = upsert_social_account(
+        db_session,
+        company_id=tenant_id,
+        platform="linkedin",
+        external_account_id="urn:li:person:rotated",
+        access_token="rotated-access",
+        refresh_token="rotated-refresh",
+    )
+    db_session.commit()
+    old_ciphertext = account.access_token
+
+    monkeypatch.setattr(settings, "token_encryption_key", "new-token-encryption-key")
+    with pytest.raises(ValueError):
+        decrypt_secret(old_ciphertext)
+
+    # The old ciphertext no longer decrypts, so the unchanged token is re-encrypted under the new key...
+    update_social_account_tokens(
+        db_session, account=account, access_token="rotated-access", refresh_token="rotated-refresh"
+    )
+    db_session.commit()
+    reencrypted = account.access_token
+    assert reencrypted != old_ciphertext
+    assert decrypt_secret(reencrypted) == "rotated-access"
+    assert decrypt_secret(account.refresh_token) == "rotated-refresh"
+
+    # ...and only once: a later refresh with the same token keeps the stored ciphertext.
+    update_social_account_tokens(
+        db_session, account=account, access_token="rotated-access", refresh_token="rotated-refresh"
+    )
+    assert account.access_token == reencrypted
+    db_session.commit()
+    db_session.refresh(account)
+    assert decrypt_secret(account.access_token) == "rotated-access"
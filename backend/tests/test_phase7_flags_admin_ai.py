@@ -3,10 +3,18 @@ from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 
+from app.application.services import feature_flag_service
+from app.application.services.feature_flag_service import (
+    FEATURE_FLAG_VERSION_KEY,
+    invalidate_feature_flags_cache,
+    is_feature_enabled,
+)
 from app.core.config import settings
+from app.domain.models.feature_flag import FeatureFlag
+from app.infrastructure.cache.redis_client import get_redis_client
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.session import get_db
 from main import app
@@ -135,3 +143,33 @@ def test_admin_endpoints_require_platform_admin_and_flag(client: TestClient):
         assert isinstance(access_response.json()["items"], list)
     finally:
         settings.platform_admin_emails = previous_admin_emails
+
+
+def test_flag_snapshot_follows_shared_version_stamp(client: TestClient, db_session, monkeypatch):
+    tenant_id, token = _signup(client, "Snapshot Tenant", "snapshot-owner@test.local")
+    headers = {"Authorization": f"Bearer {token}", "X-Tenant-ID": tenant_id}
+    assert client.get("/feature-flags", headers=headers).status_code == 200
+
+    flag = db_session.execute(select(FeatureFlag).where(FeatureFlag.key == "beta_admin_panel")).scalar_one()
+    flag.enabled_globally = False
+    flag.enabled_per_tenant = {}
+    db_session.commit()
+    invalidate_feature_flags_cache()
+    assert is_feature_enabled(db_session, key="beta_admin_panel", tenant_id=UUID(tenant_id)) is False
+
+    # Another process flips the flag: it only touches shared state (DB row, Redis stamp and maps), never
+    # this process's in-memory snapshot.
+    flag.enabled_globally = True
+    db_session.commit()
+    redis = get_redis_client()
+    redis.incr(FEATURE_FLAG_VERSION_KEY)
+    stale_keys = [*redis.keys("feature_flags:*"), *redis.keys("feature_flags_map:*")]
+    if stale_keys:
+        redis.delete(*stale_keys)
+
+    # Inside the TTL window the snapshot answers from memory without looking at the stamp...
+    assert is_feature_enabled(db_session, key="beta_admin_panel", tenant_id=UUID(tenant_id)) is False
+
+    # ...and once the window lapses the moved stamp forces a rebuild.
+    monkeypatch.setattr(feature_flag_service, "_GLOBAL_FLAG_SNAPSHOT_EXPIRES_AT", 0.0)
+    assert is_feature_enabled(db_session, key="beta_admin_panel", tenant_id=UUID(tenant_id)) is True
@@ -1,12 +1,26 @@
 import os
+from datetime import datetime
 from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, func, select, text
 from sqlalchemy.orm import sessionmaker
 
+from app.application.services.platform_ops_service import (
+    HEALTH_SCORE_CACHE_KEY,
+    HEALTH_SCORE_LOCK_KEY,
+    HEALTH_SCORE_LOCK_TTL_SECONDS,
+    HEALTH_SCORE_STALE_KEY,
+    append_perf_sample,
+    calculate_revenue_metrics,
+    calculate_system_health_score,
+    calculate_tenant_risk_scores,
+)
 from app.core.config import settings
+from app.domain.models.revenue_metric import RevenueMetric
+from app.domain.models.tenant_risk_score import TenantRiskScore
+from app.infrastructure.cache.redis_client import get_redis_client
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.session import get_db
 from main import app
@@ -136,3 +150,67 @@ def test_admin_overview_and_global_breaker(client: TestClient):
         assert disable_breaker.status_code == 200
     finally:
         settings.platform_admin_emails = previous_admin_emails
+
+
+def test_request_latency_rolling_mean_rebuilds_after_samples_are_lost(db_session):
+    redis = get_redis_client()
+    samples_key = "platform:perf:request_latency_ms"
+    avg_key = "platform:perf:request_latency_ms:avg"
+    redis.delete(samples_key, f"{samples_key}:sum", avg_key)
+
+    for value in (10.0, 20.0, 30.0):
+        append_perf_sample("request_latency_ms", value, max_samples=2)
+    assert redis.llen(samples_key) == 2
+    assert float(redis.get(avg_key)) == pytest.approx(25.0)
+    assert redis.ttl(samples_key) > 0
+    assert redis.ttl(f"{samples_key}:sum") > 0
+
+    # Losing the samples list (eviction, flush) must not leave the old running sum behind.
+    redis.delete(samples_key)
+    append_perf_sample("request_latency_ms", 40.0, max_samples=2)
+    assert float(redis.get(avg_key)) == pytest.approx(40.0)
+
+
+def test_health_score_cache_types_and_stale_copy_under_lock(db_session):
+    redis = get_redis_client()
+    redis.delete(HEALTH_SCORE_CACHE_KEY, HEALTH_SCORE_STALE_KEY, HEALTH_SCORE_LOCK_KEY)
+
+    fresh = calculate_system_health_score(db_session)
+    db_session.commit()
+    assert all(isinstance(component["updated_at"], datetime) for component in fresh.components)
+
+    cached = calculate_system_health_score(db_session)
+    assert cached == fresh
+
+    # Another worker holds the evaluation lock and the fresh copy has expired: the stale copy is served
+    # instead of waiting for that worker.
+    redis.delete(HEALTH_SCORE_CACHE_KEY)
+    redis.set(HEALTH_SCORE_LOCK_KEY, "1", ex=HEALTH_SCORE_LOCK_TTL_SECONDS)
+    try:
+        assert calculate_system_health_score(db_session) == fresh
+    finally:
+        redis.delete(HEALTH_SCORE_LOCK_KEY)
+
+
+def test_batched_risk_and_revenue_scoring_upserts_one_row_per_tenant(client: TestClient, db_session):
+    first_id, _ = _signup_and_login(client, company_name="Risk Batch A", email="risk-batch-a@test.local")
+    second_id, _ = _signup_and_login(client, company_name="Risk Batch B", email="risk-batch-b@test.local")
+    company_ids = [UUID(first_id), UUID(second_id)]
+
+    for _ in range(2):
+        scores = calculate_tenant_risk_scores(db_session, company_ids=company_ids)
+        revenue = [calculate_revenue_metrics(db_session, company_id=company_id) for company_id in company_ids]
+        db_session.commit()
+    assert set(scores) == set(company_ids)
+    assert {item["company_id"] for item in revenue} == {first_id, second_id}
+
+    # Re-scoring updates the existing per-company rows in place instead of inserting duplicates.
+    for model in (TenantRiskScore, RevenueMetric):
+        counts = dict(
+            db_session.execute(
+                select(model.company_id, func.count())
+                .where(model.company_id.in_(company_ids))
+                .group_by(model.company_id)
+            ).all()
+        )
+        assert counts == {company_id: 1 for company_id in company_ids}
@@ -1,17 +1,25 @@
 import hmac
 import hashlib
 from datetime import UTC, datetime
+from urllib.parse import parse_qs
 from uuid import uuid4
 import os
 
+import httpx
 import pytest
 from fastapi import HTTPException
 from sqlalchemy import create_engine, select, text
 from sqlalchemy.orm import sessionmaker
 
-from app.application.services.stripe_checkout_service import verify_stripe_signature
+from app.application.services import stripe_checkout_service
+from app.application.services.stripe_checkout_service import (
+    STRIPE_API_BASE,
+    change_subscription_plan,
+    verify_stripe_signature,
+)
 from app.application.services.stripe_webhook_service import process_stripe_event_payload
 from app.core.config import settings
+from app.domain.models.billing_event import BillingEvent
 from app.domain.models.company import Company
 from app.domain.models.company_subscription import CompanySubscription
 from app.domain.models.stripe_event import StripeEvent
@@ -108,3 +116,190 @@ def test_process_stripe_event_idempotent(db):
 
     events = db.execute(select(StripeEvent).where(StripeEvent.stripe_event_id == "evt_test_checkout_completed")).scalars().all()
     assert len(events) == 1
+
+
+def _subscription_for_plan_change(db, *, item_id: str | None):
+    company = Company(id=uuid4(), name="Plan Change Co", slug=f"plan-change-{uuid4().hex[:8]}")
+    plan = SubscriptionPlan(
+        id=uuid4(),
+        name=f"Pro {uuid4().hex[:8]}",
+        monthly_price=49,
+        max_projects=5,
+        max_posts_per_month=1000,
+        max_connectors=5,
+        stripe_price_id="price_pro_test",
+    )
+    db.add(company)
+    db.add(plan)
+    db.flush()
+    subscription = CompanySubscription(
+        company_id=company.id,
+        plan_id=plan.id,
+        status="active",
+        stripe_subscription_id=f"sub_{uuid4().hex[:12]}",
+        stripe_subscription_item_id=item_id,
+    )
+    db.add(subscription)
+    db.commit()
+    return company, plan, subscription
+
+
+def _mock_stripe(monkeypatch, responses: list[httpx.Response]) -> list[httpx.Request]:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0)
+
+    client = httpx.Client(base_url=STRIPE_API_BASE, transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(settings, "stripe_api_key", "sk_test_plan_change")
+    monkeypatch.setattr(stripe_checkout_service, "_client", lambda: client)
+    return requests
+
+
+def _posted_item_id(request: httpx.Request) -> str:
+    return parse_qs(request.content.decode("utf-8"))["items[0][id]"][0]
+
+
+def test_plan_change_uses_the_stored_subscription_item_id(db, monkeypatch):
+    company, plan, subscription = _subscription_for_plan_change(db, item_id="si_stored")
+    requests = _mock_stripe(monkeypatch, [httpx.Response(200, json={"id": subscription.stripe_subscription_id})])
+
+    result = change_subscription_plan(db, company_id=company.id, plan_id=plan.id)
+
+    assert result["updated"] is True
+    assert [request.method for request in requests] == ["POST"]
+    assert _posted_item_id(requests[0]) == "si_stored"
+    assert subscription.stripe_subscription_item_id == "si_stored"
+
+
+def test_plan_change_refetches_a_stale_subscription_item_id(db, monkeypatch):
+    company, plan, subscription = _subscription_for_plan_change(db, item_id="si_stale")
+    requests = _mock_stripe(
+        monkeypatch,
+        [
+            httpx.Response(
+                400,
+                json={"error": {"code": "resource_missing", "param": "items[0][id]", "message": "No such subscription item"}},
+            ),
+            httpx.Response(200, json={"id": subscription.stripe_subscription_id, "items": {"data": [{"id": "si_fresh"}]}}),
+            httpx.Response(200, json={"id": subscription.stripe_subscription_id}),
+        ],
+    )
+
+    change_subscription_plan(db, company_id=company.id, plan_id=plan.id)
+
+    assert [request.method for request in requests] == ["POST", "GET", "POST"]
+    assert _posted_item_id(requests[0]) == "si_stale"
+    assert _posted_item_id(requests[2]) == "si_fresh"
+    assert subscription.stripe_subscription_item_id == "si_fresh"
+
+
+def test_plan_change_does_not_refetch_on_other_stripe_errors(db, monkeypatch):
+    company, plan, subscription = _subscription_for_plan_change(db, item_id="si_stored")
+    requests = _mock_stripe(
+        monkeypatch,
+        [
+            httpx.Response(
+                400,
+                json={"error": {"code": "resource_missing", "param": "items[0][price]", "message": "No such price"}},
+            )
+        ],
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        change_subscription_plan(db, company_id=company.id, plan_id=plan.id)
+
+    assert exc_info.value.status_code == 502
+    assert [request.method for request in requests] == ["POST"]
+    assert subscription.stripe_subscription_item_id == "si_stored"
+
+
+def _subscription_with_stripe_id(db, *, status: str = "active") -> CompanySubscription:
+    company = Company(id=uuid4(), name="Webhook Co", slug=f"webhook-co-{uuid4().hex[:8]}")
+    plan = SubscriptionPlan(
+        id=uuid4(),
+        name=f"Webhook {uuid4().hex[:8]}",
+        monthly_price=0,
+        max_projects=1,
+        max_posts_per_month=100,
+        max_connectors=2,
+    )
+    db.add(company)
+    db.add(plan)
+    db.flush()
+    subscription = CompanySubscription(
+        company_id=company.id,
+        plan_id=plan.id,
+        status=status,
+        stripe_subscription_id=f"sub_{uuid4().hex[:12]}",
+    )
+    db.add(subscription)
+    db.commit()
+    return subscription
+
+
+def _invoice_event(event_type: str, *, stripe_subscription_id: str, invoice_status: str) -> dict:
+    return {
+        "id": f"evt_{uuid4().hex[:12]}",
+        "type": event_type,
+        "data": {"object": {"id": f"in_{uuid4().hex[:12]}", "subscription": stripe_subscription_id, "status": invoice_status}},
+    }
+
+
+def test_webhook_applies_a_new_event_to_the_joined_subscription(db):
+    subscription = _subscription_with_stripe_id(db, status="past_due")
+    payload = _invoice_event("invoice.paid", stripe_subscription_id=subscription.stripe_subscription_id, invoice_status="paid")
+
+    result = process_stripe_event_payload(db, payload)
+    db.commit()
+
+    assert result["processed"] is True
+    db.refresh(subscription)
+    assert subscription.status == "active"
+    assert subscription.last_invoice_status == "paid"
+    billing_events = db.execute(
+        select(BillingEvent).where(BillingEvent.company_id == subscription.company_id, BillingEvent.event_type == "invoice.paid")
+    ).scalars().all()
+    assert len(billing_events) == 1
+
+
+def test_webhook_skips_an_already_processed_event(db):
+    subscription = _subscription_with_stripe_id(db)
+    payload = _invoice_event(
+        "invoice.payment_failed",
+        stripe_subscription_id=subscription.stripe_subscription_id,
+        invoice_status="open",
+    )
+    assert process_stripe_event_payload(db, payload)["processed"] is True
+    db.commit()
+
+    subscription.status = "active"
+    subscription.last_payment_error = None
+    db.commit()
+
+    replay = process_stripe_event_payload(db, payload)
+    db.commit()
+
+    assert replay["deduplicated"] is True
+    db.refresh(subscription)
+    assert subscription.status == "active"
+    assert subscription.last_payment_error is None
+
+
+def test_webhook_for_an_unknown_subscription_is_recorded_without_changes(db):
+    payload = _invoice_event("invoice.payment_failed", stripe_subscription_id="sub_unknown_webhook", invoice_status="open")
+    unhandled = {"id": f"evt_{uuid4().hex[:12]}", "type": "charge.refunded", "data": {"object": {"id": "ch_unhandled"}}}
+
+    assert process_stripe_event_payload(db, payload)["processed"] is True
+    assert process_stripe_event_payload(db, unhandled)["processed"] is True
+    db.commit()
+
+    events = db.execute(
+        select(StripeEvent.status).where(StripeEvent.stripe_event_id.in_([payload["id"], unhandled["id"]]))
+    ).scalars().all()
+    assert events == ["processed", "processed"]
+    billing_events = db.execute(
+        select(BillingEvent).where(BillingEvent.metadata_json["stripe_event_id"].astext == payload["id"])
+    ).scalars().all()
+    assert billing_events == []
@@ -1,10 +1,17 @@
 import os
+from decimal import Decimal
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, select, text, update
 from sqlalchemy.orm import sessionmaker
 
+from app.application.services.billing_service import (
+    get_cached_plan,
+    invalidate_plan_cache,
+    seed_plan_stripe_mapping,
+)
+from app.domain.models.subscription_plan import SubscriptionPlan
 from app.infrastructure.db.base import Base
 from app.infrastructure.db.session import get_db
 from main import app
@@ -125,3 +132,34 @@ def test_create_post_from_template_and_billing_history(client: TestClient):
     assert history.status_code == 200
     items = history.json()["items"]
     assert len(items) >= 2
+
+
+def test_plan_cache_invalidation_and_mapping_seed(db_session):
+    plan = SubscriptionPlan(
+        name="Cache Test Plan",
+        monthly_price=Decimal("49.00"),
+        max_projects=3,
+        max_posts_per_month=300,
+        max_connectors=4,
+    )
+    db_session.add(plan)
+    db_session.commit()
+
+    assert get_cached_plan(db_session, plan.id).max_posts_per_month == 300
+    db_session.execute(
+        update(SubscriptionPlan).where(SubscriptionPlan.id == plan.id).values(max_posts_per_month=500)
+    )
+    db_session.commit()
+    # Served from the process cache until the plan is invalidated.
+    assert get_cached_plan(db_session, plan.id).max_posts_per_month == 300
+    invalidate_plan_cache(plan.id)
+    assert get_cached_plan(db_session, plan.id).max_posts_per_month == 500
+
+    # The seed invalidates cached snapshots when it maps a plan, so the new price id is served at once.
+    seed_plan_stripe_mapping(db_session)
+    db_session.commit()
+    assert get_cached_plan(db_session, plan.id).stripe_price_id == "price_dev_cache_test_plan"
+    stripe_price_id = db_session.execute(
+        select(SubscriptionPlan.stripe_price_id).where(SubscriptionPlan.id == plan.id)
+    ).scalar_one()
+    assert stripe_price_id == "price_dev_cache_test_plan"
@@ -56,6 +56,11 @@ celery_app.conf.update(
             "schedule": schedule(86400.0),
             "options": {"queue": "scheduler"},
         },
+        "auth-prune-revoked-tokens-every-600s": {
+            "task": "workers.tasks.prune_revoked_tokens",
+            "schedule": schedule(600.0),
+            "options": {"queue": "scheduler"},
+        },
         "platform-health-intelligence-every-60s": {
             "task": "workers.tasks.platform_health_intelligence",
             "schedule": schedule(60.0),
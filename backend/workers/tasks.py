@@ -8,7 +8,11 @@ from uuid import UUID, uuid4
 from celery.exceptions import MaxRetriesExceededError
 from sqlalchemy import func, select
 
-from app.application.services.publishing_service import emit_publish_event, get_active_channels, publish_post_async
+from app.application.services.publishing_service import (
+    emit_publish_event,
+    get_active_channels,
+    publish_posts_async,
+)
 from app.application.services.automation_service import (
     dispatch_due_time_rules,
     dispatch_event_triggered_rules,
@@ -22,17 +26,18 @@ from app.application.services.platform_ops_service import (
     append_perf_sample,
     calculate_revenue_overview,
     calculate_system_health_score,
-    calculate_tenant_risk_score,
+    calculate_tenant_risk_scores,
     collect_and_store_performance_baselines,
     create_incident,
     evaluate_platform_guardrails,
     execute_auto_recovery,
+    record_publish_outcomes,
 )
 from app.application.services.connector_credentials_service import (
     mark_connector_credential_error,
 )
 from app.application.services.connector_ops_service import (
-    calculate_connector_health,
+    calculate_connector_healths,
     get_connector_backoff_ttl,
     get_connector_cooldown_ttl,
     get_connector_sandbox_mode,
@@ -41,6 +46,7 @@ from app.application.services.connector_ops_service import (
     set_connector_cooldown,
 )
 from app.application.services.provider_error_mapper import map_provider_error
+from app.application.services.token_security_service import prune_expired_revoked_tokens
 from app.domain.models.automation_run import AutomationRun, AutomationRunStatus
 from app.domain.models.channel import Channel
 from app.domain.models.channel_publication import ChannelPublication
@@ -636,6 +642,14 @@ def reset_monthly_post_usage() -> dict:
     return {"affected_companies": affected}
 
 
+@celery_app.task(name="workers.tasks.prune_revoked_tokens")
+def prune_revoked_tokens() -> dict:
+    with SessionLocal() as db:
+        deleted = prune_expired_revoked_tokens(db)
+    logger.info("revoked_token_prune completed deleted=%s", deleted)
+    return {"deleted": deleted}
+
+
 @celery_app.task(name="workers.tasks.schedule_due_posts")
 def schedule_due_posts() -> dict:
     started_at = perf_counter()
@@ -669,8 +683,8 @@ def schedule_due_posts() -> dict:
                     "query_hint": "status=scheduled AND publish_at<=now ORDER BY publish_at ASC LIMIT 500",
                 },
             )
-            publish_post_async(post.company_id, post.id)
-            enqueued += 1
+        # Still one message per due post; chunked groups only share a producer connection per chunk.
+        enqueued = publish_posts_async([(post.company_id, post.id) for post in due_posts])
 
         db.commit()
 
@@ -703,10 +717,7 @@ def platform_health_intelligence() -> dict:
 def refresh_tenant_risk_scores() -> dict:
     with SessionLocal() as db:
         tenant_ids = [company_id for (company_id,) in db.execute(select(Post.company_id).distinct()).all()]
-        refreshed = 0
-        for tenant_id in tenant_ids:
-            calculate_tenant_risk_score(db, company_id=tenant_id)
-            refreshed += 1
+        refreshed = len(calculate_tenant_risk_scores(db, company_ids=tenant_ids))
         db.commit()
     return {"refreshed": refreshed}
 
@@ -781,6 +792,7 @@ def process_publish_event_rules() -> dict:
     name="workers.tasks.execute_automation_run",
     max_retries=AUTOMATION_MAX_RETRIES,
     acks_late=True,
+    ignore_result=True,
 )
 def execute_automation_run(self, run_id: str) -> dict:
     run_uuid = UUID(run_id)
@@ -1004,13 +1016,12 @@ def publish_post(self, company_id: str, post_id: str) -> dict:
 
             channels_total = len(channels)
             if connector_hardening_enabled:
-                for result in publish_results:
-                    if not result.success:
-                        health = calculate_connector_health(db, tenant_id=company_uuid, channel_id=result.channel_id)
-                        if health.get("score", 100) < settings.connector_health_warning_threshold:
-                            set_connector_cooldown(
-                                result.channel_id, seconds=max(60, settings.connector_health_cooldown_seconds)
-                            )
+                failed_channel_ids = [result.channel_id for result in publish_results if not result.success]
+                healths = calculate_connector_healths(db, tenant_id=company_uuid, channel_ids=failed_channel_ids)
+                for channel_id in failed_channel_ids:
+                    health = healths.get(channel_id) or {"score": 0, "status": "missing"}
+                    if health.get("score", 100) < settings.connector_health_warning_threshold:
+                        set_connector_cooldown(channel_id, seconds=max(60, settings.connector_health_cooldown_seconds))
             summary_metadata = {
                 "channels_total": channels_total,
                 "channels_success": success_count,
@@ -1064,6 +1075,12 @@ def publish_post(self, company_id: str, post_id: str) -> dict:
                 )
 
             db.commit()
+            # Counted only once the ChannelPublish* events are durable, so the counters never run ahead of
+            # the event log that the SQL fallback reads.
+            record_publish_outcomes(
+                succeeded=len(publish_results) - len(failed_results),
+                failed=len(failed_results),
+            )
 
             retryable_failures = [result for result in failed_results if result.retryable]
             if retryable_failures: